@@ -0,0 +1,44 @@
+"""add_litellm_outbox
+
+Revision ID: 3c5e8a1d7b42
+Revises: fb6980a9f359
+Create Date: 2026-10-19 10:12:41.203517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e8a1d7b42'
+down_revision: Union[str, Sequence[str], None] = 'fb6980a9f359'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('litellm_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key_value', sa.String(length=255), nullable=False),
+    sa.Column('operation', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_litellm_outbox_status_available_at', 'litellm_outbox', ['status', 'available_at'], unique=False)
+    op.create_index('ix_litellm_outbox_key_value_operation', 'litellm_outbox', ['key_value', 'operation'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_litellm_outbox_key_value_operation', table_name='litellm_outbox')
+    op.drop_index('ix_litellm_outbox_status_available_at', table_name='litellm_outbox')
+    op.drop_table('litellm_outbox')
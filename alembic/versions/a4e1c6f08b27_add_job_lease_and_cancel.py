@@ -0,0 +1,32 @@
+"""add_job_lease_and_cancel
+
+Revision ID: a4e1c6f08b27
+Revises: 7d2f4b9c1e63
+Create Date: 2026-10-19 15:22:53.940611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e1c6f08b27'
+down_revision: Union[str, Sequence[str], None] = '7d2f4b9c1e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('cancel_requested', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_jobs_status', 'jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_status', table_name='jobs')
+    op.drop_column('jobs', 'heartbeat_at')
+    op.drop_column('jobs', 'cancel_requested')
@@ -0,0 +1,39 @@
+"""add_payload_to_event_logs
+
+Revision ID: a9d5c2e8f637
+Revises: e7c3b9a2d514
+Create Date: 2026-10-20 18:03:51.662047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d5c2e8f637'
+down_revision: Union[str, Sequence[str], None] = 'e7c3b9a2d514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 파티션 테이블에 추가하면 모든 파티션에 적용됩니다. 기존 로그는 payload가 NULL입니다.
+    op.add_column('event_logs', sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_index(
+        'ix_event_logs_payload',
+        'event_logs',
+        ['payload'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'payload': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_logs_payload', table_name='event_logs')
+    op.drop_column('event_logs', 'payload')
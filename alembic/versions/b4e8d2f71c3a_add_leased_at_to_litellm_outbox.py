@@ -0,0 +1,29 @@
+"""add_leased_at_to_litellm_outbox
+
+Revision ID: b4e8d2f71c3a
+Revises: a9d5c2e8f637
+Create Date: 2026-10-21 10:12:37.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d2f71c3a'
+down_revision: Union[str, Sequence[str], None] = 'a9d5c2e8f637'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 전송 중(lease) 표시. 같은 key의 이후 항목은 이 항목의 처리가 끝난 뒤에 전송합니다.
+    op.add_column('litellm_outbox', sa.Column('leased_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('litellm_outbox', 'leased_at')
@@ -0,0 +1,36 @@
+"""add_user_search_trgm_indexes
+
+Revision ID: b7d3e9a2c415
+Revises: e5b27d4c8f19
+Create Date: 2026-10-19 20:12:08.514237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a2c415'
+down_revision: Union[str, Sequence[str], None] = 'e5b27d4c8f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_users_user_id_trgm', 'users', ['user_id'], unique=False, postgresql_using='gin', postgresql_ops={'user_id': 'gin_trgm_ops'})
+    op.create_index('ix_users_organization_trgm', 'users', ['organization'], unique=False, postgresql_using='gin', postgresql_ops={'organization': 'gin_trgm_ops'})
+    op.create_index('ix_users_extra_info_trgm', 'users', ['extra_info'], unique=False, postgresql_using='gin', postgresql_ops={'extra_info': 'gin_trgm_ops'})
+    op.create_index('ix_users_user_id_lower', 'users', [sa.text('(lower(user_id) COLLATE "C")')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_user_id_lower', table_name='users')
+    op.drop_index('ix_users_extra_info_trgm', table_name='users', postgresql_using='gin')
+    op.drop_index('ix_users_organization_trgm', table_name='users', postgresql_using='gin')
+    op.drop_index('ix_users_user_id_trgm', table_name='users', postgresql_using='gin')
+    # pg_trgm 확장은 다른 객체가 사용할 수 있으므로 제거하지 않습니다.
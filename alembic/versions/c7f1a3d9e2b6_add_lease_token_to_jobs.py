@@ -0,0 +1,29 @@
+"""add_lease_token_to_jobs
+
+Revision ID: c7f1a3d9e2b6
+Revises: b4e8d2f71c3a
+Create Date: 2026-10-21 15:40:12.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f1a3d9e2b6'
+down_revision: Union[str, Sequence[str], None] = 'b4e8d2f71c3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 작업 lease 식별값. 청크 저장/상태 변경은 lease를 가진 워커만 반영합니다.
+    op.add_column('jobs', sa.Column('lease_token', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'lease_token')
@@ -0,0 +1,43 @@
+"""add_model_profiles
+
+Revision ID: c81f3e5a9d06
+Revises: a4e1c6f08b27
+Create Date: 2026-10-19 16:48:12.302774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3e5a9d06'
+down_revision: Union[str, Sequence[str], None] = 'a4e1c6f08b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('model_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('models', sa.JSON(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.add_column('users', sa.Column('model_profile_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_users_model_profile_id'), 'users', ['model_profile_id'], unique=False)
+    op.create_foreign_key('users_model_profile_id_fkey', 'users', 'model_profiles', ['model_profile_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('users_model_profile_id_fkey', 'users', type_='foreignkey')
+    op.drop_index(op.f('ix_users_model_profile_id'), table_name='users')
+    op.drop_column('users', 'model_profile_id')
+    op.drop_table('model_profiles')
@@ -0,0 +1,60 @@
+"""add_event_log_rollups
+
+Revision ID: d2a8f4c61e93
+Revises: b7d3e9a2c415
+Create Date: 2026-10-19 21:03:44.271905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f4c61e93'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9a2c415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_log_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.String(length=10), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('result', sa.String(length=50), nullable=False),
+    sa.Column('admin_id', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('period', 'bucket_start', 'event_type', 'result', 'admin_id', name='uq_event_log_rollups_bucket')
+    )
+    op.create_table('event_log_rollup_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('last_event_id', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # 기존 로그를 한 번에 집계하고, 이후 로그부터 집계기가 이어서 처리하도록 위치를 기록합니다.
+    op.execute("LOCK TABLE event_logs IN SHARE MODE")
+    for period in ('hour', 'day'):
+        op.execute(f"""
+            INSERT INTO event_log_rollups (period, bucket_start, event_type, result, admin_id, count)
+            SELECT '{period}', date_trunc('{period}', created_at, 'UTC'), event_type,
+                   coalesce(result, ''), coalesce(admin_id, ''), count(*)
+            FROM event_logs
+            GROUP BY 2, 3, 4, 5
+        """)
+    op.execute("""
+        INSERT INTO event_log_rollup_state (id, last_event_id)
+        SELECT 1, coalesce(max(id), 0) FROM event_logs
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_log_rollup_state')
+    op.drop_table('event_log_rollups')
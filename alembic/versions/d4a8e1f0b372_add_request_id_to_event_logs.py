@@ -0,0 +1,31 @@
+"""add_request_id_to_event_logs
+
+Revision ID: d4a8e1f0b372
+Revises: c61b2e7f4a98
+Create Date: 2026-10-20 10:41:27.903156
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e1f0b372'
+down_revision: Union[str, Sequence[str], None] = 'c61b2e7f4a98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 파티션 테이블에 추가하면 모든 파티션에 적용됩니다.
+    op.add_column('event_logs', sa.Column('request_id', sa.String(length=64), nullable=True))
+    op.create_index('ix_event_logs_request_id', 'event_logs', ['request_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_logs_request_id', table_name='event_logs')
+    op.drop_column('event_logs', 'request_id')
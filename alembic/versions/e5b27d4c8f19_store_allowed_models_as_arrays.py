@@ -0,0 +1,74 @@
+"""store_allowed_models_as_arrays
+
+Revision ID: e5b27d4c8f19
+Revises: c81f3e5a9d06
+Create Date: 2026-10-19 18:05:36.118460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b27d4c8f19'
+down_revision: Union[str, Sequence[str], None] = 'c81f3e5a9d06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('allowed_models', postgresql.ARRAY(sa.String(length=100)), server_default='{}', nullable=False))
+    op.add_column('users', sa.Column('allowed_services', postgresql.ARRAY(sa.String(length=100)), server_default='{}', nullable=False))
+
+    # 기존 allowed_models / allowed_services 행을 사용자별 배열로 옮깁니다. (입력 순서 유지)
+    op.execute("""
+        UPDATE users u SET allowed_models = m.names
+        FROM (SELECT user_id, array_agg(model_name ORDER BY id) AS names
+              FROM allowed_models GROUP BY user_id) m
+        WHERE m.user_id = u.id
+    """)
+    op.execute("""
+        UPDATE users u SET allowed_services = s.names
+        FROM (SELECT user_id, array_agg(service_name ORDER BY id) AS names
+              FROM allowed_services GROUP BY user_id) s
+        WHERE s.user_id = u.id
+    """)
+
+    op.create_index('ix_users_allowed_models', 'users', ['allowed_models'], unique=False, postgresql_using='gin')
+    op.drop_table('allowed_services')
+    op.drop_table('allowed_models')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('allowed_models',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('model_name', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('allowed_services',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('service_name', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO allowed_models (user_id, model_name)
+        SELECT u.id, m.name FROM users u, unnest(u.allowed_models) WITH ORDINALITY AS m(name, ord)
+        ORDER BY u.id, m.ord
+    """)
+    op.execute("""
+        INSERT INTO allowed_services (user_id, service_name)
+        SELECT u.id, s.name FROM users u, unnest(u.allowed_services) WITH ORDINALITY AS s(name, ord)
+        ORDER BY u.id, s.ord
+    """)
+    op.drop_index('ix_users_allowed_models', table_name='users', postgresql_using='gin')
+    op.drop_column('users', 'allowed_services')
+    op.drop_column('users', 'allowed_models')
@@ -0,0 +1,34 @@
+"""add_key_hash_to_users
+
+Revision ID: e7c3b9a2d514
+Revises: d4a8e1f0b372
+Create Date: 2026-10-20 15:12:44.218390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3b9a2d514'
+down_revision: Union[str, Sequence[str], None] = 'd4a8e1f0b372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('key_hash', sa.String(length=64), nullable=True))
+    # 기존 key의 fingerprint (app.key_lookup.key_fingerprint와 같은 SHA-256 hex)
+    op.execute(
+        "UPDATE users SET key_hash = encode(sha256(convert_to(key_value, 'UTF8')), 'hex')"
+    )
+    op.create_index('ix_users_key_hash', 'users', ['key_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_key_hash', table_name='users')
+    op.drop_column('users', 'key_hash')
@@ -0,0 +1,100 @@
+"""partition_event_logs_by_month
+
+Revision ID: f3c9a7e15b28
+Revises: d2a8f4c61e93
+Create Date: 2026-10-19 22:10:27.803316
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a7e15b28'
+down_revision: Union[str, Sequence[str], None] = 'd2a8f4c61e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """app/event_partitions.py와 같은 이름/경계(UTC)의 월 파티션"""
+    return (
+        f"CREATE TABLE event_logs_y{month.year:04d}m{month.month:02d} PARTITION OF event_logs "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 테이블을 옮겨 두고 같은 컬럼/시퀀스를 쓰는 파티션 테이블을 만든 뒤 데이터를 복사합니다.
+    op.execute("LOCK TABLE event_logs IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE event_logs RENAME TO event_logs_legacy")
+    op.execute("ALTER TABLE event_logs_legacy RENAME CONSTRAINT event_logs_pkey TO event_logs_legacy_pkey")
+    op.execute("""
+        CREATE TABLE event_logs (
+            id INTEGER NOT NULL DEFAULT nextval('event_logs_id_seq'),
+            user_id VARCHAR(50),
+            admin_id VARCHAR(50),
+            event_type VARCHAR(50) NOT NULL,
+            event_detail TEXT,
+            result VARCHAR(50),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT event_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE event_logs_id_seq OWNED BY event_logs.id")
+    op.create_index('ix_event_logs_created_at', 'event_logs', ['created_at'], unique=False)
+
+    today = datetime.now(timezone.utc).date()
+    this_month = date(today.year, today.month, 1)
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM event_logs_legacy")).scalar()
+    month = date(oldest.year, oldest.month, 1) if oldest else this_month
+    month = min(month, this_month)
+    while month <= add_months(this_month, PARTITIONS_AHEAD):
+        op.execute(create_partition_sql(month))
+        month = add_months(month, 1)
+    # 범위 밖(미래 등) 시각의 로그도 기록이 실패하지 않도록 default 파티션을 둡니다.
+    op.execute("CREATE TABLE event_logs_default PARTITION OF event_logs DEFAULT")
+
+    op.execute("""
+        INSERT INTO event_logs (id, user_id, admin_id, event_type, event_detail, result, created_at)
+        SELECT id, user_id, admin_id, event_type, event_detail, result, coalesce(created_at, now())
+        FROM event_logs_legacy
+    """)
+    op.execute("DROP TABLE event_logs_legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE event_logs IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE event_logs RENAME TO event_logs_partitioned")
+    op.execute("ALTER TABLE event_logs_partitioned RENAME CONSTRAINT event_logs_pkey TO event_logs_partitioned_pkey")
+    op.execute("ALTER INDEX ix_event_logs_created_at RENAME TO ix_event_logs_partitioned_created_at")
+    op.create_table('event_logs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('event_logs_id_seq')"), nullable=False),
+    sa.Column('user_id', sa.String(length=50), nullable=True),
+    sa.Column('admin_id', sa.String(length=50), nullable=True),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('event_detail', sa.Text(), nullable=True),
+    sa.Column('result', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id', name='event_logs_pkey')
+    )
+    op.execute("ALTER SEQUENCE event_logs_id_seq OWNED BY event_logs.id")
+    op.execute("""
+        INSERT INTO event_logs (id, user_id, admin_id, event_type, event_detail, result, created_at)
+        SELECT id, user_id, admin_id, event_type, event_detail, result, created_at
+        FROM event_logs_partitioned
+    """)
+    op.execute("DROP TABLE event_logs_partitioned")
@@ -0,0 +1,204 @@
+"""
+요청 수 제한(rate limit) 및 과부하 시 요청 거절(admission control)
+
+- 요청자별 제한: SERVER_API(x-api-key), 관리자(JWT username), 그 외는 IP 단위로 초당 요청 수(token bucket)와
+  동시 처리 수를 제한하고, 초과하면 429와 Retry-After를 반환합니다.
+  한 요청자가 연결 풀과 이벤트 루프를 모두 차지하지 못하므로 다른 요청자의 응답 시간이 유지됩니다.
+- 과부하 판단: worker의 처리 중 요청 수가 ADMISSION_MAX_IN_FLIGHT 이상이거나, DB 연결을 기다리는
+  요청 중 가장 오래 기다린 시간이 ADMISSION_MAX_POOL_WAIT를 넘으면 새 요청에 바로 503을 반환합니다.
+  이미 받은 요청은 계속 처리하므로 대기열이 길어지지 않고 응답 시간이 일정 수준으로 유지됩니다.
+
+요청 수 설정값은 전체 worker 합계 기준이며 프로세스마다 WEB_CONCURRENCY로 나누어 적용합니다. (메모리 기반)
+동시 처리 수는 worker의 연결 풀 크기 × RATE_LIMIT_CLIENT_POOL_SHARE 입니다.
+"""
+
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .config import (
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_MAX_POOL_WAIT,
+    RATE_LIMIT_ADMIN_BURST,
+    RATE_LIMIT_ADMIN_RATE,
+    RATE_LIMIT_ANON_BURST,
+    RATE_LIMIT_ANON_RATE,
+    RATE_LIMIT_API_BURST,
+    RATE_LIMIT_API_RATE,
+    RATE_LIMIT_CLIENT_POOL_SHARE,
+    WEB_CONCURRENCY,
+)
+
+MAX_BUCKETS = 10000
+SERVER_API = "SERVER_API"
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate: float, burst: float):
+        """
+        :param rate: 초당 충전되는 토큰 수 (0 이하면 제한하지 않음)
+        :param burst: 최대 토큰 수 (순간 허용 요청 수)
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._buckets: dict[str, list[float]] = {}  # key -> [토큰 수, 갱신 시각]
+
+    def __len__(self) -> int:
+        """추적 중인 bucket(요청자) 수"""
+        return len(self._buckets)
+
+    def acquire(self, key: str) -> float:
+        """토큰 1개를 사용합니다. 허용되면 0, 아니면 다음 토큰까지 기다릴 시간(초)을 반환합니다."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets[key] = [self.burst, now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+    def _prune(self, now: float):
+        """다시 가득 찬 bucket은 새로 만든 것과 같으므로 제거합니다."""
+        full_after = self.burst / self.rate
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if now - bucket[1] < full_after
+        }
+
+
+class PoolWaits:
+    """DB 풀에서 연결을 기다리는 중인 요청 (대기 시작 시각, 먼저 기다린 순서)"""
+
+    def __init__(self):
+        self._waiting: dict[int, float] = {}
+        self._seq = 0
+
+    @contextmanager
+    def track(self):
+        self._seq += 1
+        token = self._seq
+        self._waiting[token] = time.monotonic()
+        try:
+            yield
+        finally:
+            del self._waiting[token]
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def longest_wait(self) -> float:
+        started = next(iter(self._waiting.values()), None)
+        return time.monotonic() - started if started is not None else 0.0
+
+
+pool_waits = PoolWaits()
+
+
+class WaitTrackingQueuePool(AsyncAdaptedQueuePool):
+    """연결 대기 시간을 pool_waits에 기록하는 풀 (create_async_engine의 poolclass)"""
+
+    def connect(self):
+        with pool_waits.track():
+            return super().connect()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        pool_capacity: int,
+        max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+        client_pool_share: float = RATE_LIMIT_CLIENT_POOL_SHARE,
+        max_pool_wait: float = ADMISSION_MAX_POOL_WAIT,
+        workers: int = WEB_CONCURRENCY,
+    ):
+        """
+        :param pool_capacity: worker의 비동기 연결 풀 최대 연결 수 (pool_size + max_overflow)
+        :param client_pool_share: 요청자 1명의 동시 처리 수 = pool_capacity * share (0이면 제한 없음)
+        """
+        workers = max(workers, 1)
+        self.max_in_flight = max(1, max_in_flight // workers) if max_in_flight > 0 else 0
+        self.max_client_in_flight = (
+            max(1, int(pool_capacity * client_pool_share)) if client_pool_share > 0 else 0
+        )
+        self.max_pool_wait = max_pool_wait
+        self.in_flight = 0
+        self.limiters = {
+            "api": TokenBucketLimiter(
+                RATE_LIMIT_API_RATE / workers, RATE_LIMIT_API_BURST / workers
+            ),
+            "admin": TokenBucketLimiter(
+                RATE_LIMIT_ADMIN_RATE / workers, RATE_LIMIT_ADMIN_BURST / workers
+            ),
+            "anon": TokenBucketLimiter(
+                RATE_LIMIT_ANON_RATE / workers, RATE_LIMIT_ANON_BURST / workers
+            ),
+        }
+        self.stats = defaultdict(int)
+        self._client_in_flight: dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def _client(identity: Optional[str], client_host: Optional[str]) -> tuple[str, str]:
+        if identity == SERVER_API:
+            return "api", identity
+        if identity:
+            return "admin", f"admin:{identity}"
+        return "anon", f"ip:{client_host or '-'}"
+
+    def reject(self, identity: Optional[str], client_host: Optional[str]) -> Optional[tuple]:
+        """
+        요청을 거절해야 하면 (HTTP status, Retry-After 초)를 반환합니다.
+        - 429: 요청자의 동시 처리 수 또는 초당 요청 수 초과
+        - 503: worker 과부하 (처리 중 요청 수 또는 DB 연결 대기 시간 초과)
+        """
+        kind, key = self._client(identity, client_host)
+        if self.max_client_in_flight and self._client_in_flight[key] >= self.max_client_in_flight:
+            self.stats[f"concurrency_limited_{kind}"] += 1
+            return 429, 1
+        retry_after = self.limiters[kind].acquire(key)
+        if retry_after:
+            self.stats[f"rate_limited_{kind}"] += 1
+            return 429, math.ceil(retry_after)
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            reason = "in_flight"
+        elif self.max_pool_wait > 0 and pool_waits.longest_wait() > self.max_pool_wait:
+            reason = "pool_wait"
+        else:
+            return None
+        self.stats[f"shed_{reason}"] += 1
+        return 503, 1
+
+    @contextmanager
+    def admitted(self, identity: Optional[str], client_host: Optional[str]):
+        _, key = self._client(identity, client_host)
+        self.in_flight += 1
+        self._client_in_flight[key] += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._client_in_flight[key] -= 1
+            if not self._client_in_flight[key]:
+                del self._client_in_flight[key]
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "max_client_in_flight": self.max_client_in_flight,
+            "pool_waiting": pool_waits.waiting,
+            "pool_longest_wait": round(pool_waits.longest_wait(), 3),
+            "max_pool_wait": self.max_pool_wait,
+            "rejected": dict(self.stats),
+        }
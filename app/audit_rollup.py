@@ -0,0 +1,214 @@
+"""
+이벤트 로그 집계(rollup)
+
+EventLogRollupWorker가 주기적으로 event_logs를 id 순서로 읽어 시간/일 버킷 × event_type × result ×
+admin_id 별 건수를 event_log_rollups에 누적합니다. 통계 조회(GET /event-logs/stats)는 집계 테이블과
+아직 집계되지 않은 마지막 구간(id > last_event_id)만 읽으므로 버킷 수에 비례합니다.
+
+- 집계 트랜잭션에서 event_log_rollup_state 행을 잠그므로 여러 프로세스가 실행해도 중복 집계되지 않습니다.
+- id는 INSERT 시점에 정해지므로 작은 id의 로그가 나중에 커밋될 수 있습니다. 이를 건너뛰지 않도록
+  진행 중인 가장 오래된 트랜잭션(pg_snapshot_xmin)보다 먼저 끝난 트랜잭션이 기록한 로그까지만,
+  그리고 그렇지 않은 첫 로그 직전까지만 위치(last_event_id)를 옮깁니다.
+  (오래 열려 있는 트랜잭션이 있으면 그동안 집계가 멈추지만, 통계 조회는 미집계 구간을 직접 읽으므로 정확합니다)
+- 추가로 EVENT_ROLLUP_LAG_SECONDS 이전에 생성된 로그까지만 집계합니다.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, and_, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .config import EVENT_ROLLUP_BATCH_SIZE, EVENT_ROLLUP_INTERVAL, EVENT_ROLLUP_LAG_SECONDS
+from .models import EventLog, EventLogRollup, EventLogRollupState
+
+PERIODS = ("hour", "day")
+GROUP_COLUMNS = ("event_type", "result", "admin_id")
+STATE_ID = 1
+# 로그를 기록한 트랜잭션이 현재 진행 중인 모든 트랜잭션보다 먼저 끝났는지 (age가 클수록 오래됨)
+COMMITTED_BEFORE_ACTIVE = literal_column(
+    "age(event_logs.xmin) > age(pg_snapshot_xmin(pg_current_snapshot())::xid)"
+)
+
+
+def bucket_of(period: str, column):
+    """UTC 기준 버킷 시작 시각"""
+    return func.date_trunc(period, column, "UTC", type_=DateTime(timezone=True))
+
+
+def _event_columns():
+    """EventLogRollup 컬럼과 같은 의미의 event_logs 컬럼 (None은 ''로 저장)"""
+    return {
+        "event_type": EventLog.event_type,
+        "result": func.coalesce(EventLog.result, ""),
+        "admin_id": func.coalesce(EventLog.admin_id, ""),
+    }
+
+
+class EventLogRollupWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        interval: float = EVENT_ROLLUP_INTERVAL,
+        batch_size: int = EVENT_ROLLUP_BATCH_SIZE,
+        lag_seconds: float = EVENT_ROLLUP_LAG_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lag_seconds = lag_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.rollup_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: event log rollup failed: {e}")
+                processed = 0
+            # 밀린 로그가 많으면 쉬지 않고 다음 배치를 처리합니다.
+            if processed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    async def _lock_state(self, db: AsyncSession) -> EventLogRollupState:
+        await db.execute(
+            insert(EventLogRollupState)
+            .values(id=STATE_ID, last_event_id=0)
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        return await db.scalar(
+            select(EventLogRollupState).where(EventLogRollupState.id == STATE_ID).with_for_update()
+        )
+
+    async def rollup_once(self) -> int:
+        """집계되지 않은 로그를 최대 batch_size건 집계하고 처리한 로그 수를 반환합니다."""
+        async with self.session_factory() as db:
+            state = await self._lock_state(db)
+            last_id = state.last_event_id
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lag_seconds)
+            batch = (
+                select(
+                    EventLog.id,
+                    and_(EventLog.created_at < cutoff, COMMITTED_BEFORE_ACTIVE).label("settled"),
+                )
+                .where(EventLog.id > last_id)
+                .order_by(EventLog.id)
+                .limit(self.batch_size)
+                .cte("batch")
+            )
+            # 아직 커밋되지 않았을 수 있는 이전 id가 있는 첫 로그 직전까지만 집계합니다.
+            first_unsettled = (
+                select(func.min(batch.c.id))
+                .where(~batch.c.settled)
+                .correlate(None)
+                .scalar_subquery()
+            )
+            upper_id, processed = (
+                await db.execute(
+                    select(func.max(batch.c.id), func.count()).where(
+                        or_(first_unsettled.is_(None), batch.c.id < first_unsettled)
+                    )
+                )
+            ).one()
+            if not processed:
+                await db.commit()
+                return 0
+
+            columns = _event_columns()
+            in_range = (EventLog.id > last_id, EventLog.id <= upper_id)
+            for period in PERIODS:
+                bucket = bucket_of(period, EventLog.created_at)
+                rows = (
+                    select(literal(period), bucket, *columns.values(), func.count())
+                    .where(*in_range)
+                    .group_by(bucket, *columns.values())
+                )
+                stmt = insert(EventLogRollup).from_select(
+                    ["period", "bucket_start", *columns.keys(), "count"], rows
+                )
+                await db.execute(
+                    stmt.on_conflict_do_update(
+                        constraint="uq_event_log_rollups_bucket",
+                        set_={"count": EventLogRollup.count + stmt.excluded.count},
+                    )
+                )
+            state.last_event_id = upper_id
+            await db.commit()
+            return processed
+
+
+async def rollup_stats(
+    db: AsyncSession,
+    period: str,
+    group_by: list[str],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    filters: Optional[dict] = None,
+) -> list[dict]:
+    """
+    버킷별 이벤트 건수. 집계 테이블과 아직 집계되지 않은 최근 로그를 합쳐 반환합니다.
+    :param group_by: GROUP_COLUMNS 중 버킷과 함께 나눌 컬럼
+    :param filters: GROUP_COLUMNS 컬럼별 일치 조건 (None은 조건 없음)
+    """
+    filters = {name: value for name, value in (filters or {}).items() if value is not None}
+    last_id = await db.scalar(
+        select(EventLogRollupState.last_event_id).where(EventLogRollupState.id == STATE_ID)
+    )
+    counts: dict[tuple, int] = {}
+
+    # 1. 집계 테이블 (버킷 단위)
+    group = [getattr(EventLogRollup, name) for name in group_by]
+    stmt = select(EventLogRollup.bucket_start, *group, func.sum(EventLogRollup.count)).where(
+        EventLogRollup.period == period,
+        *(getattr(EventLogRollup, name) == value for name, value in filters.items()),
+    )
+    if start_date is not None:
+        stmt = stmt.where(EventLogRollup.bucket_start >= bucket_of(period, literal(start_date)))
+    if end_date is not None:
+        stmt = stmt.where(EventLogRollup.bucket_start <= end_date)
+    result = await db.execute(stmt.group_by(EventLogRollup.bucket_start, *group))
+    for row in result.all():
+        counts[tuple(row[:-1])] = int(row[-1])
+
+    # 2. 아직 집계되지 않은 로그 (last_event_id 이후, PK 범위 조회)
+    columns = _event_columns()
+    bucket = bucket_of(period, EventLog.created_at)
+    group = [columns[name] for name in group_by]
+    stmt = select(bucket, *group, func.count()).where(
+        EventLog.id > (last_id or 0),
+        *(columns[name] == value for name, value in filters.items()),
+    )
+    if start_date is not None:
+        stmt = stmt.where(EventLog.created_at >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(EventLog.created_at <= end_date)
+    result = await db.execute(stmt.group_by(bucket, *group))
+    for row in result.all():
+        key = tuple(row[:-1])
+        counts[key] = counts.get(key, 0) + row[-1]
+
+    return [
+        {
+            "bucket_start": key[0],
+            **{name: value or None for name, value in zip(group_by, key[1:])},
+            "count": count,
+        }
+        for key, count in sorted(counts.items(), key=lambda item: item[0])
+    ]
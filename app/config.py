@@ -12,6 +12,44 @@ DB_USER = os.getenv("POSTGRES_USER", "your_username")
 DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "your_password")
 DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# 읽기 전용 복제본 (POSTGRES_REPLICA_HOST가 없으면 모든 조회는 primary 사용)
+DB_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST", "")
+DB_REPLICA_PORT = os.getenv("POSTGRES_REPLICA_PORT", DB_PORT)
+DB_REPLICA_URL = (
+    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
+    if DB_REPLICA_HOST
+    else None
+)
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5.0"))  # 초과 시 primary
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10.0"))  # 변경 후 primary 조회
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "1.0"))  # 지연 확인 주기(초)
+
+# worker 프로세스 수 및 DB 연결 예산 (app/db_pool.py)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY") or "1")  # entrypoint.sh에서 설정
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "40"))  # 모든 worker의 연결 합계
+DB_AUDIT_POOL_SHARE = float(os.getenv("DB_AUDIT_POOL_SHARE", "0.2"))  # 감사 로그 풀 비율
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 연결 대기 시간(초)
+# PgBouncer(transaction 모드) 경유 시 true
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+# prepared statement 캐시 크기 (PgBouncer 1.21 미만이면 0)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "0" if DB_PGBOUNCER else "100"))
+# 비동기 엔진의 SQL/파라미터 로그 출력 (파라미터에 사용자 key가 포함되므로 개발용으로만 사용)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+
+# 요청자별 요청 수 제한 (token bucket, 전체 worker 합계 기준 초당 요청 수 / 순간 허용량, 0이면 제한 없음)
+RATE_LIMIT_API_RATE = float(os.getenv("RATE_LIMIT_API_RATE", "200"))  # x-api-key
+RATE_LIMIT_API_BURST = float(os.getenv("RATE_LIMIT_API_BURST", "400"))
+RATE_LIMIT_ADMIN_RATE = float(os.getenv("RATE_LIMIT_ADMIN_RATE", "20"))  # 관리자별
+RATE_LIMIT_ADMIN_BURST = float(os.getenv("RATE_LIMIT_ADMIN_BURST", "40"))
+RATE_LIMIT_ANON_RATE = float(os.getenv("RATE_LIMIT_ANON_RATE", "5"))  # 인증 없는 요청, IP별
+RATE_LIMIT_ANON_BURST = float(os.getenv("RATE_LIMIT_ANON_BURST", "10"))
+# 요청자 1명이 worker의 비동기 연결 풀에서 동시에 사용할 수 있는 비율
+RATE_LIMIT_CLIENT_POOL_SHARE = float(os.getenv("RATE_LIMIT_CLIENT_POOL_SHARE", "0.5"))
+
+# 과부하 시 요청 거절 (503, 0이면 사용 안 함)
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "512"))  # 전체 처리 중 요청 수
+ADMISSION_MAX_POOL_WAIT = float(os.getenv("ADMISSION_MAX_POOL_WAIT", "1.0"))  # DB 연결 대기(초)
+
 # JWT 설정
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your_jwt_secret")
 JWT_ALGORITHM = "HS256"
@@ -22,3 +60,93 @@ SERVER_API_KEY = os.getenv("SERVER_API_KEY", "your_serve_api_key")
 
 # LiteLLM 설정
 LITELLM_USER_ID = os.getenv("LITELLM_USER_ID", "mama_litellm_user")
+
+# DB↔LiteLLM 정합성 점검(reconcile) 설정
+RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", "16"))  # LiteLLM 동시 호출 수
+RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "1000"))  # 체크포인트 단위 사용자 수
+RECONCILE_CHECKPOINT_PATH = os.getenv("RECONCILE_CHECKPOINT_PATH", "reconcile_checkpoint.json")
+
+# LiteLLM outbox 전송 설정
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))  # 한 번에 가져올 outbox 항목 수
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "8"))  # LiteLLM 동시 호출 수
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))  # 대기 항목 조회 주기(초)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))  # 초과 시 FAILED 처리
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "60"))  # 처리 중 항목 재할당 대기(초)
+
+# 백그라운드 작업(대량 import 등) 설정
+JOB_FILES_DIR = os.getenv("JOB_FILES_DIR", "./job_files")  # 업로드 파일 보관 경로 (재개용)
+# 실패/취소된 import 작업의 업로드 파일 보관 시간(초), 지나면 삭제되어 재개할 수 없음 (완료 시 바로 삭제)
+JOB_FILES_RETENTION_SECONDS = int(os.getenv("JOB_FILES_RETENTION_SECONDS", "86400"))
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))  # 트랜잭션 단위 행 수
+IMPORT_CONCURRENCY = int(os.getenv("IMPORT_CONCURRENCY", "16"))  # LiteLLM key 동시 생성 수
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # 동시에 실행할 작업 수
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "500"))  # 배치 수정/삭제 트랜잭션 단위 사용자 수
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "5.0"))  # 실행 대기 작업 조회 주기(초)
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))  # 갱신 없으면 중단된 것으로 간주
+KEY_ROTATION_GRACE_SECONDS = int(
+    os.getenv("KEY_ROTATION_GRACE_SECONDS", "3600")
+)  # 이전 key 유지(초)
+
+# 사용자 검색
+SEARCH_MIN_SUBSTRING_LENGTH = int(
+    os.getenv("SEARCH_MIN_SUBSTRING_LENGTH", "3")
+)  # 미만이면 접두 일치
+SEARCH_COUNT_LIMIT = int(os.getenv("SEARCH_COUNT_LIMIT", "1000"))  # 검색 결과 수를 셀 최대 개수
+
+# 목록 조회 API의 limit 최대값 (사용자 검색, 모델 사용자, 이벤트 로그, 작업 등)
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "2000"))
+
+# 여러 사용자 key 조회 (POST /key/info)
+# 쿼리당 user_id 수, 요청한 id가 이보다 많으면 응답을 스트리밍
+KEY_INFO_CHUNK_SIZE = int(os.getenv("KEY_INFO_CHUNK_SIZE", "5000"))
+KEY_INFO_AUDIT_MAX_IDS = int(os.getenv("KEY_INFO_AUDIT_MAX_IDS", "20"))  # 감사 로그에 남길 id 수
+
+# key → 사용자 역조회 (POST /key/lookup)
+KEY_LOOKUP_MAX_KEYS = int(os.getenv("KEY_LOOKUP_MAX_KEYS", "1000"))  # 요청당 최대 key 수
+KEY_LOOKUP_CACHE_SIZE = int(os.getenv("KEY_LOOKUP_CACHE_SIZE", "10000"))  # worker별 캐시 항목 수
+KEY_LOOKUP_CACHE_TTL = float(os.getenv("KEY_LOOKUP_CACHE_TTL", "60"))  # 캐시 유지(초), 0이면 미사용
+
+# 이벤트 로그 집계(rollup)
+EVENT_ROLLUP_INTERVAL = float(os.getenv("EVENT_ROLLUP_INTERVAL", "10.0"))  # 집계 주기(초)
+EVENT_ROLLUP_BATCH_SIZE = int(os.getenv("EVENT_ROLLUP_BATCH_SIZE", "50000"))  # 1회 집계 로그 수
+EVENT_ROLLUP_LAG_SECONDS = float(os.getenv("EVENT_ROLLUP_LAG_SECONDS", "5.0"))  # 집계 지연(초)
+
+# event_logs 월별 파티션 및 보관 기간
+EVENT_LOG_PARTITIONS_AHEAD = int(os.getenv("EVENT_LOG_PARTITIONS_AHEAD", "3"))  # 미리 만들 개월 수
+# 보관 개월 수 (기본 0: 정리 안 함), 켜기 전에 EVENT_LOG_ARCHIVE_DIR을 영구 저장소에 만들어 둡니다.
+EVENT_LOG_RETENTION_MONTHS = int(os.getenv("EVENT_LOG_RETENTION_MONTHS", "0"))
+EVENT_LOG_ARCHIVE_DIR = os.getenv("EVENT_LOG_ARCHIVE_DIR", "./event_log_archive")  # gzip JSONL 경로
+# 파티션 생성/정리 실행 주기(초)
+EVENT_LOG_MAINTENANCE_INTERVAL = float(os.getenv("EVENT_LOG_MAINTENANCE_INTERVAL", "3600"))
+
+# Idempotency-Key (사용자 생성, 배치 수정/삭제)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))  # 응답 보관 시간(초)
+# 처리 중 기록을 중단된 것으로 보고 다시 실행하기까지 대기 시간(초)
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "300"))
+
+# 요청 단위 CPU 프로파일링 (false면 미들웨어를 등록하지 않음)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 임의 요청 비율 (0~1)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))  # stack 기록 주기(ms)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")  # folded stack 저장 경로
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))  # 초과 시 오래된 것부터 삭제
+
+# 메모리 분석 (tracemalloc 스냅샷 보관 개수, worker별)
+MEMORY_MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "5"))
+
+# 이벤트 루프 지연 감시
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))  # 측정 주기(ms)
+# 이 시간 이상 루프가 멈추면 실행 중인 stack을 기록 (0이면 기록 안 함)
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "200"))
+LOOP_LAG_MAX_REPORTS = int(os.getenv("LOOP_LAG_MAX_REPORTS", "20"))  # 보관할 최근 기록 수
+
+# 느린 쿼리 기록 (0이면 사용 안 함)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0.1"))  # EXPLAIN 비율 (0~1)
+SLOW_QUERY_MAX_ENTRIES = int(os.getenv("SLOW_QUERY_MAX_ENTRIES", "100"))  # 보관할 최근 쿼리 수
+
+# 요청 tracing (request id는 항상 부여, span은 TRACING_ENABLED일 때만 기록)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))  # span을 기록할 요청 비율 (0~1)
+TRACE_MAX_TRACES = int(os.getenv("TRACE_MAX_TRACES", "200"))  # 메모리에 보관할 최근 trace 수
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")  # 지정 시 span을 JSONL로 추가 기록
@@ -0,0 +1,94 @@
+"""
+DB 연결 풀 설정 (worker 프로세스 간 연결 수 분배)
+
+DB_MAX_CONNECTIONS는 모든 worker 프로세스가 primary(또는 PgBouncer)에 여는 연결 수의 합계입니다.
+worker마다 같은 몫을 받고, 파티션 정리용 1개를 제외한 나머지를
+감사 로그용 동기 풀(DB_AUDIT_POOL_SHARE)과 비동기 풀로 나눕니다.
+비동기 풀은 1/3을 상시 유지(pool_size)하고 나머지는 필요할 때만 여는 overflow로 둡니다.
+
+DB_PGBOUNCER=true면 asyncpg prepared statement 이름을 매번 새로 만들어
+PgBouncer transaction 모드에서 다른 클라이언트의 statement와 충돌하지 않게 합니다.
+"""
+
+from typing import Optional
+from uuid import uuid4
+
+from .admission import WaitTrackingQueuePool
+from .config import (
+    DB_AUDIT_POOL_SHARE,
+    DB_MAX_CONNECTIONS,
+    DB_PGBOUNCER,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    WEB_CONCURRENCY,
+)
+
+RESERVED_PER_WORKER = 1  # 파티션 정리 작업 (실행 중일 때만 연결)
+MIN_ASYNC_CONNECTIONS = 4  # 이보다 적으면 admission control이 동시 요청을 거의 받지 못함
+MIN_CONNECTIONS_PER_WORKER = RESERVED_PER_WORKER + MIN_ASYNC_CONNECTIONS + 1  # + 감사 로그 1
+POOL_RECYCLE_SECONDS = 3600
+
+
+def pool_budget(
+    max_connections: int = DB_MAX_CONNECTIONS,
+    workers: int = WEB_CONCURRENCY,
+    audit_share: float = DB_AUDIT_POOL_SHARE,
+) -> dict:
+    """
+    worker 1개가 사용할 풀 크기
+    :raises ValueError: worker당 몫이 MIN_CONNECTIONS_PER_WORKER보다 작은 경우 (예산 초과 대신 시작 거부)
+    """
+    workers = max(workers, 1)
+    per_worker = max_connections // workers
+    if per_worker < MIN_CONNECTIONS_PER_WORKER:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_connections}로는 worker {workers}개를 실행할 수 없습니다. "
+            f"(worker당 최소 {MIN_CONNECTIONS_PER_WORKER}개, WEB_CONCURRENCY를 줄이거나 "
+            "DB_MAX_CONNECTIONS를 늘리세요)"
+        )
+    pooled = per_worker - RESERVED_PER_WORKER
+    audit = min(max(1, round(pooled * audit_share)), pooled - 1)
+    pool_size = max(1, (pooled - audit) // 3)
+    return {
+        "workers": workers,
+        "per_worker": per_worker,
+        "pool_size": pool_size,
+        "max_overflow": pooled - audit - pool_size,
+        "audit_pool_size": audit,
+    }
+
+
+def async_engine_options(budget: dict) -> dict:
+    """create_async_engine 인자 (asyncpg)"""
+    connect_args = {
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,  # SQLAlchemy 캐시
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,  # asyncpg 캐시
+    }
+    if DB_PGBOUNCER:
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return {
+        "poolclass": WaitTrackingQueuePool,  # 연결 대기 시간 기록 (admission control)
+        "pool_size": budget["pool_size"],
+        "max_overflow": budget["max_overflow"],
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+        "connect_args": connect_args,
+    }
+
+
+def compiled_cache_size(engine) -> Optional[int]:
+    """SQLAlchemy SQL 컴파일 캐시 항목 수 (공개 API가 없어 내부 속성을 읽으며, 없으면 None)"""
+    cache = getattr(getattr(engine, "sync_engine", engine), "_compiled_cache", None)
+    return len(cache) if cache is not None else None
+
+
+def sync_engine_options(budget: dict) -> dict:
+    """감사 로그용 동기 엔진 인자 (예산을 넘지 않도록 overflow 없음)"""
+    return {
+        "pool_size": budget["audit_pool_size"],
+        "max_overflow": 0,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
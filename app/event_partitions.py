@@ -0,0 +1,279 @@
+"""
+event_logs 월별 파티션 관리 및 보관 기간이 지난 파티션 아카이브
+
+event_logs는 created_at 기준 월별 RANGE 파티션 테이블입니다. (PostgreSQL, 마이그레이션에서 생성)
+
+- 파티션 생성: 이번 달부터 EVENT_LOG_PARTITIONS_AHEAD개월 뒤까지 미리 만들어 둡니다.
+- 보관 기간 정리: EVENT_LOG_RETENTION_MONTHS가 지난 파티션을 DETACH 한 뒤 gzip JSONL 파일로
+  EVENT_LOG_ARCHIVE_DIR에 저장하고 DROP 합니다. 중간에 중단되면 다음 실행에서 분리된 파티션부터 이어서 처리합니다.
+  기본값(0)은 정리하지 않으며, 켜면 EVENT_LOG_ARCHIVE_DIR이 이미 존재하고 쓰기 가능해야 합니다.
+  (컨테이너에서는 volume으로 mount한 경로, 없으면 아무것도 DETACH/DROP 하지 않음)
+- DETACH PARTITION은 event_logs에 ACCESS EXCLUSIVE lock을 잡습니다. (default 파티션이 있어 CONCURRENTLY는
+  사용할 수 없음) lock을 기다리는 동안 로그 기록까지 막히지 않도록 DETACH_LOCK_TIMEOUT_MS만 기다리고,
+  넘으면 해당 파티션은 다음 실행에서 다시 시도합니다. (lock을 얻은 뒤의 DETACH 자체는 카탈로그 변경만 하므로 짧습니다)
+- 여러 프로세스가 동시에 실행하지 않도록 단계(트랜잭션)마다 advisory lock을 잡고 대상을 다시 확인합니다.
+  트랜잭션 단위 lock이므로 PgBouncer transaction 모드에서도 동작합니다.
+
+    python -m app.event_partitions             # 파티션 생성 + 보관 기간 정리
+    python -m app.event_partitions --dry-run   # 대상 파티션만 출력
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from .config import (
+    DB_URL,
+    EVENT_LOG_ARCHIVE_DIR,
+    EVENT_LOG_MAINTENANCE_INTERVAL,
+    EVENT_LOG_PARTITIONS_AHEAD,
+    EVENT_LOG_RETENTION_MONTHS,
+)
+
+PARENT_TABLE = "event_logs"
+PARTITION_NAME = re.compile(r"^event_logs_y(\d{4})m(\d{2})$")
+ADVISORY_LOCK_ID = 0x6D616D61  # 'mama'
+ARCHIVE_FETCH_SIZE = 5000
+DETACH_LOCK_TIMEOUT_MS = 3000
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def create_partition_sql(month: date) -> str:
+    """월 파티션 생성 SQL (경계는 UTC 기준)"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+def expired_partitions(names: list[str], cutoff: date) -> list[str]:
+    """cutoff(월) 이전 월 파티션 (월 파티션 형식이 아닌 이름은 제외)"""
+    return [name for name in names if (month := partition_month(name)) and month < cutoff]
+
+
+def check_archive_dir(archive_dir: str):
+    """
+    아카이브 경로가 이미 존재하고 쓰기 가능한지 확인합니다.
+    자동으로 만들지 않으므로 mount 되지 않은(임시) 경로에 아카이브한 뒤 DROP 하는 일이 없습니다.
+    """
+    if not os.path.isdir(archive_dir) or not os.access(archive_dir, os.W_OK | os.X_OK):
+        raise RuntimeError(
+            f"EVENT_LOG_ARCHIVE_DIR '{archive_dir}' must be an existing writable directory "
+            "before expired partitions are dropped"
+        )
+
+
+def _this_month() -> date:
+    today = datetime.now(timezone.utc).date()
+    return date(today.year, today.month, 1)
+
+
+def attached_partitions(conn: Connection) -> list[str]:
+    result = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent ORDER BY c.relname"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return [name for name in result.scalars() if partition_month(name)]
+
+
+def detached_partitions(conn: Connection) -> list[str]:
+    """DETACH 후 아카이브/DROP 전에 중단된 월 파티션 테이블"""
+    result = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relname LIKE :pattern "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid) "
+            "ORDER BY c.relname"
+        ),
+        {"pattern": f"{PARENT_TABLE}\\_y%"},
+    )
+    return [name for name in result.scalars() if partition_month(name)]
+
+
+def ensure_partitions(conn: Connection, months_ahead: int = EVENT_LOG_PARTITIONS_AHEAD) -> list:
+    """이번 달부터 months_ahead개월 뒤까지 파티션을 만들고, 새로 만든 파티션 이름을 반환합니다."""
+    existing = set(attached_partitions(conn))
+    created = []
+    this_month = _this_month()
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        if partition_name(month) in existing:
+            continue
+        try:
+            with conn.begin_nested():
+                conn.execute(text(create_partition_sql(month)))
+            created.append(partition_name(month))
+        except Exception as e:
+            # default 파티션에 해당 월 로그가 있으면 생성할 수 없습니다.
+            print(f"Warning: failed to create partition {partition_name(month)}: {e}")
+    return created
+
+
+def archive_table(conn: Connection, table: str, archive_dir: str) -> str:
+    """테이블 전체를 gzip JSONL로 저장하고 파일 경로를 반환합니다. (임시 파일에 쓴 뒤 rename)"""
+    path = os.path.join(archive_dir, f"{table}.jsonl.gz")
+    tmp_path = f"{path}.tmp"
+    result = conn.execute(
+        text(
+            "SELECT id, user_id, admin_id, event_type, event_detail, result, request_id, payload, "
+            "created_at "
+            f"FROM {table} ORDER BY id"
+        ),
+        execution_options={"stream_results": True, "max_row_buffer": ARCHIVE_FETCH_SIZE},
+    )
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for row in result.mappings():
+            record = dict(row)
+            record["created_at"] = record["created_at"].isoformat()
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def _try_lock(conn: Connection) -> bool:
+    """현재 트랜잭션이 끝날 때까지 유지되는 advisory lock"""
+    return conn.execute(
+        text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID}
+    ).scalar()
+
+
+def run_maintenance(
+    engine: Engine,
+    retention_months: int = EVENT_LOG_RETENTION_MONTHS,
+    archive_dir: str = EVENT_LOG_ARCHIVE_DIR,
+    months_ahead: int = EVENT_LOG_PARTITIONS_AHEAD,
+    dry_run: bool = False,
+) -> dict:
+    """
+    파티션을 미리 만들고 보관 기간이 지난 파티션을 아카이브 후 삭제합니다.
+    :param retention_months: 이번 달을 제외하고 보관할 개월 수 (0이면 정리하지 않음)
+    :raises RuntimeError: 정리할 파티션이 있는데 archive_dir이 없거나 쓰기 불가능한 경우 (DETACH 전에 확인)
+    """
+    report = {"created": [], "archived": [], "expired": [], "busy": [], "skipped": False}
+    with engine.connect() as conn:
+        if not dry_run:
+            with conn.begin():
+                if not _try_lock(conn):
+                    report["skipped"] = True  # 다른 프로세스가 실행 중
+                    return report
+                report["created"] = ensure_partitions(conn, months_ahead)
+        if retention_months <= 0:
+            return report
+
+        cutoff = add_months(_this_month(), -retention_months)
+        with conn.begin():
+            expired = expired_partitions(attached_partitions(conn), cutoff)
+            pending = detached_partitions(conn)
+        report["expired"] = expired + pending
+        if dry_run or not report["expired"]:
+            return report
+        check_archive_dir(archive_dir)
+
+        for name in expired:
+            try:
+                with conn.begin():
+                    if _try_lock(conn) and name in attached_partitions(conn):
+                        conn.execute(text(f"SET LOCAL lock_timeout = {DETACH_LOCK_TIMEOUT_MS}"))
+                        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            except OperationalError as e:
+                # 오래 실행 중인 조회 등으로 lock을 얻지 못한 경우 (다음 실행에서 재시도)
+                print(f"Warning: failed to detach partition {name}, will retry: {e}")
+                report["busy"].append(name)
+        # 분리된 파티션은 더 이상 조회/기록 대상이 아니므로 아카이브 후 삭제합니다.
+        for name in pending + expired:
+            with conn.begin():
+                if not (_try_lock(conn) and name in detached_partitions(conn)):
+                    continue
+                path = archive_table(conn, name, archive_dir)
+                conn.execute(text(f"DROP TABLE {name}"))
+            report["archived"].append(path)
+    return report
+
+
+class EventLogMaintenanceWorker:
+    """EVENT_LOG_MAINTENANCE_INTERVAL마다 run_maintenance를 스레드에서 실행합니다."""
+
+    def __init__(self, engine: Engine, interval: float = EVENT_LOG_MAINTENANCE_INTERVAL):
+        self.engine = engine
+        self.interval = interval
+        self.last_report: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                self.last_report = await asyncio.to_thread(run_maintenance, self.engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: event log partition maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="event_logs 파티션 생성 및 보관 기간 정리")
+    parser.add_argument("--retention-months", type=int, default=EVENT_LOG_RETENTION_MONTHS)
+    parser.add_argument("--months-ahead", type=int, default=EVENT_LOG_PARTITIONS_AHEAD)
+    parser.add_argument("--archive-dir", default=EVENT_LOG_ARCHIVE_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="대상 파티션만 출력")
+    args = parser.parse_args(argv)
+    engine = create_engine(DB_URL)
+    try:
+        report = run_maintenance(
+            engine,
+            retention_months=args.retention_months,
+            archive_dir=args.archive_dir,
+            months_ahead=args.months_ahead,
+            dry_run=args.dry_run,
+        )
+    finally:
+        engine.dispose()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["skipped"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+"""
+Idempotency-Key 처리 (POST /users, PUT /users/batch, DELETE /users/batch, POST /users/rotate-keys)
+
+클라이언트가 Idempotency-Key 헤더를 보내면 (요청자, 키)별로 요청 fingerprint와 응답을 저장합니다.
+같은 키로 재시도하면 엔드포인트를 다시 실행하지 않고(LiteLLM key 생성 등 포함) 저장된 응답을 반환합니다.
+
+- 처리 중인 키로 재시도: 409 (IDEMPOTENCY_LOCK_SECONDS가 지나면 처리 중단으로 보고 새로 실행)
+- 같은 키로 다른 요청(method/경로/query/body가 다름): 422
+- 5xx 응답과 예외는 저장하지 않으므로 같은 키로 다시 실행할 수 있습니다.
+- 기록은 IDEMPOTENCY_TTL_SECONDS 동안 유지되며 DB에 저장하므로 여러 worker에서 공유됩니다.
+"""
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .config import IDEMPOTENCY_LOCK_SECONDS, IDEMPOTENCY_TTL_SECONDS
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENT_ROUTES = {
+    ("POST", "/users"),
+    ("PUT", "/users/batch"),
+    ("DELETE", "/users/batch"),
+    ("POST", "/users/rotate-keys"),
+}
+MAX_KEY_LENGTH = 255
+
+IN_PROGRESS = "IN_PROGRESS"
+COMPLETED = "COMPLETED"
+
+# claim 결과
+CLAIMED = "CLAIMED"
+REPLAY = "REPLAY"
+MISMATCH = "MISMATCH"
+
+PURGE_INTERVAL_SECONDS = 60
+PURGE_BATCH_SIZE = 1000
+
+
+def request_fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+    digest = hashlib.sha256(f"{method} {path}?{query}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: float = IDEMPOTENCY_LOCK_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self._purged_at = 0.0
+
+    async def claim(
+        self, scope: str, key: str, fingerprint: str
+    ) -> tuple[str, Optional[IdempotencyKey]]:
+        """
+        키를 처리 중으로 기록합니다. (별도 트랜잭션으로 바로 commit)
+        :return: (CLAIMED | REPLAY | IN_PROGRESS | MISMATCH, 기존 기록)
+        """
+        await self._purge_expired()
+        now = datetime.now(timezone.utc)
+        stmt = insert(IdempotencyKey).values(
+            scope=scope,
+            key=key,
+            fingerprint=fingerprint,
+            status=IN_PROGRESS,
+            locked_until=now + timedelta(seconds=self.lock_seconds),
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+        )
+        # 만료된 기록이나 lease가 끝난(처리 중 중단된) 기록은 새 요청이 가져갑니다.
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_idempotency_keys_scope_key",
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "status": IN_PROGRESS,
+                "response_status": None,
+                "response_body": None,
+                "response_media_type": None,
+                "locked_until": stmt.excluded.locked_until,
+                "expires_at": stmt.excluded.expires_at,
+                "created_at": now,
+            },
+            where=or_(
+                IdempotencyKey.expires_at < now,
+                and_(IdempotencyKey.status == IN_PROGRESS, IdempotencyKey.locked_until < now),
+            ),
+        ).returning(IdempotencyKey.id)
+        async with self.session_factory() as db:
+            claimed = await db.scalar(stmt)
+            await db.commit()
+            if claimed is not None:
+                return CLAIMED, None
+            record = await db.scalar(
+                select(IdempotencyKey).where(
+                    IdempotencyKey.scope == scope, IdempotencyKey.key == key
+                )
+            )
+        if record is None or record.status == IN_PROGRESS:
+            return IN_PROGRESS, record
+        if record.fingerprint != fingerprint:
+            return MISMATCH, record
+        return REPLAY, record
+
+    async def complete(
+        self, scope: str, key: str, status_code: int, body: str, media_type: Optional[str]
+    ):
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                .values(
+                    status=COMPLETED,
+                    response_status=status_code,
+                    response_body=body,
+                    response_media_type=media_type,
+                )
+            )
+            await db.commit()
+
+    async def release(self, scope: str, key: str):
+        """처리에 실패한 키를 삭제하여 같은 키로 다시 실행할 수 있게 합니다."""
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status == IN_PROGRESS,
+                )
+            )
+            await db.commit()
+
+    async def _purge_expired(self):
+        """만료된 기록을 프로세스당 PURGE_INTERVAL_SECONDS마다 일부씩 삭제합니다."""
+        if time.monotonic() - self._purged_at < PURGE_INTERVAL_SECONDS:
+            return
+        self._purged_at = time.monotonic()
+        expired = (
+            select(IdempotencyKey.id)
+            .where(IdempotencyKey.expires_at < datetime.now(timezone.utc))
+            .limit(PURGE_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        async with self.session_factory() as db:
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired)))
+            await db.commit()
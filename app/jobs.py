@@ -0,0 +1,977 @@
+"""
+백그라운드 작업(Job) 실행
+
+USER_IMPORT: 업로드된 CSV/JSONL 파일을 스트리밍으로 읽어 청크 단위로 사용자를 생성합니다.
+- 파일은 JOB_FILES_DIR에 저장되어 실패 후 재개(resume)할 때 다시 읽습니다.
+  개인정보가 담긴 파일이므로 완료되면 바로 삭제하고, 실패/취소된 작업의 파일은
+  JOB_FILES_RETENTION_SECONDS 후 주기적으로 삭제합니다. (purge_job_files)
+- 청크마다 사용자/행별 결과/진행 위치(cursor)를 하나의 트랜잭션으로 기록합니다.
+- LiteLLM key는 청크 안에서 제한된 동시성으로 생성합니다.
+
+USER_BATCH_UPDATE / USER_BATCH_DELETE: PUT/DELETE /users/batch의 비동기 모드.
+- user_ids를 청크 단위로 처리하며, 없는 사용자는 해당 항목만 실패로 기록합니다.
+- LiteLLM 반영은 같은 트랜잭션의 outbox에 기록합니다.
+
+MODEL_PROFILE_SYNC: 모델 프로필 수정 후 프로필 사용자들의 key를 outbox로 갱신합니다.
+
+USER_KEY_ROTATE: POST /users/rotate-keys, user_ids 또는 organization 사용자의 key를 교체합니다.
+- 청크마다 새 key를 제한된 동시성으로 생성한 뒤 하나의 UPDATE로 key_value를 교체합니다.
+  (생성 중 key가 바뀐 사용자는 교체하지 않고 새 key를 삭제합니다.)
+- 이전 key는 유예 기간(grace_period_seconds) 후 삭제되도록 같은 트랜잭션의 outbox에 기록합니다.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, Optional
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from .config import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_CONCURRENCY,
+    JOB_CHUNK_SIZE,
+    JOB_FILES_DIR,
+    JOB_FILES_RETENTION_SECONDS,
+    JOB_LEASE_SECONDS,
+    JOB_POLL_INTERVAL,
+    JOB_WORKERS,
+    KEY_ROTATION_GRACE_SECONDS,
+    LITELLM_USER_ID,
+)
+from .key_lookup import key_fingerprint
+from .litellm_service import LiteLLMService
+from .model_profiles import assign_models, effective_models, get_profiles_by_name
+from .models import Job, JobItem, ModelProfile, User
+from .outbox import DELETE_KEY, FOLLOW_UP, UPDATE_ALIAS, UPDATE_MODELS, enqueue_many
+from .schemas import UserCreateRequest
+
+USER_IMPORT = "USER_IMPORT"
+USER_BATCH_UPDATE = "USER_BATCH_UPDATE"
+USER_BATCH_DELETE = "USER_BATCH_DELETE"
+MODEL_PROFILE_SYNC = "MODEL_PROFILE_SYNC"
+USER_KEY_ROTATE = "USER_KEY_ROTATE"
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+ITEM_SUCCESS = "SUCCESS"
+ITEM_FAILURE = "FAILURE"
+
+IMPORT_FORMATS = ("csv", "jsonl")
+UPLOAD_READ_SIZE = 1024 * 1024
+JOB_FILES_PURGE_INTERVAL = 3600  # 업로드 파일 정리 주기(초)
+
+
+def rotation_key_alias(user_id: str, job_id: str) -> str:
+    """
+    교체로 발급하는 key의 임시 alias
+    LiteLLM은 key alias 중복을 허용하지 않으므로, 유예 기간 동안 이전 key가 user_id alias를 유지하고
+    새 key는 이 alias를 사용합니다. (이전 key 삭제 후 outbox UPDATE_ALIAS로 user_id로 변경)
+    """
+    return f"{user_id}@rotate-{job_id[:8]}"
+
+
+def new_job_id() -> str:
+    return str(uuid.uuid4())
+
+
+def detect_import_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    fmt = (requested or os.path.splitext(filename or "")[1].lstrip(".")).lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt or filename} (csv, jsonl)")
+    return fmt
+
+
+async def save_upload(upload: UploadFile, job_id: str, fmt: str) -> str:
+    """업로드 파일을 메모리에 올리지 않고 청크 단위로 디스크에 저장합니다."""
+    os.makedirs(JOB_FILES_DIR, exist_ok=True)
+    path = os.path.join(JOB_FILES_DIR, f"{job_id}.{fmt}")
+    with open(path, "wb") as f:
+        while chunk := await upload.read(UPLOAD_READ_SIZE):
+            f.write(chunk)
+    return path
+
+
+def remove_job_file(path: Optional[str]) -> bool:
+    """업로드 파일을 삭제합니다. 실제로 삭제했으면 True"""
+    if not path:
+        return False
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        print(f"Warning: Failed to remove job file {path}: {e}")
+        return False
+
+
+def _split_list(value) -> list[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [v.strip() for v in str(value).replace("|", ";").split(";") if v.strip()]
+
+
+def iter_import_rows(path: str, fmt: str) -> Iterator[tuple[int, dict]]:
+    """
+    (행 번호, 행 dict)를 순서대로 반환합니다. 행 번호는 1부터 시작합니다.
+    CSV 컬럼: user_id, organization, extra_info, allowed_models(';' 또는 '|' 구분), model_profile
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            for row_no, row in enumerate(csv.DictReader(f), start=1):
+                yield row_no, row
+            return
+        row_no = 0
+        for line in f:
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_no, {"__error__": f"invalid JSON: {e}"}
+                continue
+            if not isinstance(row, dict):
+                yield row_no, {"__error__": f"row must be a JSON object, got {type(row).__name__}"}
+                continue
+            yield row_no, row
+
+
+def _text(value) -> Optional[str]:
+    """JSONL 값(숫자 등)도 문자열로 받습니다. 빈 값은 None"""
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def import_row_user_id(row: dict) -> Optional[str]:
+    """행 결과(job_items.user_id)에 기록할 user_id (컬럼 길이까지)"""
+    user_id = _text(row.get("user_id"))
+    return user_id[: JobItem.user_id.type.length] if user_id else None
+
+
+def parse_import_row(row: dict) -> UserCreateRequest:
+    if "__error__" in row:
+        raise ValueError(row["__error__"])
+    user_req = UserCreateRequest(
+        user_id=_text(row.get("user_id")) or "",
+        organization=_text(row.get("organization")),
+        extra_info=_text(row.get("extra_info")),
+        allowed_models=_split_list(row.get("allowed_models")),
+        model_profile=_text(row.get("model_profile")),
+    )
+    for field in ("user_id", "organization"):
+        max_length = getattr(User, field).type.length
+        if len(getattr(user_req, field) or "") > max_length:
+            raise ValueError(f"{field} is too long (max {max_length})")
+    return user_req
+
+
+def _error_message(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+    return str(e)
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청을 확인했을 때 발생합니다."""
+
+
+class JobLeaseLost(Exception):
+    """lease가 만료되어 다른 워커가 작업을 가져갔을 때 발생합니다. (이 워커의 청크는 롤백)"""
+
+
+class JobRunner:
+    """
+    jobs 테이블의 작업을 워커 풀로 실행합니다.
+
+    - 작업은 lease(heartbeat_at, lease_token)를 잡은 워커 하나만 실행합니다. 실행 중에는
+      lease_seconds/3마다 heartbeat_at을 갱신하므로 청크 처리가 오래 걸려도 lease가 유지됩니다.
+    - 청크 저장과 상태 변경은 claim 때 받은 lease_token이 그대로일 때만 반영합니다.
+      lease를 잃은 워커(멈췄다가 재개된 경우 등)의 청크는 롤백되고 실행을 중단합니다.
+    - 주기적으로 PENDING 작업과 lease가 만료된 RUNNING 작업을 찾아 실행하므로
+      재시작되거나 다른 프로세스가 중단한 작업도 마지막 cursor부터 이어서 처리됩니다.
+    - 취소는 cancel_requested를 기록하고, 워커가 청크 사이에서 확인해 CANCELLED로 종료합니다.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        litellm_service: Optional[LiteLLMService] = None,
+        audit: Optional[Callable] = None,
+        on_outbox_enqueued: Optional[Callable] = None,
+        on_keys_removed: Optional[Callable[[list[str]], None]] = None,
+        workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        files_dir: str = JOB_FILES_DIR,
+        files_retention_seconds: int = JOB_FILES_RETENTION_SECONDS,
+    ):
+        """
+        :param audit: 작업 완료/실패 시 호출할 이벤트 로그 함수 (log_event_sync와 같은 시그니처)
+        :param on_outbox_enqueued: outbox 항목을 기록한 뒤 호출할 함수 (dispatcher 깨우기)
+        :param on_keys_removed: 사용자 삭제/key 교체로 더 이상 사용자에 연결되지 않은 key 목록을
+                                commit 후 전달받을 함수 (key 역조회 캐시 정리)
+        :param files_retention_seconds: 실패/취소된 import 작업의 업로드 파일을 재개용으로 보관할 시간
+        """
+        self.session_factory = session_factory
+        self.litellm_service = litellm_service or LiteLLMService()
+        self.audit = audit
+        self.on_outbox_enqueued = on_outbox_enqueued
+        self.on_keys_removed = on_keys_removed
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.files_dir = files_dir
+        self.files_retention_seconds = files_retention_seconds
+        self._files_purged_at = 0.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: set[str] = set()
+        self._active: set[str] = set()
+        self._leases: dict[str, str] = {}  # 실행 중인 job id -> lease_token
+        self._tasks: list[asyncio.Task] = []
+
+    async def create_job(
+        self,
+        job_type: str,
+        admin_id: str,
+        params: dict,
+        total: Optional[int] = None,
+        job_id: Optional[str] = None,
+    ) -> Job:
+        async with self.session_factory() as db:
+            job = Job(
+                id=job_id or new_job_id(),
+                job_type=job_type,
+                status=PENDING,
+                admin_id=admin_id,
+                params=params,
+                total=total,
+                processed=0,
+                succeeded=0,
+                failed=0,
+                cursor=0,
+                cancel_requested=False,
+            )
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+    def is_running(self, job_id: str) -> bool:
+        """이 프로세스에서 실행 중이거나 실행 대기 중인지 여부"""
+        return job_id in self._active or job_id in self._queued
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._poll()))
+
+    def submit(self, job_id: str):
+        if self.is_running(job_id):
+            return
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """작업 취소를 요청합니다. 아직 시작하지 않은 작업은 바로 CANCELLED 처리합니다."""
+        async with self.session_factory() as db:
+            job = await db.get(Job, job_id)
+            if job is None or job.status not in (PENDING, RUNNING):
+                return job
+            job.cancel_requested = True
+            if job.status == PENDING and job_id not in self._active:
+                job.status = CANCELLED
+                job.finished_at = func.now()
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+    async def _poll(self):
+        """실행할 수 있는 작업(PENDING, lease 만료된 RUNNING)을 주기적으로 큐에 넣습니다."""
+        while True:
+            try:
+                for job_id in await self._runnable_job_ids():
+                    self.submit(job_id)
+                if time.monotonic() - self._files_purged_at >= JOB_FILES_PURGE_INTERVAL:
+                    self._files_purged_at = time.monotonic()
+                    await self.purge_job_files()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Failed to poll background jobs: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def purge_job_files(self) -> int:
+        """
+        files_dir에서 더 이상 필요 없는 업로드 파일을 삭제하고 삭제한 파일 수를 반환합니다.
+        - 완료된 작업의 파일 (완료 시 삭제하지 못한 경우)
+        - 실패/취소 후 files_retention_seconds가 지난 작업의 파일 (이후 재개 불가)
+        - 작업이 없는 파일 (작업 생성 전에 실패한 업로드), 수정 후 files_retention_seconds가 지난 경우
+        """
+        try:
+            names = os.listdir(self.files_dir)
+        except FileNotFoundError:
+            return 0
+        files = {os.path.splitext(name)[0]: os.path.join(self.files_dir, name) for name in names}
+        if not files:
+            return 0
+        expired_at = datetime.now(timezone.utc) - timedelta(seconds=self.files_retention_seconds)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Job.id, Job.status, Job.finished_at).where(Job.id.in_(list(files)))
+            )
+            jobs = {row.id: row for row in result}
+        removed = 0
+        for job_id, path in files.items():
+            job = jobs.get(job_id)
+            if job is None:
+                try:
+                    expired = os.path.getmtime(path) < expired_at.timestamp()
+                except FileNotFoundError:
+                    continue
+            else:
+                expired = job.status == COMPLETED or (
+                    job.status in (FAILED, CANCELLED) and job.finished_at < expired_at
+                )
+            if expired and remove_job_file(path):
+                removed += 1
+        return removed
+
+    async def _runnable_job_ids(self) -> list[str]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Job.id)
+                .where(
+                    or_(
+                        Job.status == PENDING,
+                        and_(Job.status == RUNNING, Job.heartbeat_at < self._lease_expired_at()),
+                    )
+                )
+                .order_by(Job.created_at)
+            )
+            return list(result.scalars())
+
+    def _lease_expired_at(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+
+    async def _claim(self, job_id: str) -> bool:
+        """다른 워커/프로세스가 실행 중이 아닐 때만 RUNNING으로 바꾸고 lease를 잡습니다."""
+        lease = uuid.uuid4().hex
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job)
+                .where(
+                    Job.id == job_id,
+                    or_(
+                        Job.status == PENDING,
+                        and_(Job.status == RUNNING, Job.heartbeat_at < self._lease_expired_at()),
+                    ),
+                )
+                .values(status=RUNNING, error=None, heartbeat_at=func.now(), lease_token=lease)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if result.rowcount != 1:
+            return False
+        self._leases[job_id] = lease
+        return True
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            self._active.add(job_id)
+            try:
+                if await self._claim(job_id):
+                    await self._execute(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Background job {job_id} failed: {e}")
+            finally:
+                self._active.discard(job_id)
+
+    async def _set_job(self, job_id: str, lease: str, **values) -> bool:
+        """lease를 가진 경우에만 작업을 변경합니다. (lease를 잃었으면 False)"""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job).where(Job.id == job_id, Job.lease_token == lease).values(**values)
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _heartbeat(self, job_id: str, lease: str):
+        """실행하는 동안 heartbeat_at을 갱신합니다. (lease를 잃으면 종료)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await self._set_job(job_id, lease, heartbeat_at=func.now()):
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Failed to refresh heartbeat of background job {job_id}: {e}")
+
+    async def _check_cancelled(self, job_id: str):
+        async with self.session_factory() as db:
+            cancel_requested = await db.scalar(select(Job.cancel_requested).where(Job.id == job_id))
+        if cancel_requested:
+            raise JobCancelled()
+
+    async def _record_chunk(self, db: AsyncSession, job_id: str, cursor: int, results: dict):
+        """행별 결과와 진행 상황을 현재 트랜잭션에 기록합니다. (commit은 호출자가 수행)"""
+        if results:
+            await db.execute(
+                insert(JobItem),
+                [
+                    {
+                        "job_id": job_id,
+                        "item_no": item_no,
+                        "user_id": user_id,
+                        "status": status,
+                        "detail": detail,
+                    }
+                    for item_no, (user_id, status, detail) in sorted(results.items())
+                ],
+            )
+        succeeded = sum(1 for _, status, _ in results.values() if status == ITEM_SUCCESS)
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.lease_token == self._leases.get(job_id))
+            .values(
+                cursor=cursor,
+                processed=Job.processed + len(results),
+                succeeded=Job.succeeded + succeeded,
+                failed=Job.failed + len(results) - succeeded,
+                heartbeat_at=func.now(),
+            )
+        )
+        if result.rowcount != 1:
+            raise JobLeaseLost()
+
+    async def _execute(self, job_id: str):
+        lease = self._leases[job_id]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, lease))
+        try:
+            await self._run(job_id, lease)
+        except JobLeaseLost:
+            print(f"Warning: Background job {job_id} was taken over by another worker")
+        finally:
+            heartbeat.cancel()
+            self._leases.pop(job_id, None)
+
+    async def _run(self, job_id: str, lease: str):
+        async with self.session_factory() as db:
+            job = await db.get(Job, job_id)
+            job_type, admin_id, params = job.job_type, job.admin_id, dict(job.params or {})
+        handlers = {
+            USER_IMPORT: self._run_user_import,
+            USER_BATCH_UPDATE: self._run_batch_update,
+            USER_BATCH_DELETE: self._run_batch_delete,
+            MODEL_PROFILE_SYNC: self._run_model_profile_sync,
+            USER_KEY_ROTATE: self._run_key_rotation,
+        }
+        try:
+            handler = handlers.get(job_type)
+            if handler is None:
+                raise ValueError(f"알 수 없는 작업 유형: {job_type}")
+            await handler(job_id, params)
+        except asyncio.CancelledError:
+            # 프로세스 종료 등으로 중단된 작업은 재시작 후 이어서 실행되도록 PENDING으로 남깁니다.
+            await asyncio.shield(self._set_job(job_id, lease, status=PENDING))
+            raise
+        except JobCancelled:
+            if await self._set_job(job_id, lease, status=CANCELLED, finished_at=func.now()):
+                await self._audit(admin_id, job_type, job_id, f"Job {job_id} cancelled", "SUCCESS")
+            return
+        except JobLeaseLost:
+            raise
+        except Exception as e:
+            if await self._set_job(
+                job_id, lease, status=FAILED, error=str(e), finished_at=func.now()
+            ):
+                await self._audit(
+                    admin_id, job_type, job_id, f"Job {job_id} failed: {e}", "FAILURE"
+                )
+            return
+        async with self.session_factory() as db:
+            job = await db.get(Job, job_id)
+            counts = {"count": job.total, "succeeded": job.succeeded, "failed": job.failed}
+        summary = f"total={job.total}, succeeded={job.succeeded}, failed={job.failed}"
+        if not await self._set_job(job_id, lease, status=COMPLETED, finished_at=func.now()):
+            raise JobLeaseLost()
+        remove_job_file(params.get("path"))
+        await self._audit(
+            admin_id, job_type, job_id, f"Job {job_id} completed: {summary}", "SUCCESS", counts
+        )
+
+    async def _audit(
+        self,
+        admin_id: str,
+        event_type: str,
+        job_id: str,
+        detail: str,
+        result: str,
+        counts: Optional[dict] = None,
+    ):
+        if self.audit is not None:
+            await asyncio.to_thread(
+                self.audit,
+                admin_id=admin_id,
+                event_type=event_type,
+                event_detail=detail,
+                result=result,
+                payload={"job_id": job_id, **(counts or {})},
+            )
+
+    async def _iter_user_id_chunks(self, job_id: str, params: dict):
+        """(마지막 항목 번호, [(항목 번호, user_id)])를 cursor 이후부터 청크 단위로 반환합니다."""
+        async with self.session_factory() as db:
+            cursor = await db.scalar(select(Job.cursor).where(Job.id == job_id))
+        user_ids = params["user_ids"]
+        for start in range(cursor, len(user_ids), JOB_CHUNK_SIZE):
+            await self._check_cancelled(job_id)
+            chunk = list(enumerate(user_ids[start : start + JOB_CHUNK_SIZE], start=start + 1))
+            yield chunk[-1][0], chunk
+
+    async def _load_users(self, db: AsyncSession, chunk: list, results: dict) -> list[User]:
+        """청크의 사용자를 조회하고, 없는 사용자는 실패로 기록합니다."""
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.model_profile))
+            .where(User.user_id.in_([u for _, u in chunk]))
+        )
+        users = {user.user_id: user for user in result.scalars()}
+        for item_no, user_id in chunk:
+            if user_id not in users:
+                results[item_no] = (user_id, ITEM_FAILURE, "user not found")
+        return list(users.values())
+
+    async def _run_batch_update(self, job_id: str, params: dict):
+        model_profile = params.get("model_profile")
+        async for cursor, chunk in self._iter_user_id_chunks(job_id, params):
+            results: dict[int, tuple[Optional[str], str, str]] = {}
+            async with self.session_factory() as db:
+                users = await self._load_users(db, chunk, results)
+                pks = [user.id for user in users]
+                values = {"updated_at": datetime.utcnow()}
+                if params.get("organization") is not None:
+                    values["organization"] = params["organization"]
+                if params.get("extra_info") is not None:
+                    values["extra_info"] = params["extra_info"]
+                if pks:
+                    await db.execute(update(User).where(User.id.in_(pks)).values(**values))
+                profiles = await get_profiles_by_name(db, [model_profile])
+                if model_profile and model_profile not in profiles:
+                    raise ValueError(f"존재하지 않는 모델 프로필입니다: {model_profile}")
+                model_updates = await assign_models(
+                    db,
+                    users,
+                    allowed_models=params.get("allowed_models") or None,
+                    profile=profiles.get(model_profile),
+                    detach_profile=model_profile == "",
+                )
+                await enqueue_many(db, UPDATE_MODELS, model_updates)
+                for item_no, user_id in chunk:
+                    results.setdefault(item_no, (user_id, ITEM_SUCCESS, "updated"))
+                await self._record_chunk(db, job_id, cursor, results)
+                await db.commit()
+            if model_updates and self.on_outbox_enqueued:
+                self.on_outbox_enqueued()
+
+    async def _run_batch_delete(self, job_id: str, params: dict):
+        async for cursor, chunk in self._iter_user_id_chunks(job_id, params):
+            results: dict[int, tuple[Optional[str], str, str]] = {}
+            async with self.session_factory() as db:
+                users = await self._load_users(db, chunk, results)
+                pks = [user.id for user in users]
+                if pks:
+                    await enqueue_many(db, DELETE_KEY, [(user.key_value, None) for user in users])
+                    await db.execute(delete(User).where(User.id.in_(pks)))
+                for item_no, user_id in chunk:
+                    results.setdefault(item_no, (user_id, ITEM_SUCCESS, "deleted"))
+                await self._record_chunk(db, job_id, cursor, results)
+                await db.commit()
+            if pks:
+                self._keys_removed([user.key_value for user in users])
+            if pks and self.on_outbox_enqueued:
+                self.on_outbox_enqueued()
+
+    async def _run_model_profile_sync(self, job_id: str, params: dict):
+        """프로필 사용자들의 key에 프로필의 현재 모델 목록을 반영합니다. (cursor: 마지막 users.id)"""
+        profile_id = params["profile_id"]
+        async with self.session_factory() as db:
+            cursor = await db.scalar(select(Job.cursor).where(Job.id == job_id))
+        while True:
+            await self._check_cancelled(job_id)
+            async with self.session_factory() as db:
+                profile = await db.get(ModelProfile, profile_id)
+                if profile is None:
+                    raise ValueError(f"모델 프로필을 찾을 수 없습니다: {profile_id}")
+                result = await db.execute(
+                    select(User.id, User.key_value)
+                    .where(User.model_profile_id == profile_id, User.id > cursor)
+                    .order_by(User.id)
+                    .limit(JOB_CHUNK_SIZE)
+                )
+                rows = result.all()
+                if not rows:
+                    return
+                # 청크마다 프로필을 다시 읽으므로 작업 중 프로필이 바뀌어도 최신 모델이 반영됩니다.
+                models = list(profile.models or [])
+                await enqueue_many(
+                    db, UPDATE_MODELS, [(row.key_value, {"models": models}) for row in rows]
+                )
+                cursor = rows[-1].id
+                # 사용자 수가 많을 수 있으므로 항목별 결과(JobItem)는 기록하지 않습니다.
+                result = await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.lease_token == self._leases.get(job_id))
+                    .values(
+                        cursor=cursor,
+                        processed=Job.processed + len(rows),
+                        succeeded=Job.succeeded + len(rows),
+                        heartbeat_at=func.now(),
+                    )
+                )
+                if result.rowcount != 1:
+                    raise JobLeaseLost()
+                await db.commit()
+            if self.on_outbox_enqueued:
+                self.on_outbox_enqueued()
+
+    async def _iter_organization_chunks(self, job_id: str, organization: str):
+        """조직 사용자를 users.id 순으로 반환합니다. (항목 번호와 cursor는 users.id)"""
+        async with self.session_factory() as db:
+            cursor = await db.scalar(select(Job.cursor).where(Job.id == job_id))
+        while True:
+            await self._check_cancelled(job_id)
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(User.id, User.user_id)
+                    .where(User.organization == organization, User.id > cursor)
+                    .order_by(User.id)
+                    .limit(JOB_CHUNK_SIZE)
+                )
+                chunk = [(row.id, row.user_id) for row in result]
+            if not chunk:
+                return
+            cursor = chunk[-1][0]
+            yield cursor, chunk
+
+    async def _run_key_rotation(self, job_id: str, params: dict):
+        grace_seconds = params.get("grace_period_seconds")
+        if grace_seconds is None:
+            grace_seconds = KEY_ROTATION_GRACE_SECONDS
+        if params.get("user_ids") is not None:
+            chunks = self._iter_user_id_chunks(job_id, params)
+        else:
+            chunks = self._iter_organization_chunks(job_id, params["organization"])
+        async for cursor, chunk in chunks:
+            results: dict[int, tuple[Optional[str], str, str]] = {}
+            async with self.session_factory() as db:
+                users = await self._load_users(db, chunk, results)
+            item_nos = {user_id: item_no for item_no, user_id in chunk}
+
+            # LiteLLM key 생성 (DB 세션을 점유하지 않은 상태에서 동시 실행)
+            semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+
+            async def generate(user: User) -> tuple[Optional[str], Optional[str]]:
+                async with semaphore:
+                    try:
+                        key = await self.litellm_service.generate_key(
+                            models=effective_models(user),
+                            user_id=LITELLM_USER_ID,
+                            key_alias=rotation_key_alias(user.user_id, job_id),
+                            metadata={"organization": user.organization},
+                        )
+                        return key, None
+                    except Exception as e:
+                        return None, str(e)
+
+            generated = await asyncio.gather(*(generate(user) for user in users))
+            rotated = []
+            for user, (key, error) in zip(users, generated):
+                if key is None:
+                    results[item_nos[user.user_id]] = (
+                        user.user_id,
+                        ITEM_FAILURE,
+                        f"key generation failed: {error}",
+                    )
+                else:
+                    rotated.append((user, key))
+            await self._swap_keys(job_id, cursor, rotated, item_nos, results, grace_seconds)
+
+    async def _swap_keys(self, job_id, cursor, rotated, item_nos, results, grace_seconds):
+        """
+        청크의 key_value를 하나의 UPDATE로 교체하고 이전 key 삭제를 outbox에 기록합니다.
+        이전 key의 삭제 예약(DELETE_KEY)은 교체와 같은 트랜잭션에서 기록되므로,
+        reconcile은 유예 기간 중인 이전 key를 orphan으로 보지 않습니다.
+        새 key의 alias를 user_id로 바꾸는 UPDATE_ALIAS는 이전 key 삭제의 후속 항목(FOLLOW_UP)으로,
+        삭제가 성공한 뒤에 기록됩니다. (동시에 전송하면 alias 중복으로 실패)
+        """
+        async with self.session_factory() as db:
+            try:
+                swapped: dict[int, str] = {}
+                if rotated:
+                    new_keys = values(
+                        column("id", Integer),
+                        column("old_key", String),
+                        column("new_key", String),
+                        column("new_hash", String),
+                        name="new_keys",
+                    ).data(
+                        [
+                            (user.id, user.key_value, key, key_fingerprint(key))
+                            for user, key in rotated
+                        ]
+                    )
+                    # 생성하는 동안 key가 바뀌었거나 삭제된 사용자는 교체하지 않습니다.
+                    result = await db.execute(
+                        update(User)
+                        .where(User.id == new_keys.c.id, User.key_value == new_keys.c.old_key)
+                        .values(
+                            key_value=new_keys.c.new_key,
+                            key_hash=new_keys.c.new_hash,
+                            updated_at=datetime.utcnow(),
+                        )
+                        .returning(User.id, User.user_id)
+                        .execution_options(synchronize_session=False)
+                    )
+                    swapped = dict(result.all())
+                old_keys, stale_keys = [], []
+                for user, key in rotated:
+                    if user.id in swapped:
+                        alias = [UPDATE_ALIAS, key, {"key_alias": swapped[user.id]}]
+                        old_keys.append((user.key_value, {FOLLOW_UP: [alias]}))
+                        results[item_nos[user.user_id]] = (user.user_id, ITEM_SUCCESS, "rotated")
+                    else:
+                        stale_keys.append((key, None))
+                        results[item_nos[user.user_id]] = (
+                            user.user_id,
+                            ITEM_FAILURE,
+                            "user changed during rotation",
+                        )
+                await enqueue_many(db, DELETE_KEY, old_keys, delay_seconds=grace_seconds)
+                await enqueue_many(db, DELETE_KEY, stale_keys)
+                await self._record_chunk(db, job_id, cursor, results)
+                await db.commit()
+            except BaseException:
+                # 교체하지 못한 청크에서 생성된 key는 LiteLLM에서 정리합니다.
+                await db.rollback()
+                await self._discard_keys([key for _, key in rotated])
+                raise
+        self._keys_removed([key for key, _ in old_keys])
+        if rotated and self.on_outbox_enqueued:
+            self.on_outbox_enqueued()
+
+    async def _run_user_import(self, job_id: str, params: dict):
+        path, fmt = params["path"], params["format"]
+        async with self.session_factory() as db:
+            job = await db.get(Job, job_id)
+            cursor, total = job.cursor, job.total
+        if total is None:
+            total = sum(1 for _ in iter_import_rows(path, fmt))
+            if not await self._set_job(job_id, self._leases.get(job_id), total=total):
+                raise JobLeaseLost()
+
+        chunk: list[tuple[int, dict]] = []
+        for row_no, row in iter_import_rows(path, fmt):
+            if row_no <= cursor:
+                continue
+            chunk.append((row_no, row))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                await self._check_cancelled(job_id)
+                await self._import_chunk(job_id, chunk)
+                chunk = []
+        if chunk:
+            await self._check_cancelled(job_id)
+            await self._import_chunk(job_id, chunk)
+
+    async def _import_chunk(self, job_id: str, chunk: list[tuple[int, dict]]):
+        """청크 하나를 검증 → key 생성 → 하나의 트랜잭션으로 저장합니다."""
+        results: dict[int, tuple[Optional[str], str, str]] = {}
+        valid: list[tuple[int, UserCreateRequest]] = []
+        seen: set[str] = set()
+        for row_no, row in chunk:
+            try:
+                user_req = parse_import_row(row)
+                if not user_req.user_id:
+                    raise ValueError("user_id is required")
+            except (ValidationError, ValueError) as e:
+                results[row_no] = (import_row_user_id(row), ITEM_FAILURE, _error_message(e))
+                continue
+            if user_req.user_id in seen:
+                results[row_no] = (user_req.user_id, ITEM_FAILURE, "duplicate user_id in file")
+                continue
+            seen.add(user_req.user_id)
+            valid.append((row_no, user_req))
+
+        # 이미 존재하는 사용자는 key를 만들기 전에 제외합니다.
+        async with self.session_factory() as db:
+            existing = set(
+                (
+                    await db.execute(
+                        select(User.user_id).where(User.user_id.in_([u.user_id for _, u in valid]))
+                    )
+                ).scalars()
+            )
+            profiles = await get_profiles_by_name(db, [u.model_profile for _, u in valid])
+        to_create = []
+        for row_no, user_req in valid:
+            if user_req.user_id in existing:
+                results[row_no] = (user_req.user_id, ITEM_FAILURE, "user_id already exists")
+            elif user_req.model_profile and user_req.model_profile not in profiles:
+                results[row_no] = (
+                    user_req.user_id,
+                    ITEM_FAILURE,
+                    f"model profile not found: {user_req.model_profile}",
+                )
+            else:
+                to_create.append((row_no, user_req))
+        profile_ids = {name: profile.id for name, profile in profiles.items()}
+
+        # LiteLLM key 생성 (DB 세션을 점유하지 않은 상태에서 동시 실행)
+        semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+
+        async def generate(user_req: UserCreateRequest) -> tuple[Optional[str], Optional[str]]:
+            async with semaphore:
+                try:
+                    profile = profiles.get(user_req.model_profile)
+                    key = await self.litellm_service.generate_key(
+                        models=profile.models if profile else user_req.allowed_models,
+                        user_id=LITELLM_USER_ID,
+                        key_alias=user_req.user_id,
+                        metadata={"organization": user_req.organization},
+                    )
+                    return key, None
+                except Exception as e:
+                    return None, str(e)
+
+        generated = await asyncio.gather(*(generate(u) for _, u in to_create))
+        created = []
+        for (row_no, user_req), (key, error) in zip(to_create, generated):
+            if key is None:
+                results[row_no] = (
+                    user_req.user_id,
+                    ITEM_FAILURE,
+                    f"key generation failed: {error}",
+                )
+            else:
+                created.append((row_no, user_req, key))
+
+        orphan_keys: list[str] = []
+        while True:
+            try:
+                await self._store_chunk(job_id, chunk, created, results, profile_ids, orphan_keys)
+                return
+            except IntegrityError:
+                # 확인 이후 다른 요청이 같은 user_id를 생성한 경우: 해당 행을 실패 처리하고 다시 저장
+                async with self.session_factory() as db:
+                    user_ids = [u.user_id for _, u, _ in created]
+                    taken = set(
+                        (await db.execute(select(User.user_id).where(User.user_id.in_(user_ids))))
+                        .scalars()
+                        .all()
+                    )
+                if not taken:
+                    # user_id 충돌이 아니면 다시 저장해도 실패하므로 생성한 key를 정리합니다.
+                    await self._discard_keys([key for _, _, key in created] + orphan_keys)
+                    raise
+                retry = []
+                for row_no, user_req, key in created:
+                    if user_req.user_id in taken:
+                        results[row_no] = (user_req.user_id, ITEM_FAILURE, "user_id already exists")
+                        orphan_keys.append(key)
+                    else:
+                        retry.append((row_no, user_req, key))
+                created = retry  # 매번 줄어들므로 반복은 끝납니다.
+
+    async def _store_chunk(self, job_id, chunk, created, results, profile_ids, orphan_keys=()):
+        async with self.session_factory() as db:
+            try:
+                if created:
+                    await db.execute(
+                        insert(User),
+                        [
+                            {
+                                "user_id": user_req.user_id,
+                                "organization": user_req.organization,
+                                "extra_info": user_req.extra_info,
+                                "key_value": key,
+                                "key_hash": key_fingerprint(key),
+                                "allowed_models": (
+                                    [] if user_req.model_profile else user_req.allowed_models
+                                ),
+                                "model_profile_id": profile_ids.get(user_req.model_profile),
+                            }
+                            for _, user_req, key in created
+                        ],
+                    )
+                    for row_no, user_req, _ in created:
+                        results[row_no] = (user_req.user_id, ITEM_SUCCESS, "created")
+                if orphan_keys:
+                    await enqueue_many(db, DELETE_KEY, [(key, None) for key in orphan_keys])
+
+                await self._record_chunk(db, job_id, chunk[-1][0], results)
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                raise
+            except BaseException:
+                # 저장하지 못한 청크에서 생성된 key는 LiteLLM에서 정리합니다.
+                await db.rollback()
+                await self._discard_keys([key for _, _, key in created])
+                raise
+        if orphan_keys and self.on_outbox_enqueued:
+            self.on_outbox_enqueued()
+
+    def _keys_removed(self, keys: list[str]):
+        if keys and self.on_keys_removed:
+            self.on_keys_removed(keys)
+
+    async def _discard_keys(self, keys: list[str]):
+        if not keys:
+            return
+        try:
+            await self.litellm_service.delete_keys(keys)
+        except Exception as e:
+            print(f"Warning: Failed to delete LiteLLM keys of failed job chunk: {e}")
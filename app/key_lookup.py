@@ -0,0 +1,83 @@
+"""
+LiteLLM key → 사용자 역조회 (POST /key/lookup)
+
+- key 원문 대신 SHA-256 fingerprint(users.key_hash, 인덱스)로 조회하므로
+  SQL 로그와 감사 로그에는 key 원문이 남지 않습니다.
+- 조회 결과는 worker별 메모리 캐시(LRU)에 KEY_LOOKUP_CACHE_TTL초 동안 보관하며, 찾지 못한 key는 캐시하지 않습니다.
+  같은 프로세스에서 사용자를 삭제하거나 key를 교체하면 commit 후 invalidate로 바로 제거합니다.
+  다른 프로세스(다른 worker, reconcile CLI)에서 변경한 key는 최대 TTL 동안 이전 사용자로 조회될 수 있습니다.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from .config import KEY_LOOKUP_CACHE_SIZE, KEY_LOOKUP_CACHE_TTL
+
+
+def key_fingerprint(key_value: str) -> str:
+    """users.key_hash에 저장하는 값 (SHA-256 hex)"""
+    return hashlib.sha256(key_value.encode("utf-8")).hexdigest()
+
+
+class KeyLookupCache:
+    def __init__(self, max_size: int = KEY_LOOKUP_CACHE_SIZE, ttl: float = KEY_LOOKUP_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # invalidate마다 증가, 조회 중에 무효화된 결과를 다시 캐시하지 않기 위해 사용
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[float, dict]] = (
+            OrderedDict()
+        )  # hash -> (만료, 사용자)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, key_hashes: Iterable[str]) -> dict[str, dict]:
+        """캐시에 있는 항목만 반환합니다."""
+        now = time.monotonic()
+        found = {}
+        for key_hash in key_hashes:
+            entry = self._entries.get(key_hash)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key_hash]
+                self.misses += 1
+                continue
+            self._entries.move_to_end(key_hash)
+            found[key_hash] = entry[1]
+            self.hits += 1
+        return found
+
+    def put_many(self, owners: dict[str, dict], generation: Optional[int] = None):
+        """
+        :param generation: DB 조회 전에 읽은 self.generation (그 사이 무효화가 있었으면 캐시하지 않음)
+        """
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        expires = time.monotonic() + self.ttl
+        for key_hash, owner in owners.items():
+            self._entries[key_hash] = (expires, owner)
+            self._entries.move_to_end(key_hash)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key_values: Iterable[str]):
+        """삭제/교체된 key(원문)를 캐시에서 제거합니다."""
+        self.generation += 1
+        for key_value in key_values:
+            self._entries.pop(key_fingerprint(key_value), None)
+
+    def status(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
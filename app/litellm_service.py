@@ -1,6 +1,9 @@
 import os
 import httpx
 from typing import List, Optional, Dict, Any
+from urllib.parse import urlsplit
+
+from .tracing import tracer
 
 # 환경변수 설정
 LITELLM_URL = os.getenv("LITELLM_URL", "http://localhost:4000")
@@ -10,27 +13,51 @@ LITELLM_MAX_RETRIES = int(os.getenv("LITELLM_MAX_RETRIES", "3"))
 LITELLM_RETRY_DELAY = float(os.getenv("LITELLM_RETRY_DELAY", "1.0"))
 
 
+class LiteLLMKeyNotFoundError(Exception):
+    """LiteLLM에 해당 key가 존재하지 않음"""
+
+
 class LiteLLMService:
-    def __init__(self, base_url: Optional[str] = None, master_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        master_key: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        :param client: 재사용할 httpx.AsyncClient (선택). 대량 호출 시 연결을 재사용하기 위해 사용하며,
+                       지정하지 않으면 요청마다 클라이언트를 생성합니다.
+        """
         self.base_url = base_url or LITELLM_URL
         self.master_key = master_key or LITELLM_MASTER_KEY
         self.timeout = LITELLM_TIMEOUT
         self.max_retries = LITELLM_MAX_RETRIES
         self.retry_delay = LITELLM_RETRY_DELAY
+        self.client = client
+
+    async def _send(
+        self, client: httpx.AsyncClient, method: str, url: str, headers: dict, json_data
+    ) -> httpx.Response:
+        if method.upper() == "GET":
+            return await client.get(url, headers=headers)
+        if method.upper() == "POST":
+            return await client.post(url, headers=headers, json=json_data)
+        raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
 
     async def _make_request(
         self, method: str, url: str, headers: dict, json_data: Optional[dict] = None
     ) -> httpx.Response:
         """
-        HTTP 요청을 수행하는 공통 메서드
+        HTTP 요청을 수행하는 공통 메서드 (tracing 중이면 litellm.request span 기록)
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            if method.upper() == "GET":
-                resp = await client.get(url, headers=headers)
-            elif method.upper() == "POST":
-                resp = await client.post(url, headers=headers, json=json_data)
+        with tracer.span("litellm.request", method=method, path=urlsplit(url).path) as span:
+            if self.client is not None:
+                resp = await self._send(self.client, method, url, headers, json_data)
             else:
-                raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    resp = await self._send(client, method, url, headers, json_data)
+            if span is not None:
+                span.attributes["status_code"] = resp.status_code
             return resp
 
     async def get_models(self) -> List[Dict[str, Any]]:
@@ -100,10 +127,29 @@ class LiteLLMService:
         }
         payload = {"keys": [key]}  # LiteLLM은 'keys' 리스트를 요구함
         resp = await self._make_request("POST", url, headers, payload)
+        if resp.status_code == 404:
+            raise LiteLLMKeyNotFoundError(f"LiteLLM Key 없음: {resp.text}")
         if resp.status_code != 200:
             raise Exception(f"LiteLLM Key 삭제 실패: {resp.status_code} {resp.text}")
         # 성공 시 별도 반환값 없음
 
+    async def delete_keys(self, keys: List[str]) -> None:
+        """
+        LiteLLM Key 일괄 삭제 (요청 1회)
+        :param keys: 삭제할 key 리스트
+        :raises: LiteLLMKeyNotFoundError (존재하지 않는 key 포함 시), Exception (API 실패 시)
+        """
+        url = f"{self.base_url}/key/delete"
+        headers = {
+            "Authorization": f"Bearer {self.master_key}",
+            "Content-Type": "application/json",
+        }
+        resp = await self._make_request("POST", url, headers, {"keys": keys})
+        if resp.status_code == 404:
+            raise LiteLLMKeyNotFoundError(f"LiteLLM Key 없음: {resp.text}")
+        if resp.status_code != 200:
+            raise Exception(f"LiteLLM Key 삭제 실패: {resp.status_code} {resp.text}")
+
     async def update_key_alias(self, key: str, key_alias: str) -> None:
         """
         LiteLLM Key의 key alias(별칭) 수정
@@ -118,6 +164,8 @@ class LiteLLMService:
         }
         payload = {"key": key, "key_alias": key_alias}
         resp = await self._make_request("POST", url, headers, payload)
+        if resp.status_code == 404:
+            raise LiteLLMKeyNotFoundError(f"LiteLLM Key 없음: {resp.text}")
         if resp.status_code != 200:
             raise Exception(f"LiteLLM Key alias 수정 실패: {resp.status_code} {resp.text}")
         # 성공 시 별도 반환값 없음
@@ -136,6 +184,8 @@ class LiteLLMService:
         }
         payload = {"key": key, "models": models}
         resp = await self._make_request("POST", url, headers, payload)
+        if resp.status_code == 404:
+            raise LiteLLMKeyNotFoundError(f"LiteLLM Key 없음: {resp.text}")
         if resp.status_code != 200:
             raise Exception(f"LiteLLM Key 모델 수정 실패: {resp.status_code} {resp.text}")
         # 성공 시 별도 반환값 없음
@@ -153,7 +203,31 @@ class LiteLLMService:
             "Content-Type": "application/json",
         }
         resp = await self._make_request("GET", url, headers)
+        if resp.status_code == 404:
+            raise LiteLLMKeyNotFoundError(f"LiteLLM Key 없음: {resp.text}")
         if resp.status_code != 200:
             raise Exception(f"LiteLLM Key 모델 조회 실패: {resp.status_code} {resp.text}")
         data = resp.json()
         return data.get("info", {}).get("models")
+
+    async def list_keys(self, user_id: str, page: int = 1, size: int = 100) -> Dict[str, Any]:
+        """
+        LiteLLM user_id에 속한 key 목록 조회 (페이지 단위)
+        :param user_id: key를 소유한 LiteLLM user_id
+        :param page: 페이지 번호 (1부터 시작)
+        :param size: 페이지 크기
+        :return: {"keys": [{"token": 해시된 key, "key_alias": ...}, ...], "total_pages": int}
+        :raises: Exception (API 실패 시)
+        """
+        url = (
+            f"{self.base_url}/key/list?user_id={user_id}&page={page}&size={size}"
+            "&return_full_object=true"
+        )
+        headers = {
+            "Authorization": f"Bearer {self.master_key}",
+            "Content-Type": "application/json",
+        }
+        resp = await self._make_request("GET", url, headers)
+        if resp.status_code != 200:
+            raise Exception(f"LiteLLM Key 목록 조회 실패: {resp.status_code} {resp.text}")
+        return resp.json()
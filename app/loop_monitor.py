@@ -0,0 +1,147 @@
+"""
+이벤트 루프 지연(lag) 감시
+
+- 측정: LOOP_LAG_INTERVAL_MS마다 깨어나는 task가 예정보다 늦게 깨어난 시간을 기록합니다.
+  (최근 값, 최대값, 평균, 임계값 초과 횟수)
+- 원인 기록: 별도 감시 스레드가 루프가 LOOP_LAG_THRESHOLD_MS 이상 멈춰 있는 것을 발견하면
+  그 순간 루프 스레드에서 실행 중인 코드의 stack과 처리 중인 요청 경로를 출력하고 최근 목록에 보관합니다.
+  (동기 bcrypt, 파일 읽기 등 루프를 막는 호출을 찾는 용도)
+
+루프가 멈춘 동안에는 감시 task도 실행되지 않으므로 stack 수집은 스레드에서 합니다.
+LOOP_LAG_THRESHOLD_MS가 0이면 측정만 하고 stack은 수집하지 않습니다.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from .config import LOOP_LAG_INTERVAL_MS, LOOP_LAG_MAX_REPORTS, LOOP_LAG_THRESHOLD_MS
+
+STACK_LIMIT = 30
+
+
+def _request_path(frame) -> Optional[str]:
+    """stack에서 처리 중인 ASGI 요청의 경로를 찾습니다. (가장 안쪽 scope 기준)"""
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and scope.get("type") == "http":
+            route = scope.get("route")
+            path = getattr(route, "path", None) or scope.get("path")
+            return f"{scope.get('method', '')} {path}".strip()
+        frame = frame.f_back
+    return None
+
+
+class LoopLagMonitor:
+    def __init__(
+        self,
+        interval_ms: float = LOOP_LAG_INTERVAL_MS,
+        threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+        max_reports: int = LOOP_LAG_MAX_REPORTS,
+    ):
+        self.interval = max(interval_ms, 1) / 1000
+        self.threshold = threshold_ms / 1000
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.total_lag = 0.0
+        self.over_threshold = 0
+        self.reports: deque = deque(maxlen=max(max_reports, 1))
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._open_report: Optional[dict] = None  # 루프가 다시 실행되면 전체 지연 시간을 기록
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+        if self.threshold > 0:
+            self._stop.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-lag-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._beat = now
+            self.record(max(now - started - self.interval, 0.0))
+
+    def record(self, lag: float):
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        self.total_lag += lag
+        if self.threshold > 0 and lag >= self.threshold:
+            self.over_threshold += 1
+        report, self._open_report = self._open_report, None
+        if report is not None:
+            report["lag_ms"] = round(lag * 1000, 1)
+
+    def _watch(self):
+        """루프가 threshold 이상 멈추면 멈춘 동안 한 번 stack을 기록합니다."""
+        reported_beat = None
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            reported_beat = beat
+            self.report(stalled, frame)
+
+    def report(self, stalled: float, frame):
+        path = _request_path(frame)
+        stack = traceback.format_stack(frame, limit=STACK_LIMIT)
+        report = {
+            "detected_at": datetime.now(timezone.utc).isoformat(),
+            "stalled_ms": round(stalled * 1000, 1),  # stack을 수집한 시점까지
+            "lag_ms": None,  # 전체 지연 시간 (루프가 다시 실행된 후 기록)
+            "request": path,
+            "stack": [line.rstrip() for line in stack],
+        }
+        self.reports.append(report)
+        self._open_report = report
+        print(
+            f"Warning: event loop blocked for {stalled * 1000:.0f}ms+ "
+            f"(request: {path or '-'})\n{''.join(stack)}"
+        )
+
+    def status(self) -> dict:
+        return {
+            "lag_ms": round(self.lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "avg_lag_ms": round(self.total_lag / self.samples * 1000, 2) if self.samples else 0.0,
+            "samples": self.samples,
+            "threshold_ms": self.threshold * 1000,
+            "over_threshold": self.over_threshold,
+            "blocked_reports": len(self.reports),
+        }
@@ -1,28 +1,72 @@
 import os
 import json
+import asyncio
+import hashlib
+import math
+import random
+import time
 from datetime import datetime, timedelta
 from typing import List, Optional, Union
 
 import bcrypt
 import jwt
 from contextlib import asynccontextmanager
-from fastapi import Depends, FastAPI, HTTPException, status, Body, Header, Request, BackgroundTasks, Security
-from fastapi.responses import HTMLResponse
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    status,
+    Body,
+    Header,
+    Request,
+    BackgroundTasks,
+    Security,
+    File,
+    UploadFile,
+    Query,
+)
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm, APIKeyHeader
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import create_engine, select, delete
-from sqlalchemy.orm import Session, sessionmaker, selectinload
+from sqlalchemy import create_engine, select, delete, func, and_, or_, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session, sessionmaker, selectinload, joinedload
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from .config import (
+    DB_ECHO,
+    DB_REPLICA_URL,
     DB_URL,
     JWT_ALGORITHM,
     JWT_EXPIRE_MINUTES,
     JWT_SECRET_KEY,
+    KEY_INFO_AUDIT_MAX_IDS,
+    KEY_INFO_CHUNK_SIZE,
+    KEY_LOOKUP_MAX_KEYS,
     SERVER_API_KEY,
     LITELLM_USER_ID,
+    PROFILE_SAMPLE_RATE,
+    PROFILING_ENABLED,
+    SEARCH_COUNT_LIMIT,
+    MAX_PAGE_SIZE,
+)
+from .models import (
+    Admin,
+    Base,
+    User,
+    EventLog,
+    Job,
+    JobItem,
+    ModelProfile,
 )
-from .models import Admin, Base, User, AllowedModel, AllowedService, EventLog
 from .schemas import (
     AdminCreateRequest,
     PasswordChangeRequest,
@@ -31,69 +75,366 @@ from .schemas import (
     UsersCreateListRequest,
     UsersBatchUpdateRequest,
     UsersDeleteRequest,
+    UsersRotateKeysRequest,
     UserRead,
+    UserSearchResponse,
     KeyRequest,
     KeyResponse,
+    KeyLookupRequest,
+    KeyLookupResponse,
     EventLogRead,
     EventLogFilter,
+    EventLogStatsResponse,
     AdminPasswordSetRequest,
+    ReconcileRequest,
+    MemoryTraceRequest,
+    JobRead,
+    JobItemRead,
+    ModelProfileCreateRequest,
+    ModelProfileRead,
+    ModelProfileUpdateRequest,
+    ModelReplaceRequest,
+    ModelReplaceResponse,
+    ModelUsersResponse,
+)
+from .admission import AdmissionController
+from .audit_rollup import GROUP_COLUMNS, PERIODS, EventLogRollupWorker, rollup_stats
+from .db_pool import (
+    async_engine_options,
+    compiled_cache_size,
+    pool_budget,
+    sync_engine_options,
 )
+from .event_partitions import EventLogMaintenanceWorker
+from .idempotency import (
+    CLAIMED,
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENT_ROUTES,
+    MAX_KEY_LENGTH,
+    MISMATCH,
+    REPLAY,
+    IdempotencyStore,
+    request_fingerprint,
+)
+from .jobs import (
+    MODEL_PROFILE_SYNC,
+    USER_BATCH_DELETE,
+    USER_BATCH_UPDATE,
+    USER_IMPORT,
+    USER_KEY_ROTATE,
+    JobRunner,
+    detect_import_format,
+    new_job_id,
+    remove_job_file,
+    save_upload,
+)
+from .key_lookup import KeyLookupCache, key_fingerprint
 from .litellm_service import LiteLLMService
+from .model_profiles import (
+    assign_models,
+    effective_models,
+    profiles_with_model,
+    replace_in_list,
+    replace_user_models,
+    resolve_profiles,
+)
+from .loop_monitor import LoopLagMonitor
+from .memory_profiler import (
+    GROUP_BY,
+    MAX_TRACE_SECONDS,
+    MemoryProfiler,
+    object_counts,
+    process_memory,
+)
+from .profiling import ProfileStore, SamplingProfiler
+from .outbox import DELETE_KEY, UPDATE_MODELS, OutboxDispatcher, enqueue_many
+from .read_replica import STICKY_COOKIE, ReplicaRouter
+from .slow_queries import RequestScopeMiddleware, SlowQueryLog
+from .tracing import TracingMiddleware, current_request_id, tracer
+from .reconcile import Reconciler
+from .user_search import search_user_ids
 
 
 def init_db():
     """기본 슈퍼 관리자 계정 생성"""
-    # 동기 엔진 생성
-    sync_engine = create_engine(DB_URL)
-
-    # 기본 슈퍼 관리자 계정 생성
-    with sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)() as session:
+    # 기본 슈퍼 관리자 계정 생성 (worker 풀의 동기 세션 사용)
+    with SyncSessionLocal() as session:
         # 이미 mama 계정이 있는지 확인
         existing_admin = session.query(Admin).filter(Admin.username == "mama").first()
         if not existing_admin:
             admin = Admin(username="mama", is_super_admin=True)
             admin.set_password("mama")
             session.add(admin)
-            session.commit()
-            print("기본 슈퍼 관리자 계정이 생성되었습니다. (mama/mama)")
+            try:
+                session.commit()
+                print("기본 슈퍼 관리자 계정이 생성되었습니다. (mama/mama)")
+            except IntegrityError:
+                # 여러 worker가 동시에 시작하면 다른 worker가 먼저 생성할 수 있습니다.
+                session.rollback()
+                print("기본 슈퍼 관리자 계정이 이미 존재합니다.")
         else:
             print("기본 슈퍼 관리자 계정이 이미 존재합니다.")
 
-    sync_engine.dispose()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup 단계
     init_db()
+    loop_monitor.start()
+    outbox_dispatcher.start()
+    job_runner.start()
+    event_rollup.start()
+    event_log_maintenance.start()
+    read_router.start()
     yield
-    # shutdown 단계 (필요하면 여기에 종료 처리 추가)
+    # shutdown 단계
+    await read_router.stop()
+    await event_log_maintenance.stop()
+    await event_rollup.stop()
+    await job_runner.stop()
+    await outbox_dispatcher.stop()
+    await reconciler.stop()
+    await loop_monitor.stop()
 
 
 app = FastAPI(lifespan=lifespan)
 
+
+async def profile_request(request: Request, call_next):
+    """
+    슈퍼 관리자의 X-Profile: true 요청 또는 PROFILE_SAMPLE_RATE 비율의 요청을 프로파일링합니다.
+    (PROFILING_ENABLED=true일 때만 등록, 결과 id는 X-Profile-Id 헤더)
+    """
+    requested = request.headers.get("x-profile", "").lower() == "true"
+    if (
+        not (
+            (requested and is_super_admin_request(request))
+            or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE)
+        )
+        or profile_lock.locked()
+    ):
+        return await call_next(request)
+    async with profile_lock:
+        profiler = SamplingProfiler()
+        in_flight = admission.in_flight
+        started = datetime.utcnow()
+        begin = time.perf_counter()
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            duration_ms = (time.perf_counter() - begin) * 1000
+            samples = await asyncio.to_thread(profiler.stop)
+        info = {
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "started_at": started.isoformat(),
+            "duration_ms": round(duration_ms, 1),
+            "in_flight": in_flight,
+            "requested_by": request_identity(request) if requested else None,
+        }
+        try:
+            response.headers["X-Profile-Id"] = await asyncio.to_thread(
+                profile_store.save, samples, info
+            )
+        except OSError as e:
+            print(f"Warning: failed to save profile: {e}")
+        return response
+
+
+if PROFILING_ENABLED:
+    app.middleware("http")(profile_request)
+
+
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    """변경 요청이 성공하면 요청자의 이후 조회를 잠시 primary로 보냅니다. (read-your-writes)"""
+    response = await call_next(request)
+    if (
+        request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+        and not getattr(request.state, "read_only", False)
+    ):
+        identity = request_identity(request)
+        read_router.mark_write(identity)
+        # 다른 worker가 이후 조회를 처리해도 primary를 사용하도록 쿠키로 전달합니다.
+        token = read_router.sticky_token(identity)
+        if token:
+            response.set_cookie(
+                STICKY_COOKIE,
+                token,
+                max_age=math.ceil(read_router.sticky_seconds),
+                httponly=True,
+                samesite="lax",
+            )
+    return response
+
+
+# 저장하지 않는 응답 (재시도하면 결과가 달라질 수 있음)
+IDEMPOTENCY_RETRYABLE_STATUS = {401, 403, 408, 429}
+
+
+@app.middleware("http")
+async def idempotency(request: Request, call_next):
+    """
+    Idempotency-Key 헤더가 있는 사용자 생성/배치 수정/배치 삭제 요청은 응답을 저장하고,
+    같은 키로 재시도하면 다시 실행하지 않고 저장된 응답을 반환합니다.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key or (request.method, request.url.path) not in IDEMPOTENT_ROUTES:
+        return await call_next(request)
+    scope = request_identity(request)
+    if scope is None:
+        return await call_next(request)  # 인증 실패는 엔드포인트에서 처리
+    if len(key) > MAX_KEY_LENGTH:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} chars."},
+        )
+    fingerprint = request_fingerprint(
+        request.method, request.url.path, request.url.query, await request.body()
+    )
+    outcome, record = await idempotency_store.claim(scope, key, fingerprint)
+    if outcome == REPLAY:
+        return Response(
+            content=record.response_body,
+            status_code=record.response_status,
+            media_type=record.response_media_type,
+            headers={"Idempotent-Replayed": "true"},
+        )
+    if outcome == MISMATCH:
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            content={"detail": f"{IDEMPOTENCY_HEADER} was already used for a different request."},
+        )
+    if outcome != CLAIMED:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": f"A request with this {IDEMPOTENCY_HEADER} is in progress."},
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        response = await call_next(request)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+    except BaseException:
+        await idempotency_store.release(scope, key)
+        raise
+    if response.status_code >= 500 or response.status_code in IDEMPOTENCY_RETRYABLE_STATUS:
+        await idempotency_store.release(scope, key)
+    else:
+        await idempotency_store.complete(
+            scope, key, response.status_code, body.decode(), response.headers.get("content-type")
+        )
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    return Response(content=body, status_code=response.status_code, headers=headers)
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """요청자별 요청 수 제한(429)과 과부하 시 새 요청 거절(503), 상태 확인/프론트엔드는 제외"""
+    path = request.url.path
+    if path == "/" or path.startswith(("/health", "/static")):
+        return await call_next(request)
+    identity = request_identity(request)
+    client_host = request.client.host if request.client else None
+    rejected = admission.reject(identity, client_host)
+    if rejected:
+        status_code, retry_after = rejected
+        detail = (
+            "Too many requests."
+            if status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            else "Server is busy. Please retry later."
+        )
+        return JSONResponse(
+            status_code=status_code,
+            content={"detail": detail},
+            headers={"Retry-After": str(retry_after)},
+        )
+    with admission.admitted(identity, client_host):
+        return await call_next(request)
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """DB 연결을 DB_POOL_TIMEOUT 안에 얻지 못한 경우 500 대신 503"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy. Please retry later."},
+        headers={"Retry-After": "1"},
+    )
+
+
 # 정적 파일(프론트엔드 빌드 결과) 서빙 경로를 '/static'으로 변경
 app.mount("/static", StaticFiles(directory="./frontend/dist", html=True), name="static")
 
+# worker 프로세스 1개의 DB 연결 예산 (DB_MAX_CONNECTIONS / WEB_CONCURRENCY)
+pool_settings = pool_budget()
+
 # 동기 데이터베이스 설정 (백그라운드 로그용)
-sync_engine = create_engine(DB_URL)
+sync_engine = create_engine(DB_URL, **sync_engine_options(pool_settings))
 SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+# event_logs 월별 파티션 생성 및 보관 기간 정리 (advisory lock으로 한 프로세스만 실행)
+# 아카이브 중 감사 로그 풀을 점유하지 않도록 실행할 때만 연결하는 별도 엔진을 사용합니다.
+event_log_maintenance = EventLogMaintenanceWorker(create_engine(DB_URL, poolclass=NullPool))
 
 # 비동기 데이터베이스 설정
 ASYNC_DB_URL = DB_URL.replace("postgresql+psycopg2", "postgresql+asyncpg")
-engine = create_async_engine(
-    ASYNC_DB_URL,
-    echo=True,
-    pool_size=10,  # 기본 연결 풀 크기
-    max_overflow=20,  # 최대 오버플로우 연결 수
-    pool_timeout=30,  # 연결 대기 시간 (초)
-    pool_recycle=3600,  # 연결 재사용 시간 (1시간)
-    pool_pre_ping=True,  # 연결 유효성 검사
-)
+engine = create_async_engine(ASYNC_DB_URL, echo=DB_ECHO, **async_engine_options(pool_settings))
 SessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
 )
 
+# 읽기 전용 복제본 (설정 시 조회 전용 엔드포인트에서 사용)
+read_engine = None
+ReadSessionLocal = None
+if DB_REPLICA_URL:
+    read_engine = create_async_engine(
+        DB_REPLICA_URL.replace("postgresql+psycopg2", "postgresql+asyncpg"),
+        echo=DB_ECHO,
+        **async_engine_options(pool_settings),
+    )
+    ReadSessionLocal = async_sessionmaker(
+        autocommit=False, autoflush=False, bind=read_engine, class_=AsyncSession
+    )
+read_router = ReplicaRouter(SessionLocal, ReadSessionLocal, secret=JWT_SECRET_KEY)
+# 느린 쿼리 기록 (요청 경로와 EXPLAIN 결과 포함, worker별)
+slow_queries = SlowQueryLog()
+slow_queries.attach(engine, "primary")
+if read_engine is not None:
+    slow_queries.attach(read_engine, "replica")
+if slow_queries.enabled:
+    # 쿼리를 실행한 요청 경로 기록
+    app.add_middleware(RequestScopeMiddleware)
+# 요청 tracing (SQL: 비동기/감사 로그 엔진, LiteLLM: LiteLLMService)
+if tracer.enabled:
+    tracer.instrument_engine(engine.sync_engine, "primary")
+    tracer.instrument_engine(sync_engine, "audit")
+    if read_engine is not None:
+        tracer.instrument_engine(read_engine.sync_engine, "replica")
+# request id 부여 및 요청 span (가장 바깥 미들웨어)
+app.add_middleware(TracingMiddleware)
+# 요청 프로파일 저장소 (프로세스당 한 번에 하나의 요청만 프로파일링)
+profile_store = ProfileStore()
+profile_lock = asyncio.Lock()
+# 이벤트 루프 지연 측정 및 루프를 막는 호출의 stack 기록 (worker별)
+loop_monitor = LoopLagMonitor()
+# tracemalloc 스냅샷 (worker별)
+memory_profiler = MemoryProfiler()
+# key → 사용자 역조회 결과 캐시 (worker별)
+key_lookup_cache = KeyLookupCache()
+# Idempotency-Key 응답 저장소 (DB에 저장하므로 worker 간 공유)
+idempotency_store = IdempotencyStore(SessionLocal)
+# 요청 수 제한 및 과부하 시 요청 거절 (worker 프로세스별)
+admission = AdmissionController(pool_settings["pool_size"] + pool_settings["max_overflow"])
+
+# LiteLLM 변경 요청 outbox 전송기 및 DB↔LiteLLM 정합성 점검기 (프로세스당 1개)
+outbox_dispatcher = OutboxDispatcher(SessionLocal)
+reconciler = Reconciler(SessionLocal, on_keys_removed=key_lookup_cache.invalidate)
+# 이벤트 로그 집계기 (여러 프로세스에서 실행해도 중복 집계되지 않음)
+event_rollup = EventLogRollupWorker(SessionLocal)
+
 
 # DB 세션 의존성 함수
 async def get_db():
@@ -101,6 +442,50 @@ async def get_db():
         yield session
 
 
+def request_identity(request: Request) -> Optional[str]:
+    """
+    요청자 (관리자 username 또는 SERVER_API, 확인할 수 없으면 None)
+    요청 수 제한과 read-your-writes 판단에 사용하며, DB 조회 없이 헤더만 확인합니다.
+    """
+    if not hasattr(request.state, "identity"):
+        request.state.identity = _identity_from_headers(request)
+    return request.state.identity
+
+
+def _identity_from_headers(request: Request) -> Optional[str]:
+    x_api_key = request.headers.get("x-api-key")
+    if x_api_key:
+        return "SERVER_API" if x_api_key == SERVER_API_KEY else None
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM]).get("sub")
+    except jwt.PyJWTError:
+        return None
+
+
+def is_super_admin_request(request: Request) -> bool:
+    """JWT의 is_super_admin claim 확인 (DB 조회 없이, 프로파일링 요청 허용 여부에 사용)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except jwt.PyJWTError:
+        return False
+    return bool(payload.get("is_super_admin"))
+
+
+# 조회 전용 세션 의존성 함수 (복제본 사용 가능 시 복제본, 아니면 요청의 primary 세션)
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    request.state.read_only = True
+    async with read_router.session(
+        request_identity(request), primary=db, token=request.cookies.get(STICKY_COOKIE)
+    ) as session:
+        yield session
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -191,27 +576,47 @@ def superuser_required(current_admin: Admin = Depends(get_current_admin)):
         raise HTTPException(status_code=403, detail="Super admin privileges required.")
 
 
+def event_payload(**fields) -> dict:
+    """
+    event_logs.payload (None인 항목 제외)
+    공통 필드: user_ids(영향받은 사용자), count, models, organization, model_profile, job_id
+    """
+    return {name: value for name, value in fields.items() if value is not None}
+
+
 def log_event_sync(
     admin_id: Optional[str],
     event_type: str,
     event_detail: Optional[str] = None,
     user_id: Optional[str] = None,
     result: str = "SUCCESS",
+    request_id: Optional[str] = None,
+    payload: Optional[dict] = None,
 ):
-    """(동기) 별도 트랜잭션으로 이벤트 로그를 생성합니다."""
+    """
+    (동기) 별도 트랜잭션으로 이벤트 로그를 생성합니다.
+    request_id를 생략하면 로그를 남긴 요청의 request id를 사용합니다. (BackgroundTasks는 요청 context 유지)
+    payload: 조회 필터에 사용할 구조화된 정보 (event_payload 참고), user_id는 payload의 user_ids에도 기록됩니다.
+    """
+    payload = dict(payload or {})
+    if user_id is not None:
+        payload.setdefault("user_ids", [user_id])
     db = None
     try:
-        db = SyncSessionLocal()  # 동기 세션 생성
-
-        event_log = EventLog(
-            admin_id=admin_id,
-            user_id=user_id,
-            event_type=event_type,
-            event_detail=event_detail,
-            result=result,
-        )
-        db.add(event_log)
-        db.commit()
+        with tracer.span("audit.write", event_type=event_type):
+            db = SyncSessionLocal()  # 동기 세션 생성
+
+            event_log = EventLog(
+                admin_id=admin_id,
+                user_id=user_id,
+                event_type=event_type,
+                event_detail=event_detail,
+                result=result,
+                request_id=request_id or current_request_id.get(),
+                payload=payload or None,
+            )
+            db.add(event_log)
+            db.commit()
     except Exception as e:
         print(f"Failed to create event log: {admin_id}, {event_type}, {e}")
     finally:
@@ -219,6 +624,15 @@ def log_event_sync(
             db.close()  # 세션 닫기
 
 
+# 백그라운드 작업(대량 import 등) 실행기
+job_runner = JobRunner(
+    SessionLocal,
+    audit=log_event_sync,
+    on_outbox_enqueued=outbox_dispatcher.wake,
+    on_keys_removed=key_lookup_cache.invalidate,
+)
+
+
 @app.post("/login")
 async def login(
     request: Request,
@@ -440,39 +854,122 @@ async def db_health_check():
         "checked_in": pool.checkedin(),
         "checked_out": pool.checkedout(),
         "overflow": pool.overflow(),
-        "invalid": pool.invalid(),
+        "budget": pool_settings,
+        "admission": admission.status(),
+        "replica": read_router.status(),
+        "event_loop": loop_monitor.status(),
     }
 
 
+@app.get("/profiles")
+async def list_profiles(current_admin: Admin = Depends(superuser_required)):
+    """저장된 요청 프로파일 목록 (최근 순)"""
+    return {
+        "enabled": PROFILING_ENABLED,
+        "profiles": await asyncio.to_thread(profile_store.entries),
+    }
+
+
+@app.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, current_admin: Admin = Depends(superuser_required)):
+    """folded stack 파일 다운로드 (flamegraph.pl, speedscope 등에서 사용)"""
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.folded")
+
+
+def user_to_dict(
+    user: User,
+    allowed_models: list[str],
+    allowed_services: list[str],
+    model_profile: Optional[str] = None,
+) -> dict:
+    """UserRead 응답 형식의 dict로 변환"""
+    return {
+        "id": user.id,
+        "user_id": user.user_id,
+        "organization": user.organization,
+        "key_value": user.key_value,
+        "extra_info": user.extra_info,
+        "created_at": user.created_at.isoformat() if user.created_at is not None else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at is not None else None,
+        "allowed_models": allowed_models,
+        "allowed_services": allowed_services,
+        "model_profile": model_profile,
+    }
+
+
+def user_options():
+    """UserRead 응답에 필요한 관계를 함께 로드하는 옵션 (프로필은 JOIN으로 같은 쿼리에서 조회)"""
+    return (joinedload(User.model_profile),)
+
+
+def user_read_dict(user: User) -> dict:
+    """user_options()로 로드한 사용자를 UserRead 응답 형식의 dict로 변환"""
+    return user_to_dict(
+        user,
+        effective_models(user),
+        list(user.allowed_services or []),
+        user.model_profile.name if user.model_profile else None,
+    )
+
+
+async def read_users(db: AsyncSession, user_ids: list[str]) -> list[dict]:
+    """
+    사용자들을 UserRead 형식으로 다시 읽습니다.
+    (assign_models의 일괄 UPDATE 후 세션에 남은 이전 model_profile 관계를 덮어쓰도록 populate_existing 사용)
+    """
+    result = await db.execute(
+        select(User)
+        .options(*user_options())
+        .where(User.user_id.in_(user_ids))
+        .execution_options(populate_existing=True)
+    )
+    return [user_read_dict(user) for user in result.scalars()]
+
+
 @app.get("/users", response_model=List[UserRead])
 async def list_users(
     organization: Optional[str] = None,
     auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    stmt = select(User).options(
-        selectinload(User.allowed_models), selectinload(User.allowed_services)
-    )
+    stmt = select(User).options(*user_options())
     if organization:
         stmt = stmt.where(User.organization == organization)
     result = await db.execute(stmt)
     users = result.scalars().all()
-    out = []
-    for user in users:
-        out.append(
-            {
-                "id": user.id,
-                "user_id": user.user_id,
-                "organization": user.organization,
-                "key_value": user.key_value,
-                "extra_info": user.extra_info,
-                "created_at": user.created_at.isoformat() if user.created_at is not None else None,
-                "updated_at": user.updated_at.isoformat() if user.updated_at is not None else None,
-                "allowed_models": [m.model_name for m in user.allowed_models],
-                "allowed_services": [s.service_name for s in user.allowed_services],
-            }
-        )
-    return out
+    return [user_read_dict(user) for user in users]
+
+
+@app.get("/users/search", response_model=UserSearchResponse)
+async def search_users(
+    q: str,
+    organization: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    user_id / organization / extra_info 검색 (대소문자 무시)
+    순위: user_id 정확히 일치 > user_id 접두 일치 > 부분 일치(3자 이상), 같은 순위는 user_id 순
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="검색어가 필요합니다.")
+    total, ids = await search_user_ids(db, q, organization, limit, offset)
+    result = await db.execute(select(User).options(*user_options()).where(User.id.in_(ids)))
+    users = {user.id: user for user in result.scalars()}
+    return {
+        "query": q,
+        "total": min(total, SEARCH_COUNT_LIMIT),
+        "total_capped": total > SEARCH_COUNT_LIMIT,
+        "limit": limit,
+        "offset": offset,
+        "users": [user_read_dict(users[pk]) for pk in ids if pk in users],
+    }
 
 
 @app.get("/user/{user_id}", response_model=UserRead)
@@ -482,26 +979,25 @@ async def get_user(
     db: AsyncSession = Depends(get_db),
 ):
     """특정 사용자 정보 조회"""
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.allowed_models), selectinload(User.allowed_services))
-        .where(User.user_id == user_id)
-    )
+    result = await db.execute(select(User).options(*user_options()).where(User.user_id == user_id))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-    return {
-        "id": user.id,
-        "user_id": user.user_id,
-        "organization": user.organization,
-        "key_value": user.key_value,
-        "extra_info": user.extra_info,
-        "created_at": user.created_at.isoformat() if user.created_at is not None else None,
-        "updated_at": user.updated_at.isoformat() if user.updated_at is not None else None,
-        "allowed_models": [m.model_name for m in user.allowed_models],
-        "allowed_services": [s.service_name for s in user.allowed_services],
-    }
+    return user_read_dict(user)
+
+
+async def discard_minted_keys(db: AsyncSession, key_values: List[str]):
+    """저장하지 못한 사용자의 LiteLLM key를 outbox로 삭제 예약합니다. (롤백 이후 호출)"""
+    if not key_values:
+        return
+    try:
+        await enqueue_many(db, DELETE_KEY, [(key_value, None) for key_value in key_values])
+        await db.commit()
+        outbox_dispatcher.wake()
+    except Exception as e:
+        await db.rollback()
+        print(f"Warning: failed to schedule deletion of orphaned LiteLLM keys: {e}")
 
 
 @app.post("/users", response_model=List[UserRead])
@@ -535,34 +1031,43 @@ async def create_user(
                 detail=f"존재하는 사용자 ID가 있습니다: {', '.join(existing_user_ids)}",
             )
 
+        # 모델 프로필 조회 (없는 프로필이면 400)
+        profiles = await resolve_profiles(db, [user.model_profile for user in req.users])
+
         # LiteLLM 키 초기화
         litellm_service = LiteLLMService()
 
         # 모든 사용자 생성
         created_users_data = []
+        minted_keys = []  # 실패 시 LiteLLM에서 삭제할 key
         for user_req in req.users:
+            profile = profiles.get(user_req.model_profile)
             try:
                 # LiteLLM에서 키 생성
-                # 모델 리스트를 받아옵니다
+                # 모델 리스트를 받아옵니다 (프로필이 지정되면 프로필의 모델)
                 key_value = await litellm_service.generate_key(
-                    models=user_req.allowed_models,  # 모델 리스트를 받아옵니다
+                    models=profile.models if profile else user_req.allowed_models,
                     user_id=LITELLM_USER_ID,  # 환경 변수에서 가져온 LiteLLM 사용자 ID
                     key_alias=user_req.user_id,
                     metadata={"organization": user_req.organization},
                 )
+                minted_keys.append(key_value)
 
                 user = User(
                     user_id=user_req.user_id,
                     organization=user_req.organization,
                     key_value=key_value,
                     extra_info=user_req.extra_info,
+                    allowed_models=[] if profile else user_req.allowed_models,
+                    model_profile_id=profile.id if profile else None,
                 )
                 db.add(user)
                 created_users_data.append({"user": user, "user_req": user_req})
 
             except Exception as e:
-                # 생성 실패에 대한 롤백
+                # 생성 실패에 대한 롤백 (이미 생성한 LiteLLM key는 삭제 예약)
                 await db.rollback()
+                await discard_minted_keys(db, minted_keys)
                 background_tasks.add_task(
                     log_event_sync,
                     admin_id=admin_username,  # username 사용
@@ -575,27 +1080,21 @@ async def create_user(
                     detail=f"사용자 {user_req.user_id} 생성에 실패했습니다: {str(e)}",
                 )
 
-        # 먼저 사용자들을 커밋하고 ID를 생성합니다
-        await db.commit()
-
-        # 생성된 사용자들의 ID를 조회하여 모델 권한을 설정합니다
-        for data in created_users_data:
-            # 사용자 ID를 조회합니다
-            result = await db.execute(
-                select(User.id).where(User.user_id == data["user_req"].user_id)
-            )
-            user_id = result.scalar_one()
-
-            # 사용자 모델 권한 설정 (ID가 생성됨)
-            for model_name in data["user_req"].allowed_models:
-                allowed_model = AllowedModel(user_id=user_id, model_name=model_name)
-                db.add(allowed_model)
-
-        # 모델 권한 커밋
-        await db.commit()
+        # 사용자와 모델 권한(allowed_models 컬럼)을 함께 커밋합니다
+        try:
+            await db.commit()
+        except Exception:
+            # 동시에 같은 user_id가 생성된 경우 등: 생성한 key가 남지 않도록 삭제 예약
+            await db.rollback()
+            await discard_minted_keys(db, minted_keys)
+            raise
 
         # 성공 로그 기록 (백그라운드에서 처리)
         created_user_ids = [data["user_req"].user_id for data in created_users_data]
+        created_models = set()
+        for data in created_users_data:
+            profile = profiles.get(data["user_req"].model_profile)
+            created_models.update(profile.models if profile else data["user_req"].allowed_models)
         background_tasks.add_task(
             log_event_sync,
             admin_id=admin_username,
@@ -603,44 +1102,16 @@ async def create_user(
             event_type="USER_CREATE",
             event_detail=f"Users created successfully: {created_user_ids}",
             result="SUCCESS",
+            payload=event_payload(
+                user_ids=created_user_ids,
+                count=len(created_user_ids),
+                models=sorted(created_models),
+            ),
         )
 
-        # 응답 형식으로 변환
-        result_users = []
-        for data in created_users_data:
-            # 생성된 사용자를 조회합니다
-            result = await db.execute(select(User).where(User.user_id == data["user_req"].user_id))
-            created_user = result.scalar_one()
-
-            # 생성된 사용자의 allowed_models를 조회합니다
-            models_result = await db.execute(
-                select(AllowedModel.model_name).where(AllowedModel.user_id == created_user.id)
-            )
-            allowed_models = [row[0] for row in models_result.fetchall()]
-
-            result_users.append(
-                {
-                    "id": created_user.id,
-                    "user_id": created_user.user_id,
-                    "organization": created_user.organization,
-                    "key_value": created_user.key_value,
-                    "extra_info": created_user.extra_info,
-                    "created_at": (
-                        created_user.created_at.isoformat()
-                        if created_user.created_at is not None
-                        else None
-                    ),
-                    "updated_at": (
-                        created_user.updated_at.isoformat()
-                        if created_user.updated_at is not None
-                        else None
-                    ),
-                    "allowed_models": allowed_models,
-                    "allowed_services": [],
-                }
-            )
-
-        return result_users
+        # 응답 형식으로 변환 (요청 순서 유지)
+        by_user_id = {user["user_id"]: user for user in await read_users(db, created_user_ids)}
+        return [by_user_id[user_id] for user_id in created_user_ids]
     except HTTPException:
         raise
     except Exception as e:
@@ -654,6 +1125,47 @@ async def create_user(
         raise
 
 
+@app.post("/users/import", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+async def import_users(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = None,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+):
+    """CSV/JSONL 파일로 사용자 대량 생성 (백그라운드 작업으로 처리하고 job id 반환)"""
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    try:
+        fmt = detect_import_format(file.filename, file_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 파일을 모두 저장한 뒤 작업을 만들어야 워커가 미완성 파일을 읽지 않습니다.
+    job_id = new_job_id()
+    path = await save_upload(file, job_id, fmt)
+    try:
+        job = await job_runner.create_job(
+            USER_IMPORT,
+            admin_username,
+            {"format": fmt, "path": path, "filename": file.filename},
+            job_id=job_id,
+        )
+    except Exception:
+        remove_job_file(path)
+        raise
+    job_runner.submit(job.id)
+
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type=USER_IMPORT,
+        event_detail=f"User import job created: {job.id} ({file.filename})",
+        result="SUCCESS",
+        payload=event_payload(job_id=job.id),
+    )
+    return job
+
+
 def verify_server_api_key(x_api_key: str = Header(None)) -> str:
     """Verify x-api-key header and return 'SERVER_API' identifier for logging"""
     if x_api_key != SERVER_API_KEY:
@@ -693,28 +1205,139 @@ async def get_user_key(
     return {"key": user.key_value}
 
 
+def summarize_ids(ids: list[str], limit: int = KEY_INFO_AUDIT_MAX_IDS) -> str:
+    """감사 로그용 id 목록 (많으면 앞부분 일부, 개수, 전체 목록의 SHA-256 앞 16자리)"""
+    if len(ids) <= limit:
+        return str(ids)
+    return f"{ids[:limit]} ... ({len(ids)} ids, sha256:{ids_digest(ids)})"
+
+
+def ids_digest(ids: list[str]) -> str:
+    return hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()[:16]
+
+
+async def fetch_user_keys(db: AsyncSession, user_ids: list[str]) -> list[tuple[str, str]]:
+    """(user_id, key) 목록을 요청 순서대로 반환합니다. (없는 사용자 제외)"""
+    # id 수와 관계없이 같은 SQL(배열 파라미터 하나)로 실행됩니다.
+    result = await db.execute(
+        select(User.user_id, User.key_value).where(
+            User.user_id == any_(bindparam("user_ids", user_ids, type_=ARRAY(String)))
+        )
+    )
+    keys = dict(result.all())
+    return [(user_id, keys[user_id]) for user_id in user_ids if user_id in keys]
+
+
+def log_keys_info(admin_id: str, user_ids: list[str], progress: dict):
+    """POST /key/info 감사 로그 (스트리밍 응답이면 전송이 끝난 뒤 기록)"""
+    complete = progress["chunks"] == progress["total_chunks"]
+    log_event_sync(
+        admin_id=admin_id,
+        event_type="GET_KEYS_INFO",
+        event_detail=(
+            f"Keys info retrieved for {progress['found']} users"
+            f"{'' if complete else ' (response interrupted)'}: {summarize_ids(user_ids)}"
+        ),
+        user_id=user_ids[0] if user_ids else None,
+        result="SUCCESS" if complete else "FAILURE",
+        payload=event_payload(
+            # 많으면 id 목록 대신 개수와 digest만 기록
+            user_ids=user_ids if len(user_ids) <= KEY_INFO_AUDIT_MAX_IDS else None,
+            ids_sha256=ids_digest(user_ids) if len(user_ids) > KEY_INFO_AUDIT_MAX_IDS else None,
+            count=len(user_ids),
+            found=progress["found"],
+        ),
+    )
+
+
 @app.post("/key/info", response_model=list[KeyResponse])
 async def get_keys(
     background_tasks: BackgroundTasks,
     req: KeyRequest = Body(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     x_api_key: str = Header(None),
 ):
+    """
+    여러 사용자의 key 조회
+    user_id를 KEY_INFO_CHUNK_SIZE개씩 나누어 조회하며, 한 청크를 넘으면 JSON 배열을 스트리밍으로 응답합니다.
+    """
     api_identifier = verify_server_api_key(x_api_key)
-    stmt = select(User).where(User.user_id.in_(req.user_ids))
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-    out = [KeyResponse(user_id=u.user_id, user_key=u.key_value) for u in users]
+    user_ids = list(dict.fromkeys(req.user_ids))
+    chunks = [
+        user_ids[start : start + KEY_INFO_CHUNK_SIZE]
+        for start in range(0, len(user_ids), KEY_INFO_CHUNK_SIZE)
+    ]
+    # 첫 청크는 응답 전에 조회하므로 DB 오류는 일반 오류 응답으로 반환됩니다.
+    first = await fetch_user_keys(db, chunks[0]) if chunks else []
+    progress = {"found": len(first), "chunks": min(len(chunks), 1), "total_chunks": len(chunks)}
+    background_tasks.add_task(log_keys_info, api_identifier, user_ids, progress)
+    if len(chunks) <= 1:
+        return [KeyResponse(user_id=user_id, user_key=key) for user_id, key in first]
+
+    async def stream_keys():
+        yield "["
+        rows, separator = first, ""
+        for index, chunk in enumerate(chunks):
+            if index > 0:
+                rows = await fetch_user_keys(db, chunk)
+                progress["found"] += len(rows)
+                progress["chunks"] += 1
+            if rows:
+                yield separator + ",".join(
+                    json.dumps({"user_id": user_id, "user_key": key}) for user_id, key in rows
+                )
+                separator = ","
+        yield "]"
+
+    return StreamingResponse(stream_keys(), media_type="application/json")
+
+
+@app.post("/key/lookup", response_model=list[KeyLookupResponse])
+async def lookup_keys(
+    background_tasks: BackgroundTasks,
+    req: KeyLookupRequest = Body(...),
+    db: AsyncSession = Depends(get_read_db),
+    x_api_key: str = Header(None),
+):
+    """
+    LiteLLM key로 사용자(user_id, organization)를 조회합니다. (요청 순서대로 반환)
+    key 원문은 조회/로그에 사용하지 않고 SHA-256 fingerprint(users.key_hash)로 조회합니다.
+    """
+    api_identifier = verify_server_api_key(x_api_key)
+    if len(req.keys) > KEY_LOOKUP_MAX_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {KEY_LOOKUP_MAX_KEYS} keys can be looked up at once",
+        )
+
+    key_hashes = [key_fingerprint(key) for key in req.keys]
+    owners = key_lookup_cache.get_many(key_hashes)
+    missing = list(set(key_hashes) - owners.keys())
+    if missing:
+        generation = key_lookup_cache.generation
+        result = await db.execute(
+            select(User.key_hash, User.user_id, User.organization).where(User.key_hash.in_(missing))
+        )
+        fetched = {
+            row.key_hash: {"user_id": row.user_id, "organization": row.organization}
+            for row in result
+        }
+        key_lookup_cache.put_many(fetched, generation)
+        owners.update(fetched)
 
     background_tasks.add_task(
         log_event_sync,
         admin_id=api_identifier,
-        event_type="GET_KEYS_INFO",
-        event_detail=f"Keys info retrieved for {len(out)} users: {req.user_ids}",
-        user_id=req.user_ids[0] if req.user_ids else None,
+        event_type="KEY_LOOKUP",
+        event_detail=f"Key lookup: {len(owners)} of {len(set(key_hashes))} keys matched",
         result="SUCCESS",
+        payload=event_payload(
+            user_ids=sorted({owner["user_id"] for owner in owners.values()}),
+            count=len(set(key_hashes)),
+            found=len(owners),
+        ),
     )
-    return out
+    return [owners.get(key_hash) or {} for key_hash in key_hashes]
 
 
 @app.get("/models")
@@ -731,15 +1354,343 @@ async def get_litellm_models(current_admin: Admin = Depends(get_current_admin)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/models/{model_name:path}/users", response_model=ModelUsersResponse)
+async def list_model_users(
+    model_name: str,
+    organization: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    모델 권한을 가진 사용자 조회 (직접 지정 + 프로필, user_id 순 페이지네이션)
+    직접 지정 여부는 users.allowed_models GIN 인덱스(@>)로 찾습니다.
+    """
+    profiles = await profiles_with_model(db, model_name)
+    profile_ids = [profile.id for profile in profiles]
+    direct = User.allowed_models.contains([model_name])
+    condition = or_(direct, User.model_profile_id.in_(profile_ids)) if profile_ids else direct
+    if organization:
+        condition = and_(condition, User.organization == organization)
+
+    counts = await db.execute(
+        select(User.organization, func.count(), func.count().filter(direct))
+        .where(condition)
+        .group_by(User.organization)
+    )
+    organizations = {}
+    total = direct_count = 0
+    for org, count, org_direct in counts.all():
+        # 조직이 없는 사용자(NULL)는 ""로 집계합니다.
+        organizations[org or ""] = organizations.get(org or "", 0) + count
+        total += count
+        direct_count += org_direct
+
+    result = await db.execute(
+        select(User.user_id, User.organization, ModelProfile.name)
+        .outerjoin(ModelProfile, User.model_profile_id == ModelProfile.id)
+        .where(condition)
+        .order_by(User.user_id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return {
+        "model_name": model_name,
+        "total": total,
+        "direct_count": direct_count,
+        "profile_count": total - direct_count,
+        "profiles": [profile.name for profile in profiles],
+        "organizations": organizations,
+        "limit": limit,
+        "offset": offset,
+        "users": [
+            {"user_id": user_id, "organization": org, "model_profile": profile_name}
+            for user_id, org, profile_name in result.all()
+        ],
+    }
+
+
+@app.post("/models/{model_name:path}/replace", response_model=ModelReplaceResponse)
+async def replace_model(
+    model_name: str,
+    background_tasks: BackgroundTasks,
+    req: ModelReplaceRequest,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    모델을 가진 모든 사용자의 권한에서 model_name을 new_model로 교체합니다. (new_model이 없으면 제거)
+    직접 지정 사용자는 UPDATE 한 번으로 변경하고 LiteLLM 반영은 outbox에 같은 트랜잭션으로 기록하며,
+    프로필은 프로필 모델을 수정한 뒤 MODEL_PROFILE_SYNC 작업으로 반영합니다.
+    """
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    if req.new_model == model_name:
+        raise HTTPException(status_code=400, detail="교체할 모델이 기존 모델과 같습니다.")
+
+    outbox_items = await replace_user_models(db, model_name, req.new_model)
+    await enqueue_many(db, UPDATE_MODELS, outbox_items)
+    profiles = await profiles_with_model(db, model_name)
+    for profile in profiles:
+        profile.models = replace_in_list(profile.models or [], model_name, req.new_model)
+    profile_ids = {profile.id: profile.name for profile in profiles}
+    await db.commit()
+    if outbox_items:
+        outbox_dispatcher.wake()
+
+    sync_job_ids = []
+    for profile_id in profile_ids:
+        user_count = await db.scalar(
+            select(func.count()).select_from(User).where(User.model_profile_id == profile_id)
+        )
+        if user_count:
+            job = await job_runner.create_job(
+                MODEL_PROFILE_SYNC, admin_username, {"profile_id": profile_id}, total=user_count
+            )
+            job_runner.submit(job.id)
+            sync_job_ids.append(job.id)
+
+    profile_names = list(profile_ids.values())
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type="MODEL_REPLACE",
+        event_detail=(
+            f"Model replaced: {model_name} -> {req.new_model} "
+            f"({len(outbox_items)} users, profiles: {profile_names}, sync jobs: {sync_job_ids})"
+        ),
+        result="SUCCESS",
+        payload=event_payload(
+            count=len(outbox_items),
+            models=[model for model in (model_name, req.new_model) if model],
+            model_profiles=profile_names,
+            job_ids=sync_job_ids,
+        ),
+    )
+    return {
+        "model_name": model_name,
+        "new_model": req.new_model,
+        "updated_users": len(outbox_items),
+        "profiles": profile_names,
+        "sync_job_ids": sync_job_ids,
+    }
+
+
+async def profile_read_dict(db: AsyncSession, profile: ModelProfile, sync_job_id=None) -> dict:
+    user_count = await db.scalar(
+        select(func.count()).select_from(User).where(User.model_profile_id == profile.id)
+    )
+    return {
+        "id": profile.id,
+        "name": profile.name,
+        "models": profile.models or [],
+        "description": profile.description,
+        "user_count": user_count,
+        "sync_job_id": sync_job_id,
+        "created_at": profile.created_at,
+        "updated_at": profile.updated_at,
+    }
+
+
+async def get_profile_or_404(db: AsyncSession, name: str) -> ModelProfile:
+    result = await db.execute(select(ModelProfile).where(ModelProfile.name == name))
+    profile = result.scalar_one_or_none()
+    if not profile:
+        raise HTTPException(status_code=404, detail="모델 프로필을 찾을 수 없습니다.")
+    return profile
+
+
+@app.get("/model-profiles", response_model=List[ModelProfileRead])
+async def list_model_profiles(
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """모델 프로필 목록 조회 (프로필별 사용자 수 포함)"""
+    result = await db.execute(
+        select(ModelProfile, func.count(User.id))
+        .outerjoin(User, User.model_profile_id == ModelProfile.id)
+        .group_by(ModelProfile.id)
+        .order_by(ModelProfile.name)
+    )
+    return [
+        {
+            "id": profile.id,
+            "name": profile.name,
+            "models": profile.models or [],
+            "description": profile.description,
+            "user_count": user_count,
+            "created_at": profile.created_at,
+            "updated_at": profile.updated_at,
+        }
+        for profile, user_count in result.all()
+    ]
+
+
+@app.get("/model-profiles/{name}", response_model=ModelProfileRead)
+async def get_model_profile(
+    name: str,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """모델 프로필 조회"""
+    profile = await get_profile_or_404(db, name)
+    return await profile_read_dict(db, profile)
+
+
+@app.post("/model-profiles", response_model=ModelProfileRead, status_code=201)
+async def create_model_profile(
+    background_tasks: BackgroundTasks,
+    req: ModelProfileCreateRequest,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """모델 프로필 생성"""
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    if not req.name:
+        raise HTTPException(status_code=400, detail="프로필 이름이 필요합니다.")
+    existing = await db.execute(select(ModelProfile.id).where(ModelProfile.name == req.name))
+    if existing.scalar_one_or_none() is not None:
+        raise HTTPException(status_code=400, detail=f"이미 존재하는 모델 프로필입니다: {req.name}")
+
+    profile = ModelProfile(name=req.name, models=req.models, description=req.description)
+    db.add(profile)
+    await db.commit()
+    await db.refresh(profile)
+
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type="MODEL_PROFILE_CREATE",
+        event_detail=f"Model profile created: {req.name} {req.models}",
+        result="SUCCESS",
+        payload=event_payload(model_profile=req.name, models=req.models),
+    )
+    return await profile_read_dict(db, profile)
+
+
+@app.put("/model-profiles/{name}", response_model=ModelProfileRead)
+async def update_model_profile(
+    name: str,
+    background_tasks: BackgroundTasks,
+    req: ModelProfileUpdateRequest,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    모델 프로필 수정. 프로필 한 행만 변경하며, 모델이 바뀌면 프로필 사용자들의 LiteLLM key는
+    MODEL_PROFILE_SYNC 작업으로 반영합니다. (sync_job_id로 진행 확인)
+    """
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    profile = await get_profile_or_404(db, name)
+
+    models_changed = req.models is not None and list(req.models) != list(profile.models or [])
+    if req.models is not None:
+        profile.models = req.models
+    if req.description is not None:
+        profile.description = req.description
+    await db.commit()
+    await db.refresh(profile)
+
+    sync_job_id = None
+    if models_changed:
+        user_count = await db.scalar(
+            select(func.count()).select_from(User).where(User.model_profile_id == profile.id)
+        )
+        if user_count:
+            job = await job_runner.create_job(
+                MODEL_PROFILE_SYNC, admin_username, {"profile_id": profile.id}, total=user_count
+            )
+            job_runner.submit(job.id)
+            sync_job_id = job.id
+
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type="MODEL_PROFILE_UPDATE",
+        event_detail=f"Model profile updated: {name} {profile.models} (sync job: {sync_job_id})",
+        result="SUCCESS",
+        payload=event_payload(model_profile=name, models=profile.models, job_id=sync_job_id),
+    )
+    return await profile_read_dict(db, profile, sync_job_id)
+
+
+@app.delete("/model-profiles/{name}")
+async def delete_model_profile(
+    name: str,
+    background_tasks: BackgroundTasks,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """모델 프로필 삭제 (사용 중인 사용자가 있으면 409)"""
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    profile = await get_profile_or_404(db, name)
+    user_count = await db.scalar(
+        select(func.count()).select_from(User).where(User.model_profile_id == profile.id)
+    )
+    if user_count:
+        raise HTTPException(
+            status_code=409, detail=f"프로필을 사용하는 사용자가 있습니다: {user_count}명"
+        )
+    await db.delete(profile)
+    await db.commit()
+
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type="MODEL_PROFILE_DELETE",
+        event_detail=f"Model profile deleted: {name}",
+        result="SUCCESS",
+        payload=event_payload(model_profile=name),
+    )
+    return {"message": f"Successfully deleted model profile {name}"}
+
+
+async def submit_batch_job(
+    background_tasks: BackgroundTasks, job_type: str, admin_username: str, params: dict
+) -> JSONResponse:
+    """배치 요청을 작업으로 등록하고 202 응답을 만듭니다."""
+    job = await job_runner.create_job(
+        job_type, admin_username, params, total=len(params["user_ids"])
+    )
+    job_runner.submit(job.id)
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type=job_type,
+        event_detail=f"Job created: {job.id} ({len(params['user_ids'])} users)",
+        result="SUCCESS",
+        payload=event_payload(
+            job_id=job.id,
+            user_ids=params["user_ids"],
+            count=len(params["user_ids"]),
+            models=params.get("allowed_models") or None,
+            organization=params.get("organization"),
+            model_profile=params.get("model_profile"),
+        ),
+    )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobRead.model_validate(job, from_attributes=True).model_dump(mode="json"),
+    )
+
+
 @app.put("/users/batch", response_model=List[UserRead])
 async def batch_update_users(
     request: Request,
     background_tasks: BackgroundTasks,
     req: UsersBatchUpdateRequest,
+    async_job: bool = False,
     auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
     db: AsyncSession = Depends(get_db),
 ):
-    """복수 사용자 모델 권한 배치 수정"""
+    """
+    복수 사용자 모델 권한 배치 수정
+    async_job=true이면 작업으로 등록하고 202와 job 정보를 반환합니다. (GET /jobs/{job_id}로 진행 확인)
+    """
     try:
         # admin username을 미리 추출
         current_admin, api_identifier = auth
@@ -758,8 +1709,18 @@ async def batch_update_users(
                 detail="At least one user ID is required",
             )
 
+        if async_job:
+            await resolve_profiles(db, [req.model_profile])
+            return await submit_batch_job(
+                background_tasks, USER_BATCH_UPDATE, admin_username, req.dict()
+            )
+
         # 사용자 존재 여부 확인
-        result = await db.execute(select(User).where(User.user_id.in_(req.user_ids)))
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.model_profile))
+            .where(User.user_id.in_(req.user_ids))
+        )
         users = result.scalars().all()
 
         if len(users) != len(req.user_ids):
@@ -777,31 +1738,17 @@ async def batch_update_users(
                 detail=f"Users not found: {missing_user_ids}",
             )
 
-        updated_users = []
-
-        # LiteLLM 키 초기화
-        litellm_service = LiteLLMService()
+        # 모델 권한 업데이트: 프로필 지정 > allowed_models(빈 배열이 아닌 경우에만) > 프로필 해제
+        profiles = await resolve_profiles(db, [req.model_profile])
+        model_updates = await assign_models(
+            db,
+            users,
+            allowed_models=req.allowed_models or None,
+            profile=profiles.get(req.model_profile),
+            detach_profile=req.model_profile == "",
+        )
 
         for user in users:
-            # allowed_models 업데이트 (빈 배열이 아닌 경우에만)
-            if req.allowed_models is not None and len(req.allowed_models) > 0:
-                # 기존 allowed_models 삭제
-                await db.execute(delete(AllowedModel).where(AllowedModel.user_id == user.id))
-
-                # 새로운 allowed_models 추가
-                for model_name in req.allowed_models:
-                    allowed_model = AllowedModel(user_id=user.id, model_name=model_name)
-                    db.add(allowed_model)
-
-                # LiteLLM 키의 모델 권한 업데이트
-                try:
-                    await litellm_service.update_key_models(user.key_value, req.allowed_models)
-                except Exception as e:
-                    # LiteLLM 데이터 업데이트 실패에 대한 DB 커밋 (예외 발생 시 무시)
-                    print(
-                        f"Warning: Failed to update LiteLLM key models for user {user.user_id}: {str(e)}"
-                    )
-
             # organization 업데이트
             if req.organization is not None:
                 user.organization = req.organization
@@ -813,9 +1760,11 @@ async def batch_update_users(
             # updated_at 업데이트
             user.updated_at = datetime.utcnow()
 
-            updated_users.append(user)
+        # LiteLLM 키의 모델 권한 업데이트는 같은 트랜잭션의 outbox에 기록 후 비동기로 전송
+        await enqueue_many(db, UPDATE_MODELS, model_updates)
 
         await db.commit()
+        outbox_dispatcher.wake()
 
         # 성공 로그 기록 (백그라운드에서 처리)
         background_tasks.add_task(
@@ -824,43 +1773,17 @@ async def batch_update_users(
             event_type="USER_UPDATE",
             event_detail=f"Batch update completed successfully for users: {req.user_ids}",
             result="SUCCESS",
+            payload=event_payload(
+                user_ids=req.user_ids,
+                count=len(req.user_ids),
+                models=sorted({model for _, change in model_updates for model in change["models"]}),
+                organization=req.organization,
+                model_profile=req.model_profile,
+            ),
         )
 
         # 데이터 업데이트된 사용자들을 반환합니다
-        result_users = []
-        for user in updated_users:
-            await db.refresh(user)
-
-            # 데이터 allowed_models와 allowed_services를 조회합니다
-            models_result = await db.execute(
-                select(AllowedModel.model_name).where(AllowedModel.user_id == user.id)
-            )
-            allowed_models = [row[0] for row in models_result.fetchall()]
-
-            services_result = await db.execute(
-                select(AllowedService.service_name).where(AllowedService.user_id == user.id)
-            )
-            allowed_services = [row[0] for row in services_result.fetchall()]
-
-            result_users.append(
-                {
-                    "id": user.id,
-                    "user_id": user.user_id,
-                    "organization": user.organization,
-                    "key_value": user.key_value,
-                    "extra_info": user.extra_info,
-                    "created_at": (
-                        user.created_at.isoformat() if user.created_at is not None else None
-                    ),
-                    "updated_at": (
-                        user.updated_at.isoformat() if user.updated_at is not None else None
-                    ),
-                    "allowed_models": allowed_models,
-                    "allowed_services": allowed_services,
-                }
-            )
-
-        return result_users
+        return await read_users(db, req.user_ids)
     except HTTPException:
         raise
     except Exception as e:
@@ -894,7 +1817,9 @@ async def update_user(
         admin_username = api_identifier if api_identifier else current_admin.username
 
         # 사용자 존재 여부 확인
-        result = await db.execute(select(User).where(User.user_id == user_id))
+        result = await db.execute(
+            select(User).options(selectinload(User.model_profile)).where(User.user_id == user_id)
+        )
         user = result.scalar_one_or_none()
 
         if not user:
@@ -916,42 +1841,30 @@ async def update_user(
         if req.extra_info is not None:
             user.extra_info = req.extra_info
 
-        # allowed_models 업데이트
-        if req.allowed_models is not None:
-            # 기존 allowed_models 삭제
-            await db.execute(delete(AllowedModel).where(AllowedModel.user_id == user.id))
-
-            # 새로운 allowed_models 추가
-            for model_name in req.allowed_models:
-                allowed_model = AllowedModel(user_id=user.id, model_name=model_name)
-                db.add(allowed_model)
+        # 모델 권한 업데이트: 프로필 지정 > allowed_models > 프로필 해제
+        # (프로필 사용자는 allowed_models를 명시한 경우에만 개별 모델로 전환)
+        profiles = await resolve_profiles(db, [req.model_profile])
+        if user.model_profile_id is None or "allowed_models" in req.model_fields_set:
+            allowed_models = req.allowed_models
+        else:
+            allowed_models = None
+        model_updates = await assign_models(
+            db,
+            [user],
+            allowed_models=allowed_models,
+            profile=profiles.get(req.model_profile),
+            detach_profile=req.model_profile == "",
+        )
 
-            # LiteLLM 키의 모델 권한 업데이트
-            try:
-                litellm_service = LiteLLMService()
-                await litellm_service.update_key_models(user.key_value, req.allowed_models)
-            except Exception as e:
-                # LiteLLM 데이터 업데이트 실패에 대한 DB 커밋 (예외 발생 시 무시)
-                print(
-                    f"Warning: Failed to update LiteLLM key models for user {user.user_id}: {str(e)}"
-                )
+        # LiteLLM 키의 모델 권한 업데이트 (outbox에 기록 후 비동기로 전송)
+        await enqueue_many(db, UPDATE_MODELS, model_updates)
 
         # updated_at 업데이트
         user.updated_at = datetime.utcnow()
 
         await db.commit()
-        await db.refresh(user)
-
-        # 데이터 allowed_models와 allowed_services를 조회합니다
-        models_result = await db.execute(
-            select(AllowedModel.model_name).where(AllowedModel.user_id == user.id)
-        )
-        allowed_models = [row[0] for row in models_result.fetchall()]
-
-        services_result = await db.execute(
-            select(AllowedService.service_name).where(AllowedService.user_id == user.id)
-        )
-        allowed_services = [row[0] for row in services_result.fetchall()]
+        outbox_dispatcher.wake()
+        (user_read,) = await read_users(db, [user_id])
 
         # 성공 로그 기록 (백그라운드에서 처리)
         background_tasks.add_task(
@@ -963,17 +1876,7 @@ async def update_user(
             result="SUCCESS",
         )
 
-        return {
-            "id": user.id,
-            "user_id": user.user_id,
-            "organization": user.organization,
-            "key_value": user.key_value,
-            "extra_info": user.extra_info,
-            "created_at": user.created_at.isoformat() if user.created_at is not None else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at is not None else None,
-            "allowed_models": allowed_models,
-            "allowed_services": allowed_services,
-        }
+        return user_read
     except HTTPException:
         raise
     except Exception as e:
@@ -992,10 +1895,14 @@ async def batch_delete_users(
     request: Request,
     background_tasks: BackgroundTasks,
     req: UsersDeleteRequest,
+    async_job: bool = False,
     current_admin: Admin = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    """복수 사용자 배치 삭제"""
+    """
+    복수 사용자 배치 삭제
+    async_job=true이면 작업으로 등록하고 202와 job 정보를 반환합니다. (GET /jobs/{job_id}로 진행 확인)
+    """
     try:
         # admin username을 미리 추출
         admin_username = current_admin.username
@@ -1013,6 +1920,11 @@ async def batch_delete_users(
                 detail="At least one user ID is required",
             )
 
+        if async_job:
+            return await submit_batch_job(
+                background_tasks, USER_BATCH_DELETE, admin_username, req.dict()
+            )
+
         # 사용자 존재 여부 확인
         result = await db.execute(select(User).where(User.user_id.in_(req.user_ids)))
         users = result.scalars().all()
@@ -1032,25 +1944,15 @@ async def batch_delete_users(
                 detail=f"Users not found: {missing_user_ids}",
             )
 
-        # LiteLLM 키 초기화
-        litellm_service = LiteLLMService()
-
-        # 관리자 이외의 모든 것 (AllowedModel, AllowedService)을 LiteLLM에 전달
-        for user in users:
-            await db.execute(delete(AllowedModel).where(AllowedModel.user_id == user.id))
-            await db.execute(delete(AllowedService).where(AllowedService.user_id == user.id))
-
-            # LiteLLM에서 키 삭제
-            try:
-                await litellm_service.delete_key(user.key_value)
-            except Exception as e:
-                # 키 삭제 실패에 대한 계속 진행 (예외 발생 시 무시)
-                print(f"Warning: Failed to delete LiteLLM key for user {user.user_id}: {str(e)}")
+        # LiteLLM 키 삭제는 같은 트랜잭션의 outbox에 기록 후 비동기로 전송
+        await enqueue_many(db, DELETE_KEY, [(user.key_value, None) for user in users])
 
         # 사용자 삭제
         await db.execute(delete(User).where(User.user_id.in_(req.user_ids)))
 
         await db.commit()
+        key_lookup_cache.invalidate(user.key_value for user in users)
+        outbox_dispatcher.wake()
 
         # 성공 로그 기록 (백그라운드에서 처리)
         background_tasks.add_task(
@@ -1059,6 +1961,7 @@ async def batch_delete_users(
             event_type="USER_DELETE",
             event_detail=f"Users deleted successfully: {req.user_ids}",
             result="SUCCESS",
+            payload=event_payload(user_ids=req.user_ids, count=len(req.user_ids)),
         )
 
         return {
@@ -1082,6 +1985,72 @@ async def batch_delete_users(
         )
 
 
+@app.post("/users/rotate-keys", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+async def rotate_user_keys(
+    background_tasks: BackgroundTasks,
+    req: UsersRotateKeysRequest,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    사용자 key 교체 (user_ids 또는 organization 중 하나 지정)
+    백그라운드 작업으로 처리하고 202와 job 정보를 반환합니다. (GET /jobs/{job_id}로 진행 확인)
+    이전 key는 grace_period_seconds(기본 KEY_ROTATION_GRACE_SECONDS) 동안 유지된 후 삭제됩니다.
+    """
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+
+    if (req.user_ids is None) == (req.organization is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify either user_ids or organization",
+        )
+    if req.grace_period_seconds is not None and req.grace_period_seconds < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="grace_period_seconds must not be negative",
+        )
+
+    params = {"grace_period_seconds": req.grace_period_seconds}
+    if req.user_ids is not None:
+        if not req.user_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one user ID is required",
+            )
+        params["user_ids"] = list(dict.fromkeys(req.user_ids))
+        total = len(params["user_ids"])
+        target = f"{total} users"
+    else:
+        params["organization"] = req.organization
+        total = await db.scalar(
+            select(func.count()).select_from(User).where(User.organization == req.organization)
+        )
+        if not total:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No users in organization: {req.organization}",
+            )
+        target = f"organization {req.organization}, {total} users"
+
+    job = await job_runner.create_job(USER_KEY_ROTATE, admin_username, params, total=total)
+    job_runner.submit(job.id)
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type=USER_KEY_ROTATE,
+        event_detail=f"Key rotation job created: {job.id} ({target})",
+        result="SUCCESS",
+        payload=event_payload(
+            job_id=job.id,
+            user_ids=params.get("user_ids"),
+            organization=params.get("organization"),
+            count=total,
+        ),
+    )
+    return job
+
+
 @app.get("/event-logs", response_model=List[EventLogRead])
 async def get_event_logs(
     admin_id: Optional[str] = None,
@@ -1090,12 +2059,35 @@ async def get_event_logs(
     result: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    limit: int = 100,
-    offset: int = 0,
+    request_id: Optional[str] = None,
+    affected_user_id: Optional[str] = None,
+    model: Optional[str] = None,
+    job_id: Optional[str] = None,
+    payload: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     current_admin: Admin = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """이벤트 로그 조회"""
+    """
+    이벤트 로그 조회
+    affected_user_id/model/job_id/payload(JSON 객체)는 payload 포함 조건(@>)으로 GIN 인덱스를 사용합니다.
+    affected_user_id는 배치 이벤트를 포함해 해당 사용자가 영향받은 로그를 찾습니다. (user_id는 대표 사용자 1명)
+    """
+    payload_filter = {}
+    if payload is not None:
+        try:
+            payload_filter = json.loads(payload)
+        except ValueError:
+            payload_filter = None
+        if not isinstance(payload_filter, dict):
+            raise HTTPException(status_code=400, detail="payload must be a JSON object")
+    if affected_user_id is not None:
+        payload_filter["user_ids"] = [affected_user_id]
+    if model is not None:
+        payload_filter["models"] = [model]
+    if job_id is not None:
+        payload_filter["job_id"] = job_id
     try:
         # 기본 쿼리
         stmt = select(EventLog)
@@ -1113,6 +2105,10 @@ async def get_event_logs(
             stmt = stmt.where(EventLog.created_at >= start_date)
         if end_date is not None:
             stmt = stmt.where(EventLog.created_at <= end_date)
+        if request_id is not None:
+            stmt = stmt.where(EventLog.request_id == request_id)
+        if payload_filter:
+            stmt = stmt.where(EventLog.payload.contains(payload_filter))
 
         # 정렬 (최신순)
         stmt = stmt.order_by(EventLog.created_at.desc())
@@ -1134,6 +2130,8 @@ async def get_event_logs(
                     "event_type": log.event_type,
                     "event_detail": log.event_detail,
                     "result": log.result,
+                    "request_id": log.request_id,
+                    "payload": log.payload,
                     "created_at": log.created_at,
                 }
             )
@@ -1144,3 +2142,346 @@ async def get_event_logs(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve event logs: {str(e)}",
         )
+
+
+@app.get("/event-logs/stats", response_model=EventLogStatsResponse)
+async def get_event_log_stats(
+    period: str = "hour",
+    group_by: str = "event_type,result",
+    admin_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    result: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_admin: Admin = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    이벤트 로그 통계 (시간/일 버킷별 건수, UTC 기준)
+    event_logs 전체가 아닌 집계 테이블(event_log_rollups)을 조회합니다.
+    :param group_by: 버킷과 함께 나눌 컬럼 (event_type, result, admin_id 중 쉼표 구분, 빈 값은 버킷만)
+    """
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period는 {list(PERIODS)} 중 하나여야 합니다.")
+    columns = [name.strip() for name in group_by.split(",") if name.strip()]
+    invalid = [name for name in columns if name not in GROUP_COLUMNS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 group_by 컬럼입니다: {invalid}")
+
+    buckets = await rollup_stats(
+        db,
+        period,
+        columns,
+        start_date=start_date,
+        end_date=end_date,
+        filters={"admin_id": admin_id, "event_type": event_type, "result": result},
+    )
+    return {
+        "period": period,
+        "group_by": columns,
+        "total": sum(bucket["count"] for bucket in buckets),
+        "buckets": buckets,
+    }
+
+
+@app.post("/admin/reconcile")
+async def start_reconcile(
+    background_tasks: BackgroundTasks,
+    req: ReconcileRequest,
+    current_admin: Admin = Depends(superuser_required),
+):
+    """DB↔LiteLLM 정합성 점검 시작 (repair=true 시 DB 기준으로 복구)"""
+    if reconciler.running:
+        raise HTTPException(status_code=409, detail="이미 정합성 점검이 진행 중입니다.")
+    state = reconciler.start(repair=req.repair, resume=req.resume)
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=current_admin.username,
+        event_type="RECONCILE",
+        event_detail=f"Reconcile started (repair={req.repair}, resume={req.resume})",
+        result="SUCCESS",
+    )
+    return state
+
+
+@app.get("/admin/reconcile")
+async def get_reconcile_status(current_admin: Admin = Depends(superuser_required)):
+    """DB↔LiteLLM 정합성 점검 진행 상태 및 결과 조회"""
+    return reconciler.state
+
+
+@app.get("/admin/outbox")
+async def get_outbox_status(current_admin: Admin = Depends(superuser_required)):
+    """LiteLLM outbox 상태별 항목 수 및 전송 통계 조회"""
+    return {
+        "counts": await outbox_dispatcher.status_counts(),
+        "dispatched": dict(outbox_dispatcher.stats),
+    }
+
+
+@app.get("/admin/loop-lag")
+async def get_loop_lag(current_admin: Admin = Depends(superuser_required)):
+    """이벤트 루프 지연 통계와 루프를 막은 호출의 최근 stack 기록 (요청을 처리한 worker 기준)"""
+    return {**loop_monitor.status(), "reports": list(loop_monitor.reports)}
+
+
+@app.get("/admin/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    min_duration_ms: float = 0,
+    current_admin: Admin = Depends(superuser_required),
+):
+    """최근 느린 쿼리 (요청 경로, 실행 시간, 일부는 EXPLAIN 결과, 요청을 처리한 worker 기준)"""
+    return {
+        **slow_queries.status(),
+        "queries": slow_queries.recent(limit, min_duration_ms),
+    }
+
+
+@app.get("/admin/traces")
+async def list_traces(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_admin: Admin = Depends(superuser_required),
+):
+    """최근 요청 trace 요약 (요청을 처리한 worker 기준)"""
+    return {
+        "enabled": tracer.enabled,
+        "sample_rate": tracer.sample_rate,
+        "dropped_spans": tracer.dropped_spans,
+        "traces": tracer.recent(limit),
+    }
+
+
+@app.get("/admin/traces/{trace_id}")
+async def get_trace(trace_id: str, current_admin: Admin = Depends(superuser_required)):
+    """trace의 span 목록 (trace id = 응답의 X-Request-ID = event_logs.request_id)"""
+    spans = tracer.trace(trace_id)
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Trace not found.")
+    return {"trace_id": trace_id, "spans": spans}
+
+
+def memory_cache_sizes() -> dict:
+    """프로세스 메모리에 유지하는 캐시/추적 정보의 항목 수"""
+    return {
+        "sql_compiled_cache": compiled_cache_size(engine),
+        "replica_sql_compiled_cache": (
+            compiled_cache_size(read_engine) if read_engine is not None else None
+        ),
+        "rate_limit_buckets": {kind: len(limiter) for kind, limiter in admission.limiters.items()},
+        "replica_sticky_writers": read_router.sticky_writers(),
+        "key_lookup_cache": len(key_lookup_cache),
+        "db_pool_checked_in": engine.pool.checkedin(),
+        "db_pool_checked_out": engine.pool.checkedout(),
+    }
+
+
+def _validate_group_by(group_by: str):
+    if group_by not in GROUP_BY:
+        raise HTTPException(
+            status_code=400, detail=f"group_by는 {list(GROUP_BY)} 중 하나여야 합니다."
+        )
+
+
+@app.get("/admin/memory")
+async def get_memory_status(
+    objects: bool = True, current_admin: Admin = Depends(superuser_required)
+):
+    """worker 메모리 사용량, ORM 객체 수(objects=true, 느림), 캐시 크기, tracemalloc 상태"""
+    result = {
+        "process": process_memory(),
+        "caches": memory_cache_sizes(),
+        "tracemalloc": memory_profiler.status(),
+    }
+    if objects:
+        result["objects"] = await asyncio.to_thread(
+            object_counts, (User, ModelProfile, EventLog, Job, JobItem, Admin)
+        )
+    return result
+
+
+@app.post("/admin/memory/trace")
+async def trace_memory(
+    seconds: float = Query(10.0, gt=0, le=MAX_TRACE_SECONDS),
+    frames: int = Query(1, ge=1, le=100),
+    group_by: str = "lineno",
+    limit: int = Query(20, ge=1, le=1000),
+    current_admin: Admin = Depends(superuser_required),
+):
+    """
+    seconds 동안 늘어난 할당을 한 요청에서 측정합니다. (응답의 pid = 측정한 worker)
+    여러 worker에서는 시작/스냅샷/비교 요청이 서로 다른 worker로 갈 수 있으므로 이 API를 사용하세요.
+    """
+    _validate_group_by(group_by)
+    try:
+        return await memory_profiler.trace(seconds, frames, group_by, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.post("/admin/memory/tracemalloc/start")
+async def start_tracemalloc(
+    req: MemoryTraceRequest, current_admin: Admin = Depends(superuser_required)
+):
+    """메모리 할당 추적 시작 (켜져 있는 동안 요청 처리가 느려짐)"""
+    return memory_profiler.start(req.frames)
+
+
+@app.post("/admin/memory/tracemalloc/stop")
+async def stop_tracemalloc(current_admin: Admin = Depends(superuser_required)):
+    """메모리 할당 추적 중지 (저장된 스냅샷도 삭제)"""
+    return memory_profiler.stop()
+
+
+@app.post("/admin/memory/snapshots")
+async def take_memory_snapshot(
+    group_by: str = "lineno",
+    limit: int = Query(20, ge=1, le=1000),
+    current_admin: Admin = Depends(superuser_required),
+):
+    """tracemalloc 스냅샷 저장 및 할당량 상위 항목 조회"""
+    _validate_group_by(group_by)
+    try:
+        return await asyncio.to_thread(memory_profiler.take_snapshot, group_by, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/admin/memory/snapshots/{snapshot_id}/diff")
+async def diff_memory_snapshots(
+    snapshot_id: str,
+    target: Optional[str] = None,
+    group_by: str = "lineno",
+    limit: int = Query(20, ge=1, le=1000),
+    current_admin: Admin = Depends(superuser_required),
+):
+    """snapshot_id 이후 늘어난 할당 (target을 생략하면 새 스냅샷을 저장하여 비교)"""
+    _validate_group_by(group_by)
+    try:
+        result = await asyncio.to_thread(memory_profiler.diff, snapshot_id, target, group_by, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"Snapshot not found on worker (pid {os.getpid()})."
+        )
+    return result
+
+
+@app.get("/jobs", response_model=List[JobRead])
+async def list_jobs(
+    job_type: Optional[str] = None,
+    job_status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """백그라운드 작업 목록 조회 (최신순)"""
+    stmt = select(Job)
+    if job_type is not None:
+        stmt = stmt.where(Job.job_type == job_type)
+    if job_status is not None:
+        stmt = stmt.where(Job.status == job_status)
+    stmt = stmt.order_by(Job.created_at.desc()).limit(limit).offset(offset)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+@app.get("/jobs/{job_id}", response_model=JobRead)
+async def get_job(
+    job_id: str,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """백그라운드 작업 진행 상황 조회"""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@app.get("/jobs/{job_id}/items", response_model=List[JobItemRead])
+async def get_job_items(
+    job_id: str,
+    item_status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """백그라운드 작업의 항목(행)별 처리 결과 조회"""
+    stmt = select(JobItem).where(JobItem.job_id == job_id)
+    if item_status is not None:
+        stmt = stmt.where(JobItem.status == item_status)
+    stmt = stmt.order_by(JobItem.item_no).limit(limit).offset(offset)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+@app.post("/jobs/{job_id}/resume", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+async def resume_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """실패했거나 중단된 작업을 마지막으로 저장된 위치부터 재개"""
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    if job.status not in ("FAILED", "CANCELLED", "PENDING") or job_runner.is_running(job_id):
+        raise HTTPException(status_code=409, detail=f"재개할 수 없는 작업 상태입니다: {job.status}")
+    if job.job_type == USER_IMPORT and not os.path.exists((job.params or {}).get("path", "")):
+        # JOB_FILES_RETENTION_SECONDS가 지나 업로드 파일이 삭제된 경우
+        raise HTTPException(
+            status_code=409, detail="업로드 파일이 삭제되어 재개할 수 없습니다. 다시 업로드하세요."
+        )
+    job.status = "PENDING"
+    job.error = None
+    job.cancel_requested = False
+    job.finished_at = None
+    await db.commit()
+    await db.refresh(job)
+    job_runner.submit(job_id)
+
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type=job.job_type,
+        event_detail=f"Job resumed: {job_id} (cursor={job.cursor})",
+        result="SUCCESS",
+        payload=event_payload(job_id=job_id),
+    )
+    return job
+
+
+@app.post("/jobs/{job_id}/cancel", response_model=JobRead)
+async def cancel_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    auth: tuple[Optional[Admin], Optional[str]] = Depends(get_current_admin_or_api_key),
+):
+    """
+    작업 취소 요청. 실행 중인 작업은 현재 청크까지 처리한 뒤 CANCELLED로 종료됩니다.
+    (이미 처리된 청크는 되돌리지 않습니다.)
+    """
+    current_admin, api_identifier = auth
+    admin_username = api_identifier if api_identifier else current_admin.username
+    job = await job_runner.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    if not job.cancel_requested:
+        raise HTTPException(status_code=409, detail=f"취소할 수 없는 작업 상태입니다: {job.status}")
+
+    background_tasks.add_task(
+        log_event_sync,
+        admin_id=admin_username,
+        event_type=job.job_type,
+        event_detail=f"Job cancel requested: {job_id}",
+        result="SUCCESS",
+        payload=event_payload(job_id=job_id),
+    )
+    return job
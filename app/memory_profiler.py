@@ -0,0 +1,182 @@
+"""
+worker 메모리 사용량 분석 (슈퍼 관리자 API에서 사용)
+
+- tracemalloc 시작/중지, 스냅샷 저장 및 두 스냅샷의 차이(파일/줄 단위)
+- 프로세스 RSS, ORM 객체(User, ModelProfile, EventLog 등) 수, 메모리 캐시 크기
+
+tracemalloc은 켜져 있는 동안 모든 메모리 할당을 추적하므로 느려지고 메모리를 더 사용합니다.
+분석이 끝나면 중지하세요. 결과는 요청을 처리한 worker 프로세스 기준입니다.
+여러 worker로 실행 중이면 요청마다 다른 worker가 처리할 수 있으므로 trace()로 한 요청 안에서 측정하세요.
+"""
+
+import asyncio
+import gc
+import os
+import resource
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from .config import MEMORY_MAX_SNAPSHOTS
+
+GROUP_BY = ("lineno", "filename", "traceback")
+MAX_TRACE_SECONDS = 300
+# 스냅샷에서 제외할 할당 (tracemalloc 자체와 import 과정)
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def process_memory() -> dict:
+    """현재/최대 RSS (bytes, /proc이 없으면 최대 RSS만)"""
+    memory = {"pid": os.getpid()}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("VmRSS", "VmHWM"):
+                    key = "rss_bytes" if name == "VmRSS" else "peak_rss_bytes"
+                    memory[key] = int(value.split()[0]) * 1024
+    except OSError:
+        memory["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return memory
+
+
+def object_counts(classes: Iterable[type]) -> dict:
+    """gc가 추적하는 객체 중 지정한 클래스의 인스턴스 수 (전체 객체를 순회하므로 느림)"""
+    classes = tuple(classes)
+    counts = Counter()
+    total = 0
+    for obj in gc.get_objects():
+        total += 1
+        if isinstance(obj, classes):
+            counts[type(obj).__name__] += 1
+    return {"total_objects": total, **{cls.__name__: counts[cls.__name__] for cls in classes}}
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def _stat_dict(stat, group_by: str) -> dict:
+    if group_by == "traceback":
+        # 마지막 호출 위치부터
+        location = [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)]
+    elif group_by == "filename":
+        location = stat.traceback[0].filename
+    else:
+        location = f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+    entry = {"location": location, "size_bytes": stat.size, "count": stat.count}
+    if hasattr(stat, "size_diff"):
+        entry.update(size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+    return entry
+
+
+class MemoryProfiler:
+    def __init__(self, max_snapshots: int = MEMORY_MAX_SNAPSHOTS):
+        self.max_snapshots = max(max_snapshots, 1)
+        self.snapshots: dict[str, tuple[str, tracemalloc.Snapshot]] = {}  # id -> (시각, 스냅샷)
+        self._seq = 0
+        self._trace_lock = asyncio.Lock()
+
+    def start(self, frames: int = 1) -> dict:
+        """할당 위치를 frames 단계까지 기록합니다. (이미 실행 중이면 그대로 유지)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(frames, 1))
+        return self.status()
+
+    def stop(self) -> dict:
+        tracemalloc.stop()
+        self.snapshots.clear()
+        return self.status()
+
+    def take_snapshot(self, group_by: str = "lineno", limit: int = 20) -> dict:
+        """스냅샷을 저장하고 할당량 상위 항목을 반환합니다. (개수 초과 시 오래된 것 삭제)"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        snapshot = _snapshot()
+        self._seq += 1
+        snapshot_id = str(self._seq)
+        self.snapshots[snapshot_id] = (datetime.now(timezone.utc).isoformat(), snapshot)
+        while len(self.snapshots) > self.max_snapshots:
+            del self.snapshots[next(iter(self.snapshots))]
+        stats = snapshot.statistics(group_by)
+        return {
+            "id": snapshot_id,
+            "pid": os.getpid(),
+            "total_bytes": sum(stat.size for stat in stats),
+            "top": [_stat_dict(stat, group_by) for stat in stats[:limit]],
+        }
+
+    def diff(
+        self,
+        base_id: str,
+        target_id: Optional[str] = None,
+        group_by: str = "lineno",
+        limit: int = 20,
+    ) -> Optional[dict]:
+        """base 이후 늘어난 할당 (target이 없으면 새 스냅샷과 비교), 없는 스냅샷이면 None"""
+        if base_id not in self.snapshots:
+            return None
+        base = self.snapshots[base_id][1]
+        if target_id is None:
+            target_id = self.take_snapshot(group_by, limit=0)["id"]
+        elif target_id not in self.snapshots:
+            return None
+        target = self.snapshots[target_id][1]
+        stats = target.compare_to(base, group_by)
+        return {
+            "pid": os.getpid(),
+            "base": base_id,
+            "target": target_id,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [_stat_dict(stat, group_by) for stat in stats[:limit]],
+        }
+
+    async def trace(
+        self, seconds: float, frames: int = 1, group_by: str = "lineno", limit: int = 20
+    ) -> dict:
+        """
+        seconds 동안 늘어난 할당을 한 번에 측정합니다. (시작/비교를 같은 worker에서 수행)
+        tracemalloc이 꺼져 있었으면 측정 후 다시 끄고, 스냅샷은 보관하지 않습니다.
+        """
+        if self._trace_lock.locked():
+            raise RuntimeError("another trace is running on this worker")
+        async with self._trace_lock:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(max(frames, 1))
+            try:
+                base = await asyncio.to_thread(_snapshot)
+                await asyncio.sleep(seconds)
+                target = await asyncio.to_thread(_snapshot)
+            finally:
+                if started:
+                    tracemalloc.stop()
+            stats = await asyncio.to_thread(target.compare_to, base, group_by)
+        return {
+            "pid": os.getpid(),
+            "seconds": seconds,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [_stat_dict(stat, group_by) for stat in stats[:limit]],
+        }
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "pid": os.getpid(),
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": [
+                {"id": snapshot_id, "taken_at": taken_at}
+                for snapshot_id, (taken_at, _) in self.snapshots.items()
+            ],
+        }
@@ -0,0 +1,127 @@
+"""
+모델 프로필
+
+프로필이 지정된 사용자는 users.allowed_models 대신 프로필의 모델 목록을 사용합니다.
+프로필 수정은 model_profiles 한 행만 변경하고, LiteLLM key 반영은 MODEL_PROFILE_SYNC 작업이
+프로필 사용자들을 청크 단위로 outbox에 기록해 처리합니다.
+"""
+
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import ModelProfile, User
+
+
+async def get_profiles_by_name(db: AsyncSession, names: Iterable[str]) -> dict[str, ModelProfile]:
+    names = {name for name in names if name}
+    if not names:
+        return {}
+    result = await db.execute(select(ModelProfile).where(ModelProfile.name.in_(names)))
+    return {profile.name: profile for profile in result.scalars()}
+
+
+async def resolve_profiles(db: AsyncSession, names: Iterable[str]) -> dict[str, ModelProfile]:
+    """요청에 지정된 프로필을 조회합니다. 없는 프로필이 있으면 400을 발생시킵니다."""
+    names = {name for name in names if name}
+    profiles = await get_profiles_by_name(db, names)
+    missing = sorted(names - profiles.keys())
+    if missing:
+        raise HTTPException(status_code=400, detail=f"존재하지 않는 모델 프로필입니다: {missing}")
+    return profiles
+
+
+def effective_models(user: User) -> list[str]:
+    """사용자에게 실제로 허용된 모델 목록 (프로필 사용자는 model_profile이 로드된 상태여야 함)"""
+    if user.model_profile_id is not None:
+        return list(user.model_profile.models or [])
+    return list(user.allowed_models or [])
+
+
+async def assign_models(
+    db: AsyncSession,
+    users: list[User],
+    allowed_models: Optional[list[str]] = None,
+    profile: Optional[ModelProfile] = None,
+    detach_profile: bool = False,
+) -> list[tuple[str, dict]]:
+    """
+    사용자들의 모델 권한을 집합 단위로 변경하고, LiteLLM에 반영할 (key, payload) 목록을 반환합니다.
+    (users는 model_profile이 로드된 상태여야 하며, commit은 호출자가 수행)
+
+    - profile 지정: 프로필 연결, 개별 모델 목록 비움
+    - allowed_models 지정: 개별 모델로 교체, 프로필 연결 해제
+    - detach_profile만 지정: 프로필의 현재 모델을 개별 모델로 복사해 권한을 유지한 채 연결 해제
+    """
+    pks = [user.id for user in users]
+    if not pks:
+        return []
+    if profile is not None:
+        await db.execute(
+            update(User)
+            .where(User.id.in_(pks))
+            .values(allowed_models=[], model_profile_id=profile.id)
+        )
+        return [(user.key_value, {"models": list(profile.models or [])}) for user in users]
+    if allowed_models is not None:
+        await db.execute(
+            update(User)
+            .where(User.id.in_(pks))
+            .values(allowed_models=allowed_models, model_profile_id=None)
+        )
+        return [(user.key_value, {"models": allowed_models}) for user in users]
+    if detach_profile:
+        attached = [user for user in users if user.model_profile_id is not None]
+        if attached:
+            await db.execute(
+                update(User),
+                [
+                    {
+                        "id": user.id,
+                        "allowed_models": list(user.model_profile.models or []),
+                        "model_profile_id": None,
+                    }
+                    for user in attached
+                ],
+            )
+    return []
+
+
+async def profiles_with_model(db: AsyncSession, model_name: str) -> list[ModelProfile]:
+    """모델을 포함한 프로필 목록 (프로필 수는 적으므로 전체를 읽어 확인)"""
+    result = await db.execute(select(ModelProfile).order_by(ModelProfile.name))
+    return [profile for profile in result.scalars() if model_name in (profile.models or [])]
+
+
+def replace_in_list(models: list[str], old: str, new: Optional[str]) -> list[str]:
+    """목록에서 old를 new로 바꿉니다. (new가 없거나 이미 있으면 old만 제거, 순서 유지)"""
+    if new is None or new in models:
+        return [model for model in models if model != old]
+    return [new if model == old else model for model in models]
+
+
+async def replace_user_models(
+    db: AsyncSession, old: str, new: Optional[str]
+) -> list[tuple[str, dict]]:
+    """
+    allowed_models에 old를 직접 가진 모든 사용자를 UPDATE 한 번으로 변경하고,
+    LiteLLM에 반영할 (key, payload) 목록을 반환합니다. (PostgreSQL 배열 함수 사용, commit은 호출자가 수행)
+    """
+    removed = func.array_remove(User.allowed_models, old, type_=User.allowed_models.type)
+    if new is None:
+        new_value = removed
+    else:
+        new_value = case(
+            (User.allowed_models.contains([new]), removed),
+            else_=func.array_replace(User.allowed_models, old, new, type_=User.allowed_models.type),
+        )
+    result = await db.execute(
+        update(User)
+        .where(User.allowed_models.contains([old]))
+        .values(allowed_models=new_value)
+        .returning(User.key_value, User.allowed_models)
+        .execution_options(synchronize_session=False)
+    )
+    return [(key, {"models": list(models or [])}) for key, models in result.all()]
@@ -1,11 +1,29 @@
 import bcrypt
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.asyncio import async_sessionmaker
-from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm import declarative_base, relationship, validates
+from sqlalchemy.sql import false, func
+
+from .key_lookup import key_fingerprint
 
 Base = declarative_base()
 
+# PostgreSQL에서는 text[] 배열, 그 외(SQLite 벤치마크/테스트 등)에서는 JSON 배열로 저장
+StringList = ARRAY(String(100)).with_variant(JSON(), "sqlite")
+
 
 class Admin(Base):
     __tablename__ = "admins"
@@ -32,35 +50,71 @@ class User(Base):
     user_id = Column(String(50), unique=True, nullable=False)  # 관리 대상 사용자 ID
     organization = Column(String(100))
     key_value = Column(String(255), nullable=False)
+    # key 역조회(POST /key/lookup)용 SHA-256 fingerprint, key_value와 함께 갱신
+    key_hash = Column(String(64), index=True)
     extra_info = Column(Text)
+    # 모델/서비스 권한은 별도 테이블 대신 배열 컬럼으로 저장 (조회 시 추가 쿼리 없음)
+    allowed_models = Column(StringList, nullable=False, default=list)
+    allowed_services = Column(StringList, nullable=False, default=list)
+    # 지정 시 allowed_models 대신 프로필의 모델 목록을 사용
+    model_profile_id = Column(Integer, ForeignKey("model_profiles.id"), index=True)
     # pylint: disable=not-callable
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     # pylint: disable=not-callable
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    allowed_models = relationship("AllowedModel", back_populates="user")
-    allowed_services = relationship("AllowedService", back_populates="user")
+    model_profile = relationship("ModelProfile", back_populates="users")
 
+    @validates("key_value")
+    def _update_key_hash(self, _, key_value):
+        # ORM으로 key를 바꿀 때만 적용되므로 Core insert/update는 key_hash를 직접 지정해야 합니다.
+        self.key_hash = key_fingerprint(key_value) if key_value is not None else None
+        return key_value
+
+    __table_args__ = (
+        # "모델 X를 가진 사용자" 조회(allowed_models @> ARRAY['X'])용 GIN 인덱스
+        Index("ix_users_allowed_models", "allowed_models", postgresql_using="gin"),
+        # 사용자 검색(GET /users/search)의 부분/접두 일치(ILIKE)용 pg_trgm GIN 인덱스
+        *(
+            Index(
+                f"ix_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("user_id", "organization", "extra_info")
+        ),
+    )
 
-class AllowedModel(Base):
-    __tablename__ = "allowed_models"
-    id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    model_name = Column(String(100), nullable=False)
 
-    user = relationship("User", back_populates="allowed_models")
+# 사용자 검색의 user_id 정확/접두 일치와 정렬용 키. "C" collation이어야 LIKE 'x%' 범위 검색과
+# ORDER BY를 같은 btree 인덱스로 처리할 수 있습니다. (PostgreSQL 전용)
+USER_ID_SEARCH_KEY = func.lower(User.user_id).collate("C")
+Index("ix_users_user_id_lower", USER_ID_SEARCH_KEY).ddl_if(dialect="postgresql")
 
 
-class AllowedService(Base):
-    __tablename__ = "allowed_services"
+class ModelProfile(Base):
+    """이름 있는 모델 목록. 여러 사용자가 공유하며 프로필 수정은 한 행만 변경합니다."""
+
+    __tablename__ = "model_profiles"
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    service_name = Column(String(100), nullable=False)
+    name = Column(String(100), unique=True, nullable=False)
+    models = Column(JSON, nullable=False, default=list)  # 모델 이름 목록
+    description = Column(Text)
+    # pylint: disable=not-callable
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # pylint: disable=not-callable
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    user = relationship("User", back_populates="allowed_services")
+    users = relationship("User", back_populates="model_profile")
 
 
 class EventLog(Base):
+    """
+    PostgreSQL에서는 created_at 기준 월별 RANGE 파티션 테이블입니다. (마이그레이션에서 생성,
+    PK는 (id, created_at)) 파티션 생성/보관 기간 정리는 app/event_partitions.py 참고
+    """
+
     __tablename__ = "event_logs"
     id = Column(Integer, primary_key=True)
     user_id = Column(String(50))  # User의 user_id 문자열 저장
@@ -68,5 +122,150 @@ class EventLog(Base):
     event_type = Column(String(50), nullable=False)
     event_detail = Column(Text)
     result = Column(String(50))
+    request_id = Column(String(64))  # 로그를 남긴 요청의 X-Request-ID (trace id)
+    # 구조화된 이벤트 정보 (user_ids, count, models, organization, job_id 등), event_detail은 사람이 읽는 설명
+    payload = Column(JSONB().with_variant(JSON(), "sqlite"))
+    # pylint: disable=not-callable
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_event_logs_created_at", "created_at"),
+        Index("ix_event_logs_request_id", "request_id"),
+        # payload 포함(@>) 조회용 GIN 인덱스 (예: payload @> '{"user_ids": ["alice"]}')
+        Index(
+            "ix_event_logs_payload",
+            "payload",
+            postgresql_using="gin",
+            postgresql_ops={"payload": "jsonb_path_ops"},
+        ),
+    )
+    # ORM identity는 DB PK와 같은 (id, created_at)로 둡니다. 테이블 메타데이터의 PK는 id만 두는데,
+    # SQLite(벤치마크 기본 DB)는 복합 PK의 autoincrement를 지원하지 않기 때문입니다.
+    __mapper_args__ = {"primary_key": [id, created_at]}
+
+
+class EventLogRollup(Base):
+    """
+    이벤트 로그 집계 (시간/일 버킷 × event_type × result × admin_id)
+    EventLogRollupWorker가 event_logs를 id 순으로 읽어 누적합니다. (admin_id/result 없음은 '')
+    """
+
+    __tablename__ = "event_log_rollups"
+    id = Column(Integer, primary_key=True)
+    period = Column(String(10), nullable=False)  # hour / day
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # UTC 기준 버킷 시작 시각
+    event_type = Column(String(50), nullable=False)
+    result = Column(String(50), nullable=False, default="")
+    admin_id = Column(String(50), nullable=False, default="")
+    count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "period",
+            "bucket_start",
+            "event_type",
+            "result",
+            "admin_id",
+            name="uq_event_log_rollups_bucket",
+        ),
+    )
+
+
+class EventLogRollupState(Base):
+    """집계에 반영한 마지막 event_logs.id (행 1개, 집계 트랜잭션에서 잠가 중복 집계 방지)"""
+
+    __tablename__ = "event_log_rollup_state"
+    id = Column(Integer, primary_key=True)
+    last_event_id = Column(BigInteger, nullable=False, default=0)
+    # pylint: disable=not-callable
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class LiteLLMOutbox(Base):
+    """LiteLLM 변경 요청 outbox (사용자 변경과 같은 트랜잭션으로 기록 후 비동기 전송)"""
+
+    __tablename__ = "litellm_outbox"
+    id = Column(Integer, primary_key=True)
+    key_value = Column(String(255), nullable=False)
+    operation = Column(String(50), nullable=False)  # UPDATE_MODELS / UPDATE_ALIAS / DELETE_KEY
+    payload = Column(JSON)
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING/DONE/FAILED/SUPERSEDED
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    # 이 시각 이후에 처리 가능 (재시도 backoff 및 처리 중 lease에 사용)
+    # pylint: disable=not-callable
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # 전송 중인 항목의 claim 시각 (lease가 끝나면 NULL), 같은 key의 이후 항목은 처리 완료 후 전송
+    leased_at = Column(DateTime(timezone=True))
     # pylint: disable=not-callable
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_litellm_outbox_status_available_at", "status", "available_at"),
+        Index("ix_litellm_outbox_key_value_operation", "key_value", "operation"),
+    )
+
+
+class Job(Base):
+    """백그라운드 작업 (대량 import 등). 진행 상황과 재개 위치를 저장합니다."""
+
+    __tablename__ = "jobs"
+    id = Column(String(36), primary_key=True)  # uuid4
+    job_type = Column(String(50), nullable=False)  # USER_IMPORT, USER_BATCH_UPDATE, ...
+    status = Column(String(20), nullable=False, default="PENDING")
+    admin_id = Column(String(50))  # 작업을 요청한 Admin의 username 또는 SERVER_API
+    params = Column(JSON)  # 작업별 입력값
+    total = Column(Integer)
+    processed = Column(Integer, nullable=False, default=0)
+    succeeded = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    cursor = Column(Integer, nullable=False, default=0)  # 처리 완료한 마지막 항목 번호 (재개용)
+    error = Column(Text)
+    cancel_requested = Column(Boolean, nullable=False, default=False, server_default=false())
+    heartbeat_at = Column(DateTime(timezone=True))  # 실행 중인 워커의 lease 갱신 시각
+    lease_token = Column(String(32))  # lease를 잡은 실행 식별값 (이전 워커의 늦은 반영 차단)
+    # pylint: disable=not-callable
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # pylint: disable=not-callable
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (Index("ix_jobs_status", "status"),)
+
+
+class JobItem(Base):
+    """작업 항목(행)별 처리 결과"""
+
+    __tablename__ = "job_items"
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), ForeignKey("jobs.id"), nullable=False)
+    item_no = Column(Integer, nullable=False)  # 입력 파일의 행 번호 등
+    user_id = Column(String(50))
+    status = Column(String(20), nullable=False)  # SUCCESS / FAILURE
+    detail = Column(Text)
+
+    __table_args__ = (UniqueConstraint("job_id", "item_no", name="uq_job_items_job_id_item_no"),)
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key 요청 기록 (같은 키로 재시도하면 저장된 응답을 반환)"""
+
+    __tablename__ = "idempotency_keys"
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(50), nullable=False)  # 요청한 Admin의 username 또는 SERVER_API
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # method, 경로, query, body의 sha256
+    status = Column(String(20), nullable=False)  # IN_PROGRESS / COMPLETED
+    response_status = Column(Integer)
+    response_body = Column(Text)
+    response_media_type = Column(String(100))
+    locked_until = Column(DateTime(timezone=True), nullable=False)  # 처리 중 lease
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # pylint: disable=not-callable
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
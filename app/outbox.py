@@ -0,0 +1,436 @@
+"""
+LiteLLM 변경 요청 transactional outbox
+
+엔드포인트는 사용자 변경과 같은 트랜잭션에서 outbox 항목만 기록하고(enqueue),
+OutboxDispatcher가 백그라운드에서 LiteLLM으로 전송합니다.
+
+- 같은 key에 대해 대기 중인 이전 UPDATE_MODELS/UPDATE_ALIAS는 새 항목 기록 시 SUPERSEDED 처리
+- DELETE_KEY 기록 시 해당 key의 대기 중인 모든 업데이트는 SUPERSEDED 처리
+- 처리 중인 항목은 available_at을 lease로 사용하므로, 프로세스가 죽어도 lease 만료 후 재처리
+- 처리 중에 SUPERSEDED 된 항목은 전송 결과를 기록하지 않으므로(재시도하지 않음) 이전 값이 다시 전송되지 않습니다.
+- 같은 key의 이전 항목이 다른 워커에서 전송 중(leased_at)이면 이후 항목은 그 처리가 끝난 뒤에 가져갑니다.
+  가져오는 트랜잭션은 key별 advisory lock을 잡으므로, 아직 commit 되지 않은 다른 워커의 가져오기와도
+  같은 key의 항목을 나누어 가져가지 않습니다.
+- DELETE_KEY payload의 FOLLOW_UP 항목은 삭제가 성공한 뒤(DONE 기록과 같은 트랜잭션) 새로 기록합니다.
+  다른 key에 대한 변경을 삭제 이후로 미룰 때 사용합니다. (예: key 교체 후 새 key의 alias를 user_id로 변경)
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+import httpx
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    Text,
+    case,
+    column,
+    func,
+    insert,
+    select,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from .config import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_CONCURRENCY,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL,
+)
+from .litellm_service import LiteLLMKeyNotFoundError, LiteLLMService
+from .models import LiteLLMOutbox
+
+UPDATE_MODELS = "UPDATE_MODELS"
+UPDATE_ALIAS = "UPDATE_ALIAS"
+DELETE_KEY = "DELETE_KEY"
+
+PENDING = "PENDING"
+DONE = "DONE"
+FAILED = "FAILED"
+SUPERSEDED = "SUPERSEDED"
+
+# DELETE_KEY payload: 삭제 성공 후 기록할 항목 [[operation, key_value, payload], ...]
+FOLLOW_UP = "then"
+
+MAX_RETRY_DELAY_SECONDS = 300
+CLAIM_LOCK_NAMESPACE = 0x6F62  # key별 advisory lock (namespace, hashtext(key_value))
+ENQUEUE_CHUNK_SIZE = 5000
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue_many(
+    db: AsyncSession,
+    operation: str,
+    items: Iterable[tuple[str, Optional[dict]]],
+    delay_seconds: float = 0,
+) -> None:
+    """
+    outbox 항목을 현재 트랜잭션에 추가합니다. (commit은 호출자가 수행)
+    :param items: (key_value, payload) 목록
+    :param delay_seconds: 지정 시 해당 시간 이후에 전송 (예: 유예 기간 후 key 삭제)
+    """
+    items = list(items)
+    if not items:
+        return
+    keys = list({key for key, _ in items})
+    superseded_ops = [UPDATE_MODELS, UPDATE_ALIAS] if operation == DELETE_KEY else [operation]
+    # 유예 기간 후 삭제하는 key는 그 전까지 사용되므로 대기 중인 업데이트를 유지합니다.
+    if operation != DELETE_KEY or not delay_seconds:
+        # 대량 변경 시 IN 목록/바인드 파라미터 수 제한을 넘지 않도록 나누어 실행합니다.
+        for start in range(0, len(keys), ENQUEUE_CHUNK_SIZE):
+            await db.execute(
+                update(LiteLLMOutbox)
+                .where(
+                    LiteLLMOutbox.key_value.in_(keys[start : start + ENQUEUE_CHUNK_SIZE]),
+                    LiteLLMOutbox.operation.in_(superseded_ops),
+                    LiteLLMOutbox.status == PENDING,
+                )
+                .values(status=SUPERSEDED, processed_at=func.now())
+            )
+    available_at = _utcnow() + timedelta(seconds=delay_seconds)
+    rows = [
+        {
+            "key_value": key,
+            "operation": operation,
+            "payload": payload,
+            "status": PENDING,
+            "attempts": 0,
+            "available_at": available_at,
+        }
+        for key, payload in items
+    ]
+    for start in range(0, len(rows), ENQUEUE_CHUNK_SIZE):
+        await db.execute(insert(LiteLLMOutbox), rows[start : start + ENQUEUE_CHUNK_SIZE])
+
+
+async def enqueue(
+    db: AsyncSession,
+    operation: str,
+    key_value: str,
+    payload: Optional[dict] = None,
+    delay_seconds: float = 0,
+) -> None:
+    """outbox 항목 1건을 현재 트랜잭션에 추가합니다."""
+    await enqueue_many(db, operation, [(key_value, payload)], delay_seconds)
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        litellm_service: Optional[LiteLLMService] = None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        concurrency: int = OUTBOX_CONCURRENCY,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        lease_seconds: int = OUTBOX_LEASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.litellm_service = litellm_service or LiteLLMService()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.stats = defaultdict(int)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        """새 항목이 commit된 직후 호출하면 poll 주기를 기다리지 않고 전송합니다."""
+        self._wakeup.set()
+
+    async def _run(self):
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        async with httpx.AsyncClient(timeout=self.litellm_service.timeout, limits=limits) as c:
+            service = LiteLLMService(
+                self.litellm_service.base_url, self.litellm_service.master_key, client=c
+            )
+            while True:
+                try:
+                    processed = await self.drain_once(service)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Warning: LiteLLM outbox dispatch failed: {e}")
+                    processed = 0
+                if processed < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+
+    async def _claim(self) -> list:
+        """
+        처리할 항목을 가져오고 lease를 설정합니다. (다른 워커와 중복 처리 방지)
+        SKIP LOCKED는 다른 워커가 가져가는 중인(commit 전) 항목을 건너뛰므로 lease 여부만으로는
+        같은 key의 이후 항목을 동시에 가져갈 수 있습니다. key별 advisory lock(트랜잭션 단위)을 얻은
+        항목만 가져가고, lock을 얻은 뒤 새 snapshot에서 전송 중인 이전 항목을 다시 확인합니다.
+        """
+        async with self.session_factory() as db:
+            now = _utcnow()
+            earlier = aliased(LiteLLMOutbox)
+            # 같은 key의 이전 항목이 전송 중이면 순서가 뒤바뀌지 않도록 lease가 끝날 때까지 건너뜁니다.
+            earlier_in_flight = (
+                select(earlier.id)
+                .where(
+                    earlier.key_value == LiteLLMOutbox.key_value,
+                    earlier.id < LiteLLMOutbox.id,
+                    earlier.leased_at.is_not(None),
+                    earlier.available_at > now,
+                )
+                .exists()
+            )
+            result = await db.execute(
+                select(LiteLLMOutbox.id, LiteLLMOutbox.key_value)
+                .where(
+                    LiteLLMOutbox.status == PENDING,
+                    LiteLLMOutbox.available_at <= now,
+                    ~earlier_in_flight,
+                )
+                .order_by(LiteLLMOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            candidates = result.all()
+            if not candidates:
+                await db.commit()
+                return []
+            # 다른 워커가 가져가는 중인 key는 이번에 건너뜁니다. (try lock이므로 대기/교착 없음)
+            result = await db.execute(
+                text(
+                    "SELECT key FROM unnest(CAST(:keys AS text[])) AS key "
+                    "WHERE pg_try_advisory_xact_lock(:namespace, hashtext(key))"
+                ),
+                {
+                    "keys": sorted({key for _, key in candidates}),
+                    "namespace": CLAIM_LOCK_NAMESPACE,
+                },
+            )
+            locked = set(result.scalars())
+            result = await db.execute(
+                update(LiteLLMOutbox)
+                .where(
+                    LiteLLMOutbox.id.in_([row_id for row_id, key in candidates if key in locked]),
+                    ~earlier_in_flight,
+                )
+                .values(
+                    available_at=now + timedelta(seconds=self.lease_seconds),
+                    leased_at=now,
+                    attempts=LiteLLMOutbox.attempts + 1,
+                )
+                .returning(
+                    LiteLLMOutbox.id,
+                    LiteLLMOutbox.key_value,
+                    LiteLLMOutbox.operation,
+                    LiteLLMOutbox.payload,
+                    LiteLLMOutbox.attempts,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            rows = sorted(result.all(), key=lambda r: r.id)
+            await db.commit()
+            return rows
+
+    async def drain_once(self, service: Optional[LiteLLMService] = None) -> int:
+        """대기 중인 항목을 한 배치 처리하고 처리한 항목 수를 반환합니다."""
+        service = service or self.litellm_service
+        rows = await self._claim()
+        if not rows:
+            return 0
+
+        # key별로 묶어 가장 최신 상태만 전송합니다.
+        by_key: dict[str, list] = defaultdict(list)
+        for row in rows:
+            by_key[row.key_value].append(row)
+
+        results: dict[int, tuple[str, Optional[str]]] = {}
+        deletes: list = []
+        updates: list = []
+        for entries in by_key.values():
+            delete_entry = next((e for e in reversed(entries) if e.operation == DELETE_KEY), None)
+            latest: dict = {}
+            for entry in entries:
+                if entry.operation == DELETE_KEY:
+                    continue
+                if delete_entry is not None and entry.id < delete_entry.id:
+                    results[entry.id] = (SUPERSEDED, None)
+                    continue
+                if entry.operation in latest:
+                    results[latest[entry.operation].id] = (SUPERSEDED, None)
+                latest[entry.operation] = entry
+            updates.extend(latest.values())
+            for entry in entries:
+                if entry.operation == DELETE_KEY and entry is not delete_entry:
+                    results[entry.id] = (SUPERSEDED, None)
+            if delete_entry is not None:
+                deletes.append(delete_entry)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_update(entry):
+            async with semaphore:
+                try:
+                    if entry.operation == UPDATE_MODELS:
+                        await service.update_key_models(entry.key_value, entry.payload["models"])
+                    elif entry.operation == UPDATE_ALIAS:
+                        await service.update_key_alias(entry.key_value, entry.payload["key_alias"])
+                    else:
+                        raise ValueError(f"알 수 없는 outbox operation: {entry.operation}")
+                    results[entry.id] = (DONE, None)
+                except LiteLLMKeyNotFoundError as e:
+                    # key가 없으면 재시도해도 성공할 수 없습니다. (reconcile로 복구)
+                    results[entry.id] = (FAILED, str(e))
+                except Exception as e:
+                    results[entry.id] = (PENDING, str(e))
+
+        async def send_deletes(entries: list):
+            if not entries:
+                return
+            async with semaphore:
+                try:
+                    await service.delete_keys([e.key_value for e in entries])
+                    for e in entries:
+                        results[e.id] = (DONE, None)
+                    return
+                except Exception:
+                    # 일부 key가 이미 없는 경우 등 일괄 삭제가 실패하면 개별로 재시도합니다.
+                    pass
+            for entry in entries:
+                async with semaphore:
+                    try:
+                        await service.delete_key(entry.key_value)
+                        results[entry.id] = (DONE, None)
+                    except LiteLLMKeyNotFoundError:
+                        results[entry.id] = (DONE, None)
+                    except Exception as e:
+                        results[entry.id] = (PENDING, str(e))
+
+        await asyncio.gather(send_deletes(deletes), *(send_update(e) for e in updates))
+        await self._finish(rows, results)
+        return len(rows)
+
+    async def _finish(self, rows: list, results: dict):
+        now = _utcnow()
+        params = []
+        for row in rows:
+            status, error = results.get(row.id, (PENDING, "not processed"))
+            available_at = now
+            if status == PENDING:
+                if row.attempts >= self.max_attempts:
+                    status = FAILED
+                else:
+                    delay = min(
+                        self.litellm_service.retry_delay * 2 ** (row.attempts - 1),
+                        MAX_RETRY_DELAY_SECONDS,
+                    )
+                    available_at = now + timedelta(seconds=delay)
+            params.append((row.id, status, error, available_at))
+        finished = values(
+            column("id", Integer),
+            column("status", String),
+            column("last_error", Text),
+            column("available_at", DateTime(timezone=True)),
+            name="finished",
+        ).data(params)
+        async with self.session_factory() as db:
+            # 처리 중에 SUPERSEDED 된 항목은 결과를 덮어쓰지 않습니다. (재시도하면 이전 값이 다시 전송됨)
+            result = await db.execute(
+                update(LiteLLMOutbox)
+                .where(LiteLLMOutbox.id == finished.c.id, LiteLLMOutbox.status == PENDING)
+                .values(
+                    status=finished.c.status,
+                    last_error=finished.c.last_error,
+                    available_at=finished.c.available_at,
+                    processed_at=case((finished.c.status == PENDING, None), else_=now),
+                    leased_at=None,
+                )
+                .returning(LiteLLMOutbox.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated = set(result.scalars())
+            statuses = {row_id: status for row_id, status, *_ in params}
+            deleted = {
+                row.key_value
+                for row in rows
+                if row.operation == DELETE_KEY and row.id in updated and statuses[row.id] == DONE
+            }
+            # 같은 배치에서 SUPERSEDED 된 중복 삭제 항목의 후속 항목도 함께 기록합니다.
+            follow_ups = [
+                item
+                for row in rows
+                if row.operation == DELETE_KEY and row.key_value in deleted and row.id in updated
+                for item in (row.payload or {}).get(FOLLOW_UP, ())
+            ]
+            follow_ups_enqueued = await self._enqueue_follow_ups(db, follow_ups)
+            superseded = [row.id for row in rows if row.id not in updated]
+            if superseded:
+                await db.execute(
+                    update(LiteLLMOutbox)
+                    .where(LiteLLMOutbox.id.in_(superseded))
+                    .values(leased_at=None)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+        for row_id, status, *_ in params:
+            self.stats[status if row_id in updated else SUPERSEDED] += 1
+        if follow_ups_enqueued:
+            self.wake()
+
+    @staticmethod
+    async def _enqueue_follow_ups(db: AsyncSession, items: list) -> bool:
+        """
+        삭제가 끝난 key의 후속 항목을 기록합니다.
+        대상 key도 삭제 예정이거나 이미 삭제된 경우는 제외합니다. (예: 유예 기간 중 다시 교체된 key)
+        """
+        if not items:
+            return False
+        result = await db.execute(
+            select(LiteLLMOutbox.key_value).where(
+                LiteLLMOutbox.key_value.in_({key for _, key, _ in items}),
+                LiteLLMOutbox.operation == DELETE_KEY,
+                LiteLLMOutbox.status.in_([PENDING, DONE]),
+            )
+        )
+        deleting = set(result.scalars())
+        by_operation: dict[str, list] = defaultdict(list)
+        for operation, key, payload in items:
+            if key not in deleting:
+                by_operation[operation].append((key, payload))
+        for operation, entries in by_operation.items():
+            await enqueue_many(db, operation, entries)
+        return bool(by_operation)
+
+    async def status_counts(self) -> dict:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(LiteLLMOutbox.status, func.count()).group_by(LiteLLMOutbox.status)
+            )
+            return {status: count for status, count in result.all()}
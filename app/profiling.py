@@ -0,0 +1,139 @@
+"""
+요청 단위 CPU 프로파일링 (sampling profiler, PROFILING_ENABLED=true 일 때만 사용)
+
+- 대상: 슈퍼 관리자 JWT로 보낸 `X-Profile: true` 요청, 또는 PROFILE_SAMPLE_RATE 비율의 임의 요청
+- 요청을 처리하는 동안 별도 스레드가 PROFILE_INTERVAL_MS마다 이벤트 루프 스레드와
+  작업 중인 스레드(threadpool의 감사 로그 기록, bcrypt 등)의 stack을 기록하고,
+  끝나면 PROFILE_DIR에 flamegraph 도구(flamegraph.pl, speedscope, inferno)가 읽는
+  folded stack 파일(<id>.folded)과 요청 정보(<id>.json)를 저장합니다.
+- 이벤트 루프 스레드의 `select` 아래 시간은 DB/LiteLLM 응답을 기다린 시간입니다.
+- 같은 worker에서 동시에 처리된 다른 요청도 함께 기록되므로(json의 in_flight) 한가한 worker에서 측정하세요.
+  프로세스당 한 번에 하나의 요청만 프로파일링합니다.
+
+PROFILING_ENABLED=false면 미들웨어를 등록하지 않으므로 요청 처리 비용이 없습니다.
+"""
+
+import json
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+from .config import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES
+
+PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-z_.-]+$")
+SITE_PACKAGES = f"site-packages{os.sep}"
+STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+# 작업을 기다리는 중인 스레드의 마지막 frame (기록하지 않음)
+IDLE_FRAMES = {("wait", "threading.py"), ("_worker", "thread.py"), ("get", "queue.py")}
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if SITE_PACKAGES in filename:
+        filename = filename.split(SITE_PACKAGES, 1)[1]
+    elif filename.startswith(STDLIB):
+        filename = filename[len(STDLIB) :]
+    elif os.path.isabs(filename):
+        filename = os.path.relpath(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _is_idle(frame) -> bool:
+    return (frame.f_code.co_name, os.path.basename(frame.f_code.co_filename)) in IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """
+    start()부터 stop()까지 stack을 주기적으로 기록합니다.
+    start()를 호출한 스레드(이벤트 루프)는 항상, 다른 스레드는 작업 중일 때만 기록합니다.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = max(interval_ms, 1) / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread: Optional[int] = None
+
+    def start(self):
+        self._loop_thread = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (ident != self._loop_thread and _is_idle(frame)):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+class ProfileStore:
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, samples: Counter, info: dict) -> str:
+        """folded stack과 요청 정보를 저장하고 profile id를 반환합니다."""
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        slug = re.sub(r"[^0-9a-z_.]+", "_", f"{info['method']}{info['path']}".lower())[:80]
+        profile_id = f"{stamp}-{slug}-{time.monotonic_ns() % 10**6:06d}"
+        with open(os.path.join(self.directory, f"{profile_id}.folded"), "w") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+            json.dump({"id": profile_id, **info, "samples": sum(samples.values())}, f)
+        self._prune()
+        return profile_id
+
+    def entries(self) -> list[dict]:
+        """최근 프로파일부터 요청 정보 목록"""
+        profiles = []
+        for name in sorted(self._names(".json"), reverse=True):
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """다운로드할 folded 파일 경로 (없거나 잘못된 id면 None)"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.folded")
+        return path if os.path.isfile(path) else None
+
+    def _names(self, suffix: str) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [name for name in os.listdir(self.directory) if name.endswith(suffix)]
+
+    def _prune(self):
+        """PROFILE_MAX_FILES개를 넘는 오래된 프로파일을 삭제합니다."""
+        ids = sorted(name[: -len(".json")] for name in self._names(".json"))
+        for profile_id in ids[: max(len(ids) - self.max_files, 0)]:
+            for suffix in (".folded", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile_id}{suffix}"))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,194 @@
+"""
+읽기 전용 복제본(read replica) 라우팅
+
+조회 전용 엔드포인트는 ReplicaRouter.session()으로 세션을 받습니다.
+아래 경우에는 복제본 대신 primary를 사용합니다.
+
+- 복제본이 설정되지 않았거나 지연(lag) 확인 전 / 확인 실패 / 연결 실패
+- 복제 지연이 REPLICA_MAX_LAG_SECONDS를 넘는 경우
+- 요청한 관리자(또는 SERVER_API)가 최근 REPLICA_STICKY_SECONDS 안에 데이터를 변경한 경우 (read-your-writes)
+
+sticky 시간은 최소 (최대 허용 지연 + 확인 주기)로 맞추므로, 그 이후 복제본 조회에는 변경 내용이 반영되어 있습니다.
+변경 기록은 프로세스 메모리와 함께 서명한 쿠키(STICKY_COOKIE, 요청자와 만료 시각)로 응답에 전달하므로,
+쿠키를 유지하는 클라이언트는 다른 worker/인스턴스가 조회를 처리해도 primary에서 조회합니다.
+(쿠키 만료 시각은 서버 시계 기준이므로 인스턴스 간 시계가 맞아야 합니다)
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .config import REPLICA_CHECK_INTERVAL, REPLICA_MAX_LAG_SECONDS, REPLICA_STICKY_SECONDS
+
+PRIMARY = "primary"
+REPLICA = "replica"
+MAX_TRACKED_WRITERS = 10000
+STICKY_COOKIE = "mama_read_primary"
+
+# 복제본이 마지막으로 받은 WAL까지 모두 적용했고 스트리밍 중이면 지연 0,
+# 아니면 마지막 적용 트랜잭션 시각 기준 (복제본이 아닌 서버는 0)
+LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary_factory: async_sessionmaker,
+        replica_factory: Optional[async_sessionmaker] = None,
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        sticky_seconds: float = REPLICA_STICKY_SECONDS,
+        check_interval: float = REPLICA_CHECK_INTERVAL,
+        secret: Optional[str] = None,
+    ):
+        """
+        :param secret: sticky 쿠키 서명 키 (없으면 쿠키를 발급/확인하지 않고 프로세스 메모리만 사용)
+        """
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = max(sticky_seconds, max_lag_seconds + check_interval)
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None  # None: 확인 전 또는 확인 실패
+        self.last_error: Optional[str] = None
+        self.stats = defaultdict(int)
+        self._writes: dict[str, float] = {}
+        self._secret = secret.encode() if secret else None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica_factory is not None
+
+    def start(self):
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(self.check_interval)
+
+    async def check_lag(self) -> Optional[float]:
+        """복제 지연(초)을 확인합니다. 실패하면 None으로 두어 primary를 사용하게 합니다."""
+        try:
+            async with self.replica_factory() as db:
+                lag = await db.scalar(LAG_QUERY)
+            self.lag = float(lag) if lag is not None else None
+            self.last_error = None if lag is not None else "replay position unknown"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.last_error is None:
+                print(f"Warning: read replica unavailable, using primary: {e}")
+            self.lag = None
+            self.last_error = str(e)
+        return self.lag
+
+    def mark_write(self, identity: Optional[str]):
+        """identity가 데이터를 변경했음을 기록합니다. (sticky 시간 동안 primary에서 조회)"""
+        if not identity or not self.enabled:
+            return
+        now = time.monotonic()
+        if len(self._writes) >= MAX_TRACKED_WRITERS:
+            self._writes = {
+                key: at for key, at in self._writes.items() if now - at < self.sticky_seconds
+            }
+        self._writes[identity] = now
+
+    def sticky_writers(self) -> int:
+        """변경 기록을 보관 중인 요청자 수 (이 프로세스)"""
+        return len(self._writes)
+
+    def sticky_token(self, identity: Optional[str]) -> Optional[str]:
+        """mark_write 후 응답 쿠키에 담을 값 ("만료 시각(ms).서명", 서명 키가 없으면 None)"""
+        if not identity or not self.enabled or self._secret is None:
+            return None
+        expires_ms = str(int((time.time() + self.sticky_seconds) * 1000))
+        return f"{expires_ms}.{self._sign(identity, expires_ms)}"
+
+    def _sign(self, identity: str, expires_ms: str) -> str:
+        message = f"{identity}:{expires_ms}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def _token_valid(self, identity: str, token: str) -> bool:
+        expires_ms, _, signature = token.partition(".")
+        if not expires_ms.isdigit() or int(expires_ms) <= time.time() * 1000:
+            return False
+        return hmac.compare_digest(signature, self._sign(identity, expires_ms))
+
+    def is_sticky(self, identity: Optional[str], token: Optional[str] = None) -> bool:
+        if not identity:
+            return False
+        written_at = self._writes.get(identity)
+        if written_at is not None and time.monotonic() - written_at < self.sticky_seconds:
+            return True
+        return bool(token) and self._secret is not None and self._token_valid(identity, token)
+
+    def route(self, identity: Optional[str] = None, token: Optional[str] = None) -> str:
+        if not self.enabled or self.lag is None or self.lag > self.max_lag_seconds:
+            return PRIMARY
+        return PRIMARY if self.is_sticky(identity, token) else REPLICA
+
+    @asynccontextmanager
+    async def session(
+        self,
+        identity: Optional[str] = None,
+        primary: Optional[AsyncSession] = None,
+        token: Optional[str] = None,
+    ):
+        """
+        조회용 세션. 복제본 연결에 실패하면 primary 세션을 반환합니다.
+        :param primary: primary를 사용할 때 새로 열지 않고 재사용할 세션 (요청의 인증 세션 등)
+        :param token: 요청의 sticky 쿠키 값 (다른 worker에서 변경한 경우)
+        """
+        target = self.route(identity, token)
+        if target == REPLICA:
+            db: AsyncSession = self.replica_factory()
+            try:
+                await db.connection()
+            except Exception as e:
+                await db.close()
+                print(f"Warning: read replica connection failed, using primary: {e}")
+                self.lag = None
+                self.last_error = str(e)
+                target = PRIMARY
+        self.stats[target] += 1
+        if target == PRIMARY and primary is not None:
+            yield primary
+            return
+        if target == PRIMARY:
+            db = self.primary_factory()
+        async with db:
+            yield db
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "lag_seconds": self.lag,
+            "max_lag_seconds": self.max_lag_seconds,
+            "sticky_seconds": self.sticky_seconds,
+            "last_error": self.last_error,
+            "reads": dict(self.stats),
+        }
@@ -0,0 +1,424 @@
+"""
+DB와 LiteLLM 간 key/모델 권한 정합성 점검(reconcile)
+
+- model_mismatch: DB의 모델 권한(users.allowed_models 또는 모델 프로필)과 LiteLLM key의 models가 다름
+- missing_key: DB 사용자의 key가 LiteLLM에 없음
+- orphan_key: LiteLLM에는 있지만 DB 어떤 사용자에도 연결되지 않은 key
+
+repair 모드에서는 DB를 기준으로 LiteLLM을 맞춥니다. (모델 갱신, key 재발급, 고아 key 삭제)
+배치 단위로 체크포인트를 저장하므로 중단되더라도 resume으로 이어서 진행할 수 있습니다.
+
+- 여러 프로세스가 동시에 점검/복구하거나 같은 체크포인트 파일을 쓰지 않도록, 점검하는 동안
+  전용 연결(autocommit)에 session 단위 advisory lock을 잡고 끝나면 해제합니다. lock을 잡지 못하면
+  status=skipped로 끝납니다. 열린 트랜잭션을 유지하지 않으므로 vacuum을 막지 않으며,
+  DB 조회/저장은 배치마다 별도 트랜잭션으로 commit 합니다.
+- 재발급한 key는 점검 시점의 key가 그대로일 때만 저장하고, 그 사이 바뀐 사용자의 새 key는 삭제합니다.
+- 고아 key는 점검 시작 ORPHAN_MIN_AGE_SECONDS 전 이후에 발급된 key(아직 DB 저장 전일 수 있음)와
+  outbox에 삭제 대기 중인 key(교체 유예 기간 중인 이전 key 등)를 제외하고, 삭제 직전에 DB를 다시 확인합니다.
+
+    python -m app.reconcile
+    python -m app.reconcile --repair --resume
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import httpx
+from sqlalchemy import Integer, String, column, select, text, update, values
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .config import (
+    DB_URL,
+    LITELLM_USER_ID,
+    RECONCILE_BATCH_SIZE,
+    RECONCILE_CHECKPOINT_PATH,
+    RECONCILE_CONCURRENCY,
+)
+from .key_lookup import key_fingerprint
+from .litellm_service import LiteLLMKeyNotFoundError, LiteLLMService
+from .models import LiteLLMOutbox, ModelProfile, User
+from .outbox import DELETE_KEY, PENDING, enqueue_many
+
+MAX_REPORTED_ISSUES = 1000  # 상태/체크포인트에 보관할 최대 이슈 수
+KEY_LIST_PAGE_SIZE = 500
+ADVISORY_LOCK_ID = 0x6D616D72  # 'mamr' (event_partitions의 lock과 구분)
+ORPHAN_MIN_AGE_SECONDS = 600  # 발급 직후 DB 저장 전일 수 있는 key는 고아로 보지 않음
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Reconciler:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        litellm_service: Optional[LiteLLMService] = None,
+        concurrency: int = RECONCILE_CONCURRENCY,
+        batch_size: int = RECONCILE_BATCH_SIZE,
+        checkpoint_path: str = RECONCILE_CHECKPOINT_PATH,
+        on_keys_removed: Optional[Callable[[list[str]], None]] = None,
+    ):
+        """
+        :param on_keys_removed: key를 재발급해 사용자에서 빠진 이전 key 목록을 전달받을 함수
+                                (key 역조회 캐시 정리)
+        """
+        self.session_factory = session_factory
+        self.litellm_service = litellm_service or LiteLLMService()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+        self.on_keys_removed = on_keys_removed
+        self.state: dict = {"status": "idle"}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, repair: bool = False, resume: bool = False) -> dict:
+        """백그라운드 태스크로 점검을 시작합니다."""
+        self.state = {"status": "running", "repair": repair, "resume": resume}
+        self._task = asyncio.create_task(self.run(repair=repair, resume=resume))
+        return self.state
+
+    async def stop(self):
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _record(self, kind: str, user_id: Optional[str], detail: str, repaired: bool = False):
+        self.state["counts"][kind] += 1
+        if repaired:
+            self.state["counts"]["repaired"] += 1
+        if len(self.state["issues"]) < MAX_REPORTED_ISSUES:
+            self.state["issues"].append(
+                {"type": kind, "user_id": user_id, "detail": detail, "repaired": repaired}
+            )
+
+    async def run(self, repair: bool = False, resume: bool = False) -> dict:
+        # session 단위 lock이므로 연결이 끊기면(프로세스 종료 등) 자동으로 해제됩니다.
+        async with self.session_factory.kw["bind"].connect() as lock_conn:
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+            locked = (
+                await lock_conn.execute(
+                    text("SELECT pg_try_advisory_lock(:id)"), {"id": ADVISORY_LOCK_ID}
+                )
+            ).scalar()
+            if not locked:
+                self.state = {
+                    "status": "skipped",
+                    "repair": repair,
+                    "error": "다른 프로세스에서 정합성 점검이 진행 중입니다.",
+                    "finished_at": _now(),
+                }
+                return self.state
+            try:
+                return await self._run(repair, resume)
+            finally:
+                unlocked = (
+                    await lock_conn.execute(
+                        text("SELECT pg_advisory_unlock(:id)"), {"id": ADVISORY_LOCK_ID}
+                    )
+                ).scalar()
+                if not unlocked:
+                    print("Warning: reconcile advisory lock was already released")
+
+    async def _run(self, repair: bool, resume: bool) -> dict:
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint and checkpoint.get("status") != "completed":
+            self.state = checkpoint
+            self.state.update(status="running", repair=repair, resumed_at=_now())
+        else:
+            self.state = {
+                "status": "running",
+                "repair": repair,
+                "phase": "keys",
+                "last_user_id": 0,
+                "checked_users": 0,
+                "checked_litellm_keys": 0,
+                "counts": defaultdict(int),
+                "issues": [],
+                "started_at": _now(),
+                "finished_at": None,
+                "error": None,
+            }
+        self.state["counts"] = defaultdict(int, self.state["counts"])
+
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        try:
+            async with httpx.AsyncClient(timeout=self.litellm_service.timeout, limits=limits) as c:
+                service = LiteLLMService(
+                    self.litellm_service.base_url, self.litellm_service.master_key, client=c
+                )
+                if self.state["phase"] == "keys":
+                    await self._check_user_keys(service, repair)
+                    self.state["phase"] = "orphans"
+                    self._save_checkpoint()
+                await self._check_orphans(service, repair)
+            self.state.update(status="completed", phase="done", finished_at=_now())
+        except asyncio.CancelledError:
+            self.state.update(status="cancelled", finished_at=_now())
+            self._save_checkpoint()
+            raise
+        except Exception as e:
+            self.state.update(status="failed", error=str(e), finished_at=_now())
+        self._save_checkpoint()
+        return self.state
+
+    async def _check_user_keys(self, service: LiteLLMService, repair: bool):
+        """사용자를 id 순서로 배치 조회하며 LiteLLM key와 모델 권한을 비교합니다."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            # LiteLLM 호출 동안 DB 연결을 점유하지 않도록 배치 조회 후 세션을 닫습니다.
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(
+                        User.id,
+                        User.user_id,
+                        User.organization,
+                        User.key_value,
+                        User.model_profile_id,
+                        User.allowed_models,
+                    )
+                    .where(User.id > self.state["last_user_id"])
+                    .order_by(User.id)
+                    .limit(self.batch_size)
+                )
+                users = result.all()
+                if not users:
+                    return
+                models_by_user = {u.id: set(u.allowed_models or []) for u in users}
+                # 프로필 사용자는 프로필의 모델 목록을 기준으로 비교합니다.
+                profile_ids = {u.model_profile_id for u in users if u.model_profile_id is not None}
+                if profile_ids:
+                    profiles_result = await db.execute(
+                        select(ModelProfile.id, ModelProfile.models).where(
+                            ModelProfile.id.in_(profile_ids)
+                        )
+                    )
+                    profile_models = {pk: set(models or []) for pk, models in profiles_result.all()}
+                    for u in users:
+                        if u.model_profile_id is not None:
+                            models_by_user[u.id] = profile_models.get(u.model_profile_id, set())
+
+            new_keys = await asyncio.gather(
+                *(
+                    self._check_user(service, semaphore, u, models_by_user[u.id], repair)
+                    for u in users
+                )
+            )
+            replaced = [(u, key) for u, key in zip(users, new_keys) if key is not None]
+            if replaced:
+                await self._store_regenerated_keys(replaced)
+
+            self.state["last_user_id"] = users[-1].id
+            self.state["checked_users"] += len(users)
+            self._save_checkpoint()
+
+    async def _check_user(
+        self, service: LiteLLMService, semaphore: asyncio.Semaphore, user, db_models, repair
+    ) -> Optional[str]:
+        """사용자 1명을 점검하고, key를 재발급한 경우 새 key를 반환합니다."""
+        async with semaphore:
+            try:
+                litellm_models = await service.get_key_models(user.key_value)
+            except LiteLLMKeyNotFoundError:
+                if not repair:
+                    self._record("missing_key", user.user_id, "key not found in LiteLLM")
+                    return None
+                try:
+                    new_key = await service.generate_key(
+                        models=sorted(db_models),
+                        user_id=LITELLM_USER_ID,
+                        key_alias=user.user_id,
+                        metadata={"organization": user.organization},
+                    )
+                except Exception as e:
+                    self._record("missing_key", user.user_id, f"key regeneration failed: {e}")
+                    return None
+                self._record("missing_key", user.user_id, "key regenerated", repaired=True)
+                return new_key
+            except Exception as e:
+                self._record("error", user.user_id, str(e))
+                return None
+
+            litellm_set = set(litellm_models or [])
+            if litellm_set == db_models:
+                return None
+            detail = f"db={sorted(db_models)} litellm={sorted(litellm_set)}"
+            if not repair:
+                self._record("model_mismatch", user.user_id, detail)
+                return None
+            try:
+                await service.update_key_models(user.key_value, sorted(db_models))
+                self._record("model_mismatch", user.user_id, detail, repaired=True)
+            except Exception as e:
+                self._record("model_mismatch", user.user_id, f"{detail} repair failed: {e}")
+            return None
+
+    async def _store_regenerated_keys(self, replaced: list):
+        """재발급한 key를 저장합니다. 점검 이후 key가 바뀌었거나 삭제된 사용자의 새 key는 삭제합니다."""
+        new_keys = values(
+            column("id", Integer),
+            column("old_key", String),
+            column("new_key", String),
+            column("new_hash", String),
+            name="new_keys",
+        ).data([(u.id, u.key_value, key, key_fingerprint(key)) for u, key in replaced])
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(User)
+                .where(User.id == new_keys.c.id, User.key_value == new_keys.c.old_key)
+                .values(key_value=new_keys.c.new_key, key_hash=new_keys.c.new_hash)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            )
+            stored = set(result.scalars())
+            discarded = [(key, None) for u, key in replaced if u.id not in stored]
+            await enqueue_many(db, DELETE_KEY, discarded)
+            await db.commit()
+        if stored and self.on_keys_removed:
+            self.on_keys_removed([u.key_value for u, _ in replaced if u.id in stored])
+        for u, _ in replaced:
+            if u.id not in stored:
+                self._record(
+                    "stale_user", u.user_id, "user changed during reconcile, key discarded"
+                )
+
+    async def _known_key_hashes(self) -> set[str]:
+        """DB 사용자 key와 outbox에 삭제 대기 중인 key의 해시"""
+        async with self.session_factory() as db:
+            hashes = set()
+            # users를 먼저 읽어야 그 사이 교체된 key(이전 key는 outbox로 이동)가 양쪽에서 모두 빠지지 않습니다.
+            async for key in await db.stream_scalars(select(User.key_value)):
+                hashes.add(key_fingerprint(key))
+            pending_deletes = await db.stream_scalars(
+                select(LiteLLMOutbox.key_value).where(
+                    LiteLLMOutbox.operation == DELETE_KEY, LiteLLMOutbox.status == PENDING
+                )
+            )
+            async for key in pending_deletes:
+                hashes.add(key_fingerprint(key))
+            return hashes
+
+    async def _unclaimed(self, tokens: list[str]) -> set[str]:
+        """삭제 직전에 DB에 다시 확인해 여전히 어떤 사용자에도 연결되지 않은 key 해시만 반환합니다."""
+        async with self.session_factory() as db:
+            result = await db.execute(select(User.key_hash).where(User.key_hash.in_(tokens)))
+            return set(tokens) - set(result.scalars())
+
+    async def _check_orphans(self, service: LiteLLMService, repair: bool):
+        """LiteLLM_USER_ID 소유 key 중 DB에 없는 key를 찾습니다."""
+        min_created_at = datetime.now(timezone.utc) - timedelta(seconds=ORPHAN_MIN_AGE_SECONDS)
+        known_hashes = await self._known_key_hashes()
+
+        orphans = []
+        page = 1
+        while True:
+            data = await service.list_keys(LITELLM_USER_ID, page=page, size=KEY_LIST_PAGE_SIZE)
+            for item in data.get("keys", []):
+                token = item.get("token") if isinstance(item, dict) else item
+                alias = item.get("key_alias") if isinstance(item, dict) else None
+                self.state["checked_litellm_keys"] += 1
+                if not token or token in known_hashes:
+                    continue
+                created_at = _parse_created_at(item)
+                if created_at is not None and created_at >= min_created_at:
+                    continue  # 다른 작업이 발급 후 아직 저장하지 않은 key일 수 있음
+                orphans.append((token, alias, created_at))
+            if page >= data.get("total_pages", 1):
+                break
+            page += 1
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def handle(token: str, alias: Optional[str]):
+            async with semaphore:
+                try:
+                    await service.delete_key(token)
+                except LiteLLMKeyNotFoundError:
+                    pass  # 이미 삭제됨
+                except Exception as e:
+                    self._record("orphan_key", alias, f"token={token[:12]} delete failed: {e}")
+                    return
+            self._record("orphan_key", alias, f"token={token[:12]} deleted", repaired=True)
+
+        for start in range(0, len(orphans), KEY_LIST_PAGE_SIZE):
+            batch = orphans[start : start + KEY_LIST_PAGE_SIZE]
+            unclaimed = await self._unclaimed([token for token, _, _ in batch]) if repair else ()
+            deletable = []
+            for token, alias, created_at in batch:
+                if token in unclaimed and created_at is not None:
+                    deletable.append((token, alias))
+                elif repair and created_at is None:
+                    self._record("orphan_key", alias, f"token={token[:12]} created_at unknown")
+                elif not repair:
+                    self._record("orphan_key", alias, f"token={token[:12]}")
+            await asyncio.gather(*(handle(token, alias) for token, alias in deletable))
+
+
+def _parse_created_at(item) -> Optional[datetime]:
+    """LiteLLM key 목록 항목의 created_at (없거나 해석할 수 없으면 None)"""
+    value = item.get("created_at") if isinstance(item, dict) else None
+    if not value:
+        return None
+    try:
+        created_at = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return created_at if created_at.tzinfo else created_at.replace(tzinfo=timezone.utc)
+
+
+async def _main(args) -> dict:
+    engine = create_async_engine(DB_URL.replace("postgresql+psycopg2", "postgresql+asyncpg"))
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    reconciler = Reconciler(
+        session_factory,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint,
+    )
+    try:
+        return await reconciler.run(repair=args.repair, resume=args.resume)
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DB↔LiteLLM 정합성 점검")
+    parser.add_argument("--repair", action="store_true", help="불일치를 DB 기준으로 복구")
+    parser.add_argument("--resume", action="store_true", help="체크포인트부터 이어서 진행")
+    parser.add_argument("--concurrency", type=int, default=RECONCILE_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+    parser.add_argument("--checkpoint", default=RECONCILE_CHECKPOINT_PATH)
+    args = parser.parse_args(argv)
+    state = asyncio.run(_main(args))
+    print(json.dumps(state, ensure_ascii=False, indent=2))
+    return 0 if state["status"] == "completed" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
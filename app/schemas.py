@@ -28,11 +28,21 @@ class UserRead(BaseModel):
     updated_at: str | None = None
     allowed_models: list[str] = []
     allowed_services: list[str] = []
+    model_profile: str | None = None
 
     class Config:
         orm_mode = True
 
 
+class UserSearchResponse(BaseModel):
+    query: str
+    total: int
+    total_capped: bool = False  # True면 total은 SEARCH_COUNT_LIMIT로 잘린 값
+    limit: int
+    offset: int
+    users: list[UserRead] = []
+
+
 class UserListRequest(BaseModel):
     organization: str | None = None
 
@@ -42,12 +52,14 @@ class UserCreateRequest(BaseModel):
     organization: str | None = None
     extra_info: str | None = None
     allowed_models: list[str] = []
+    model_profile: str | None = None  # 지정 시 allowed_models 대신 프로필의 모델 사용
 
 
 class UserUpdateRequest(BaseModel):
     organization: str | None = None
     extra_info: str | None = None
     allowed_models: list[str] = []
+    model_profile: str | None = None  # 프로필 지정, 빈 문자열이면 프로필 해제
 
 
 class UsersCreateListRequest(BaseModel):
@@ -59,12 +71,19 @@ class UsersBatchUpdateRequest(BaseModel):
     allowed_models: list[str] = []
     organization: Optional[str] = None
     extra_info: Optional[str] = None
+    model_profile: Optional[str] = None  # 프로필 지정, 빈 문자열이면 프로필 해제
 
 
 class UsersDeleteRequest(BaseModel):
     user_ids: list[str]
 
 
+class UsersRotateKeysRequest(BaseModel):
+    user_ids: Optional[list[str]] = None
+    organization: Optional[str] = None  # user_ids 대신 지정하면 조직의 모든 사용자
+    grace_period_seconds: Optional[int] = None  # 이전 key 삭제까지 유지 시간, 없으면 설정값
+
+
 class KeyRequest(BaseModel):
     user_ids: list[str]
 
@@ -74,6 +93,16 @@ class KeyResponse(BaseModel):
     user_key: str
 
 
+class KeyLookupRequest(BaseModel):
+    keys: list[str]
+
+
+class KeyLookupResponse(BaseModel):
+    # 요청한 keys와 같은 순서, 찾지 못한 key는 user_id가 None
+    user_id: Optional[str] = None
+    organization: Optional[str] = None
+
+
 class EventLogRead(BaseModel):
     id: int
     admin_id: Optional[str] = None
@@ -81,6 +110,8 @@ class EventLogRead(BaseModel):
     event_type: str
     event_detail: Optional[str] = None
     result: str
+    request_id: Optional[str] = None
+    payload: Optional[dict] = None
     created_at: datetime
 
     class Config:
@@ -94,3 +125,111 @@ class EventLogFilter(BaseModel):
     result: Optional[str] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+
+
+class EventLogStatsBucket(BaseModel):
+    bucket_start: datetime
+    event_type: Optional[str] = None
+    result: Optional[str] = None
+    admin_id: Optional[str] = None
+    count: int
+
+
+class EventLogStatsResponse(BaseModel):
+    period: str
+    group_by: list[str] = []
+    total: int
+    buckets: list[EventLogStatsBucket] = []
+
+
+class ReconcileRequest(BaseModel):
+    repair: bool = False
+    resume: bool = False
+
+
+class MemoryTraceRequest(BaseModel):
+    frames: int = 1  # 할당 위치를 기록할 stack 깊이 (클수록 느림)
+
+
+class JobRead(BaseModel):
+    id: str
+    job_type: str
+    status: str
+    admin_id: Optional[str] = None
+    total: Optional[int] = None
+    processed: int
+    succeeded: int
+    failed: int
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class JobItemRead(BaseModel):
+    item_no: int
+    user_id: Optional[str] = None
+    status: str
+    detail: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ModelProfileCreateRequest(BaseModel):
+    name: str
+    models: list[str] = []
+    description: Optional[str] = None
+
+
+class ModelProfileUpdateRequest(BaseModel):
+    models: Optional[list[str]] = None
+    description: Optional[str] = None
+
+
+class ModelProfileRead(BaseModel):
+    id: int
+    name: str
+    models: list[str] = []
+    description: Optional[str] = None
+    user_count: int = 0
+    sync_job_id: Optional[str] = None  # 모델 변경 시 LiteLLM 반영 작업 id
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ModelUserRead(BaseModel):
+    user_id: str
+    organization: Optional[str] = None
+    model_profile: Optional[str] = None  # 프로필로 모델을 가진 경우 프로필 이름
+
+
+class ModelUsersResponse(BaseModel):
+    model_name: str
+    total: int
+    direct_count: int  # users.allowed_models에 직접 지정된 사용자 수
+    profile_count: int  # 모델 프로필을 통해 가진 사용자 수
+    profiles: list[str] = []
+    organizations: dict[str, int] = {}  # 조직별 사용자 수 (조직 없음은 "")
+    limit: int
+    offset: int
+    users: list[ModelUserRead] = []
+
+
+class ModelReplaceRequest(BaseModel):
+    new_model: Optional[str] = None  # 지정하지 않으면 모델 권한을 제거
+
+
+class ModelReplaceResponse(BaseModel):
+    model_name: str
+    new_model: Optional[str] = None
+    updated_users: int
+    profiles: list[str] = []
+    sync_job_ids: list[str] = []
@@ -0,0 +1,139 @@
+"""
+느린 쿼리 기록 (slow query log)
+
+비동기 엔진(primary, 복제본)의 cursor 실행 시간을 재서 SLOW_QUERY_THRESHOLD_MS 이상 걸린 SQL을
+요청 경로와 함께 최근 SLOW_QUERY_MAX_ENTRIES개까지 메모리에 보관합니다. (worker별, GET /admin/slow-queries)
+
+- SLOW_QUERY_EXPLAIN_RATE 비율의 느린 쿼리는 같은 엔진의 다른 연결에서 `EXPLAIN`(ANALYZE 없이,
+  실제로 실행하지 않음)을 실행해 실행 계획을 함께 저장합니다. 요청 처리와 별도로 한 번에 하나씩 실행합니다.
+- 파라미터 값(사용자 key 등)은 EXPLAIN에만 사용하고 저장하지 않습니다.
+- SLOW_QUERY_THRESHOLD_MS가 0이면 이벤트를 등록하지 않습니다.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import SLOW_QUERY_EXPLAIN_RATE, SLOW_QUERY_MAX_ENTRIES, SLOW_QUERY_THRESHOLD_MS
+
+MAX_STATEMENT_LENGTH = 4000
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# 쿼리를 실행한 요청의 ASGI scope (RequestScopeMiddleware에서 설정)
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+
+class RequestScopeMiddleware:
+    """요청 scope를 contextvar에 기록하는 ASGI 미들웨어 (요청마다 task를 만들지 않도록 순수 ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+def _request_route() -> Optional[str]:
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    path = getattr(scope.get("route"), "path", None) or scope.get("path")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        explain_rate: float = SLOW_QUERY_EXPLAIN_RATE,
+        max_entries: int = SLOW_QUERY_MAX_ENTRIES,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain_rate = explain_rate
+        self.entries: deque = deque(maxlen=max(max_entries, 1))
+        self.total = 0
+        self._explaining = False
+        self._explain_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def attach(self, engine: AsyncEngine, name: str):
+        """엔진에 cursor 실행 이벤트를 등록합니다. (name: 기록에 표시할 엔진 이름)"""
+        if not self.enabled:
+            return
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine.sync_engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["query_started"].pop()
+            if elapsed >= self.threshold and not statement.startswith("EXPLAIN "):
+                self.record(engine, name, statement, parameters, elapsed, executemany)
+
+    def record(self, engine: AsyncEngine, name: str, statement, parameters, elapsed, executemany):
+        self.total += 1
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed * 1000, 1),
+            "engine": name,
+            "route": _request_route(),
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "executemany": executemany,
+            "plan": None,
+        }
+        self.entries.append(entry)
+        print(
+            f"Warning: slow query {entry['duration_ms']}ms ({entry['route'] or '-'}): "
+            f"{' '.join(statement.split())[:200]}"
+        )
+        if (
+            not executemany
+            and not self._explaining
+            and statement.lstrip().upper().startswith(EXPLAINABLE)
+            and random.random() < self.explain_rate
+        ):
+            self._explaining = True
+            self._explain_task = asyncio.get_running_loop().create_task(
+                self._explain(engine, statement, parameters, entry)
+            )
+
+    async def _explain(self, engine: AsyncEngine, statement, parameters, entry: dict):
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                entry["plan"] = [row[0] for row in result]
+        except Exception as e:
+            entry["plan_error"] = str(e).splitlines()[0]
+        finally:
+            self._explaining = False
+
+    def recent(self, limit: int = 50, min_duration_ms: float = 0) -> list[dict]:
+        """최근 느린 쿼리부터"""
+        entries = [e for e in reversed(self.entries) if e["duration_ms"] >= min_duration_ms]
+        return entries[:limit]
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold * 1000,
+            "explain_rate": self.explain_rate,
+            "total": self.total,
+            "kept": len(self.entries),
+        }
@@ -0,0 +1,262 @@
+"""
+요청 단위 tracing (외부 collector 없이 메모리/JSONL 파일에 저장)
+
+- 모든 요청에 request id를 부여합니다. (X-Request-ID 헤더를 받으면 그대로 사용, 응답 헤더로 반환)
+  감사 로그(event_logs.request_id)에 저장되어 요청과 로그를 연결합니다.
+- TRACING_ENABLED=true면 TRACE_SAMPLE_RATE 비율의 요청에 대해 span을 기록합니다.
+  요청 span 아래에 SQL 실행(db.query), LiteLLM 호출(litellm.request), 감사 로그 기록(audit.write)이
+  자식 span으로 기록되며, trace id는 request id와 같습니다.
+- 최근 TRACE_MAX_TRACES개 trace를 메모리에 보관하고(GET /admin/traces),
+  TRACE_EXPORT_PATH를 지정하면 종료된 span을 한 줄씩 JSONL로 추가합니다.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+
+from .config import TRACE_EXPORT_PATH, TRACE_MAX_TRACES, TRACE_SAMPLE_RATE, TRACING_ENABLED
+
+REQUEST_ID_HEADER = "x-request-id"
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+MAX_SPANS_PER_TRACE = 1000
+MAX_STATEMENT_LENGTH = 500
+
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "start",
+        "_t0",
+        "duration_ms",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str] = None, **attributes):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start.isoformat(),
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Tracer:
+    def __init__(
+        self,
+        enabled: bool = TRACING_ENABLED,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        max_traces: int = TRACE_MAX_TRACES,
+        export_path: str = TRACE_EXPORT_PATH,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_traces = max(max_traces, 1)
+        self.export_path = export_path
+        self.dropped_spans = 0
+        self._traces: OrderedDict[str, list[dict]] = OrderedDict()
+        self._lock = threading.Lock()  # 감사 로그 span은 threadpool에서 종료됩니다.
+        self._export_file = None
+
+    def start_trace(self, trace_id: str, name: str, **attributes) -> Optional[Span]:
+        """요청 span 시작 (샘플링되지 않으면 None)"""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+        return Span(trace_id, name, **attributes)
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """현재 span의 자식 span 시작 (기록 중인 trace가 없으면 None)"""
+        parent = current_span.get()
+        if parent is None:
+            return None
+        return Span(parent.trace_id, name, parent.span_id, **attributes)
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        if span is None:
+            return
+        span.duration_ms = round((time.perf_counter() - span._t0) * 1000, 3)
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"[:500]
+        self._export(span.to_dict())
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """자식 span을 현재 span으로 두고 실행합니다. (trace가 없으면 아무것도 하지 않음)"""
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            current_span.reset(token)
+
+    def _export(self, record: dict):
+        with self._lock:
+            spans = self._traces.get(record["trace_id"])
+            if spans is None:
+                spans = self._traces[record["trace_id"]] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            if len(spans) >= MAX_SPANS_PER_TRACE:
+                self.dropped_spans += 1
+                return
+            spans.append(record)
+            if self.export_path:
+                self._write(record, flush=record["parent_id"] is None)
+
+    def _write(self, record: dict, flush: bool):
+        try:
+            if self._export_file is None:
+                self._export_file = open(self.export_path, "a", encoding="utf-8")
+            self._export_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            if flush:
+                self._export_file.flush()
+        except OSError as e:
+            print(f"Warning: failed to export trace span to {self.export_path}: {e}")
+            self.export_path = ""
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        """최근 trace 요약 (요청 span 기준, 최신순)"""
+        with self._lock:
+            traces = list(self._traces.items())[-limit:]
+        summaries = []
+        for trace_id, spans in reversed(traces):
+            root = next((s for s in spans if s["parent_id"] is None), None)
+            summaries.append(
+                {
+                    "trace_id": trace_id,
+                    "name": root["name"] if root else None,
+                    "start": root["start"] if root else spans[0]["start"],
+                    "duration_ms": root["duration_ms"] if root else None,
+                    "status_code": root["attributes"].get("status_code") if root else None,
+                    "spans": len(spans),
+                }
+            )
+        return summaries
+
+    def trace(self, trace_id: str) -> Optional[list[dict]]:
+        """trace의 span 목록 (시작 시각 순)"""
+        with self._lock:
+            spans = list(self._traces.get(trace_id) or [])
+        return sorted(spans, key=lambda s: s["start"]) if spans else None
+
+    def instrument_engine(self, engine, name: str):
+        """SQL 실행마다 db.query span을 기록합니다. (Engine 또는 AsyncEngine.sync_engine)"""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            span = self.start_span(
+                "db.query",
+                engine=name,
+                statement=statement[:MAX_STATEMENT_LENGTH],
+                executemany=executemany,
+            )
+            conn.info.setdefault("trace_spans", []).append(span)
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            spans = conn.info.get("trace_spans")
+            if spans:
+                self.end_span(spans.pop())
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            conn = exception_context.connection
+            spans = conn.info.get("trace_spans") if conn is not None else None
+            if spans:
+                self.end_span(spans.pop(), exception_context.original_exception)
+
+
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """request id 부여 및 요청 span 기록 (순수 ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        span = tracer.start_trace(
+            request_id, f"{scope['method']} {scope['path']}", method=scope["method"]
+        )
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode()))
+                message = {**message, "headers": headers}
+                if span is not None:
+                    span.attributes["status_code"] = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                # 이후 background task(감사 로그 등)도 요청 span에 포함되므로 응답 완료 시점을 따로 기록
+                if span is not None:
+                    span.attributes["response_ms"] = round(
+                        (time.perf_counter() - span._t0) * 1000, 3
+                    )
+            await send(message)
+
+        request_token = current_request_id.set(request_id)
+        span_token = current_span.set(span)
+        error = None
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            current_span.reset(span_token)
+            current_request_id.reset(request_token)
+            if span is not None:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.name = f"{scope['method']} {route}"
+                span.attributes["path"] = scope["path"]
+                tracer.end_span(span, error)
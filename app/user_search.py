@@ -0,0 +1,71 @@
+"""
+사용자 검색 (user_id / organization / extra_info)
+
+결과는 아래 순위 구간(tier)별로 인덱스 순서대로 필요한 개수만 읽어 이어 붙입니다.
+전체 일치 행을 정렬하지 않으므로 검색어가 넓어도 LIMIT 만큼만 읽습니다.
+
+1. user_id 정확히 일치 (대소문자 무시)
+2. user_id 접두 일치
+3. user_id / organization / extra_info 부분 일치 (검색어가 SEARCH_MIN_SUBSTRING_LENGTH 이상일 때)
+
+같은 구간에서는 lower(user_id) 순이며, 1·2는 ix_users_user_id_lower, 3은 pg_trgm GIN 인덱스를 사용합니다.
+"""
+
+from typing import Optional
+
+from sqlalchemy import and_, func, not_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import SEARCH_COUNT_LIMIT, SEARCH_MIN_SUBSTRING_LENGTH
+from .models import USER_ID_SEARCH_KEY, User
+
+
+def like_escape(value: str) -> str:
+    """LIKE 패턴의 특수문자(%, _)를 이스케이프합니다."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_tiers(q: str) -> list:
+    """순위 순서대로 각 구간의 조건 목록 (구간끼리 겹치지 않음)"""
+    q_lower = q.lower()
+    escaped = like_escape(q_lower)
+    prefix = USER_ID_SEARCH_KEY.like(f"{escaped}%", escape="\\")
+    tiers = [USER_ID_SEARCH_KEY == q_lower, and_(prefix, USER_ID_SEARCH_KEY != q_lower)]
+    if len(q) >= SEARCH_MIN_SUBSTRING_LENGTH:
+        contains = f"%{escaped}%"
+        tiers.append(
+            and_(
+                or_(
+                    User.user_id.ilike(contains, escape="\\"),
+                    User.organization.ilike(contains, escape="\\"),
+                    User.extra_info.ilike(contains, escape="\\"),
+                ),
+                not_(prefix),
+            )
+        )
+    return tiers
+
+
+async def search_user_ids(
+    db: AsyncSession, q: str, organization: Optional[str], limit: int, offset: int
+) -> tuple[int, list[int]]:
+    """
+    검색 결과 수(SEARCH_COUNT_LIMIT + 1에서 멈춤)와 해당 페이지 사용자 id 목록을 순위 순서로 반환합니다.
+    """
+    tiers = search_tiers(q)
+    if organization:
+        tiers = [and_(tier, User.organization == organization) for tier in tiers]
+
+    matched = select(User.id).where(or_(*tiers)).limit(SEARCH_COUNT_LIMIT + 1).subquery()
+    total = await db.scalar(select(func.count()).select_from(matched))
+
+    needed = offset + limit
+    ids: list[int] = []
+    for tier in tiers:
+        if len(ids) >= needed:
+            break
+        result = await db.execute(
+            select(User.id).where(tier).order_by(USER_ID_SEARCH_KEY).limit(needed - len(ids))
+        )
+        ids.extend(result.scalars())
+    return total, ids[offset:needed]
@@ -0,0 +1,234 @@
+"""
+벤치마크/로컬 테스트용 LiteLLM 시뮬레이터
+
+mama가 사용하는 LiteLLM Proxy API(/models, /key/*)만 흉내내는 가벼운 서버입니다.
+응답 지연, 오류 비율, key 저장소를 환경변수로 조절할 수 있습니다.
+
+    FAKE_LITELLM_LATENCY_MS=20 FAKE_LITELLM_ERROR_RATE=0.01 \
+        python -m uvicorn benchmarks.fake_litellm:app --port 4100
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import secrets
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Body, FastAPI, Header, HTTPException, Request
+
+MASTER_KEY = os.getenv("FAKE_LITELLM_MASTER_KEY", "sk-fake-master")
+LATENCY_MS = float(os.getenv("FAKE_LITELLM_LATENCY_MS", "0"))
+JITTER_MS = float(os.getenv("FAKE_LITELLM_JITTER_MS", "0"))
+ERROR_RATE = float(os.getenv("FAKE_LITELLM_ERROR_RATE", "0"))
+MODELS = os.getenv("FAKE_LITELLM_MODELS", "gpt-3.5-turbo,gpt-4,gpt-4o").split(",")
+# 지정 시 종료할 때 key 저장소를 JSON으로 저장하고, 시작할 때 불러옵니다.
+KEY_STORE_PATH = os.getenv("FAKE_LITELLM_KEY_STORE")
+
+
+def hash_token(key: str) -> str:
+    """LiteLLM과 동일하게 key를 sha256 hex로 해시합니다."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class FakeKeyStore:
+    """메모리 기반 key 저장소 (LiteLLM처럼 raw key와 해시 모두로 조회 가능)"""
+
+    def __init__(self):
+        self.keys: dict[str, dict] = {}
+        self.by_hash: dict[str, str] = {}
+        self.by_alias: dict[str, str] = {}
+
+    def put(self, key: str, info: dict):
+        self._drop_alias(key)
+        self.keys[key] = info
+        self.by_hash[hash_token(key)] = key
+        if info.get("key_alias"):
+            self.by_alias[info["key_alias"]] = key
+
+    def check_alias(self, key_alias: Optional[str], key: Optional[str] = None):
+        """LiteLLM처럼 다른 key가 사용 중인 alias는 거부합니다."""
+        owner = self.by_alias.get(key_alias) if key_alias else None
+        if owner is not None and owner != key:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unique key aliases across all keys are required. "
+                f"Key alias '{key_alias}' already exists.",
+            )
+
+    def _drop_alias(self, key: str):
+        alias = self.keys.get(key, {}).get("key_alias")
+        if alias and self.by_alias.get(alias) == key:
+            del self.by_alias[alias]
+
+    def resolve(self, key_or_hash: str) -> Optional[str]:
+        if key_or_hash in self.keys:
+            return key_or_hash
+        return self.by_hash.get(key_or_hash)
+
+    def delete(self, key: str):
+        self._drop_alias(key)
+        del self.keys[key]
+        self.by_hash.pop(hash_token(key), None)
+
+    def clear(self):
+        self.keys.clear()
+        self.by_hash.clear()
+        self.by_alias.clear()
+
+    def load(self, path: str):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for key, info in json.load(f).items():
+                    self.put(key, info)
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.keys, f)
+
+
+store = FakeKeyStore()
+stats = {"requests": 0, "injected_errors": 0}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if KEY_STORE_PATH:
+        store.load(KEY_STORE_PATH)
+    yield
+    if KEY_STORE_PATH:
+        store.save(KEY_STORE_PATH)
+
+
+app = FastAPI(title="fake-litellm", lifespan=lifespan)
+
+
+async def _simulate(authorization: Optional[str]):
+    """인증 확인 후 설정된 지연과 오류를 주입합니다."""
+    stats["requests"] += 1
+    if authorization != f"Bearer {MASTER_KEY}":
+        raise HTTPException(status_code=401, detail="Authentication Error, invalid master key")
+    delay = LATENCY_MS + (random.uniform(-JITTER_MS, JITTER_MS) if JITTER_MS else 0)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        stats["injected_errors"] += 1
+        raise HTTPException(status_code=500, detail="Injected failure")
+
+
+@app.get("/models")
+async def get_models(authorization: Optional[str] = Header(None)):
+    await _simulate(authorization)
+    return {"data": [{"id": m, "object": "model", "owned_by": "fake"} for m in MODELS]}
+
+
+@app.post("/key/generate")
+async def generate_key(payload: dict = Body(...), authorization: Optional[str] = Header(None)):
+    await _simulate(authorization)
+    store.check_alias(payload.get("key_alias"))
+    key = f"sk-{secrets.token_urlsafe(16)}"
+    store.put(
+        key,
+        {
+            "models": payload.get("models", []),
+            "user_id": payload.get("user_id"),
+            "key_alias": payload.get("key_alias"),
+            "metadata": payload.get("metadata") or {},
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+    return {"key": key, **store.keys[key]}
+
+
+@app.post("/key/update")
+async def update_key(payload: dict = Body(...), authorization: Optional[str] = Header(None)):
+    await _simulate(authorization)
+    key = store.resolve(payload.get("key", ""))
+    if key is None:
+        raise HTTPException(status_code=404, detail="Key not found")
+    if "key_alias" in payload:
+        store.check_alias(payload["key_alias"], key)
+    info = dict(store.keys[key])
+    for field in ("models", "key_alias", "metadata"):
+        if field in payload:
+            info[field] = payload[field]
+    store.put(key, info)
+    return {"key": payload["key"], **info}
+
+
+@app.post("/key/delete")
+async def delete_key(payload: dict = Body(...), authorization: Optional[str] = Header(None)):
+    await _simulate(authorization)
+    keys = payload.get("keys", [])
+    resolved = [store.resolve(k) for k in keys]
+    if None in resolved:
+        raise HTTPException(status_code=404, detail=f"Keys not found: {resolved.count(None)}")
+    for k in resolved:
+        store.delete(k)
+    return {"deleted_keys": keys}
+
+
+@app.get("/key/info")
+async def key_info(key: str, authorization: Optional[str] = Header(None)):
+    await _simulate(authorization)
+    resolved = store.resolve(key)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Key not found")
+    return {"key": key, "info": store.keys[resolved]}
+
+
+@app.get("/key/list")
+async def list_keys(
+    user_id: Optional[str] = None,
+    page: int = 1,
+    size: int = 100,
+    return_full_object: bool = False,
+    authorization: Optional[str] = Header(None),
+):
+    await _simulate(authorization)
+    matched = [(k, v) for k, v in store.keys.items() if user_id is None or v["user_id"] == user_id]
+    total_pages = max(1, -(-len(matched) // size))
+    items = matched[(page - 1) * size : page * size]
+    if return_full_object:
+        keys = [{"token": hash_token(k), "key_alias": v["key_alias"], **v} for k, v in items]
+    else:
+        keys = [hash_token(k) for k, _ in items]
+    return {
+        "keys": keys,
+        "total_count": len(matched),
+        "current_page": page,
+        "total_pages": total_pages,
+    }
+
+
+@app.post("/_fake/keys/bulk")
+async def bulk_register(request: Request):
+    """벤치마크 시딩용: DB에 직접 넣은 key를 한 번에 등록합니다. (지연/오류 주입 없음)"""
+    items = await request.json()
+    for item in items:
+        store.put(
+            item["key"],
+            {
+                "models": item.get("models", []),
+                "user_id": item.get("user_id"),
+                "key_alias": item.get("key_alias"),
+                "metadata": item.get("metadata") or {},
+                "created_at": item.get("created_at") or datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    return {"registered": len(items), "total": len(store.keys)}
+
+
+@app.post("/_fake/reset")
+async def reset():
+    store.clear()
+    stats.update(requests=0, injected_errors=0)
+    return {"status": "ok"}
+
+
+@app.get("/_fake/stats")
+async def get_stats():
+    return {**stats, "keys": len(store.keys)}
@@ -0,0 +1,468 @@
+"""
+mama 종단간(end-to-end) 부하 벤치마크
+
+로컬 PostgreSQL과 번들된 LiteLLM 시뮬레이터(benchmarks.fake_litellm)로 앱을 띄운 뒤
+사용자를 시딩하고 주요 API의 p50/p99 지연과 처리량을 측정합니다.
+결과는 JSON으로 저장되며 --compare로 이전 커밋의 결과와 비교할 수 있습니다.
+
+    python -m benchmarks.load --users 10000 --output bench-10k.json
+    python -m benchmarks.load --users 100000 --compare bench-10k.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import secrets
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import create_engine, insert, select, text
+
+from app.config import DB_URL, LITELLM_USER_ID, SERVER_API_KEY
+from app.key_lookup import key_fingerprint
+from app.models import User
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FAKE_MASTER_KEY = "sk-fake-master"
+BENCH_ORG_COUNT = 50
+BENCH_MODELS = ["gpt-3.5-turbo", "gpt-4", "gpt-4o"]
+SEED_CHUNK = 5000
+# 한 요청자(x-api-key)가 동시에 많은 요청을 보내므로 요청 수 제한/과부하 거절을 끄고 지연 시간만 측정합니다.
+# (--rate-limit 지정 시 앱 설정을 그대로 사용)
+NO_LIMIT_ENV = {
+    "RATE_LIMIT_API_RATE": "0",
+    "RATE_LIMIT_ADMIN_RATE": "0",
+    "RATE_LIMIT_ANON_RATE": "0",
+    "RATE_LIMIT_CLIENT_POOL_SHARE": "0",
+    "ADMISSION_MAX_IN_FLIGHT": "0",
+    "ADMISSION_MAX_POOL_WAIT": "0",
+}
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """지연 시간 목록(초)을 ms 단위 통계로 요약합니다."""
+    values = sorted(v * 1000 for v in latencies)
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(_percentile(values, 50), 3),
+        "p90_ms": round(_percentile(values, 90), 3),
+        "p99_ms": round(_percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+        "mean_ms": round(statistics.fmean(values), 3) if values else 0.0,
+        "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _wait_http(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"서버가 응답하지 않습니다: {url}")
+
+
+class Servers:
+    """fake LiteLLM과 mama 앱을 서브프로세스로 실행합니다."""
+
+    def __init__(self, args, log_dir: str):
+        self.args = args
+        self.log_dir = log_dir
+        self.procs: list[subprocess.Popen] = []
+
+    def _spawn(self, name: str, module: str, port: int, env: dict, workers: int = 1):
+        log = open(os.path.join(self.log_dir, f"{name}.log"), "w", encoding="utf-8")
+        cmd = [sys.executable, "-m", "uvicorn", module, "--port", str(port), "--log-level"]
+        cmd += ["warning", "--workers", str(workers)]
+        proc = subprocess.Popen(cmd, cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        self.procs.append(proc)
+
+    def start(self):
+        base_env = dict(os.environ)
+        fake_env = dict(
+            base_env,
+            FAKE_LITELLM_MASTER_KEY=FAKE_MASTER_KEY,
+            FAKE_LITELLM_LATENCY_MS=str(self.args.litellm_latency_ms),
+            FAKE_LITELLM_JITTER_MS=str(self.args.litellm_jitter_ms),
+            FAKE_LITELLM_ERROR_RATE=str(self.args.litellm_error_rate),
+        )
+        self._spawn("fake_litellm", "benchmarks.fake_litellm:app", self.args.litellm_port, fake_env)
+        _wait_http(f"{self.litellm_url}/_fake/stats")
+
+        # app은 정적 파일 디렉토리가 있어야 기동됩니다.
+        os.makedirs(os.path.join(ROOT_DIR, "frontend", "dist"), exist_ok=True)
+        app_env = dict(
+            base_env,
+            LITELLM_URL=self.litellm_url,
+            LITELLM_MASTER_KEY=FAKE_MASTER_KEY,
+            SERVER_API_KEY=SERVER_API_KEY,
+        )
+        if not self.args.rate_limit:
+            app_env.update(NO_LIMIT_ENV)
+        self._spawn("app", "app.main:app", self.args.app_port, app_env, self.args.app_workers)
+        _wait_http(f"{self.app_url}/health", timeout=60.0)
+
+    @property
+    def litellm_url(self) -> str:
+        return f"http://127.0.0.1:{self.args.litellm_port}"
+
+    @property
+    def app_url(self) -> str:
+        return f"http://127.0.0.1:{self.args.app_port}"
+
+    def stop(self):
+        for proc in self.procs:
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGINT)
+        for proc in self.procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def migrate_and_reset():
+    """스키마를 최신으로 맞추고 벤치마크 대상 테이블을 비웁니다."""
+    subprocess.run(["alembic", "upgrade", "head"], cwd=ROOT_DIR, check=True)
+    engine = create_engine(DB_URL)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "TRUNCATE users, event_logs, event_log_rollups, event_log_rollup_state "
+                "RESTART IDENTITY CASCADE"
+            )
+        )
+    engine.dispose()
+
+
+def seed_users(count: int, litellm_url: str) -> list[str]:
+    """사용자와 모델 권한을 DB에 직접 벌크 삽입하고 fake LiteLLM에 key를 등록합니다."""
+    engine = create_engine(DB_URL)
+    user_ids = []
+    with httpx.Client(base_url=litellm_url, timeout=60.0) as client:
+        for start in range(0, count, SEED_CHUNK):
+            rows = []
+            for i in range(start, min(start + SEED_CHUNK, count)):
+                key_value = f"sk-bench-{secrets.token_hex(12)}"
+                rows.append(
+                    {
+                        "user_id": f"bench-user-{i:07d}",
+                        "organization": f"bench-org-{i % BENCH_ORG_COUNT:03d}",
+                        "key_value": key_value,
+                        "key_hash": key_fingerprint(key_value),
+                        "extra_info": "benchmark seed",
+                        "allowed_models": BENCH_MODELS[:2],
+                    }
+                )
+            with engine.begin() as conn:
+                conn.execute(insert(User), rows)
+            client.post(
+                "/_fake/keys/bulk",
+                json=[
+                    {
+                        "key": r["key_value"],
+                        "models": BENCH_MODELS[:2],
+                        "user_id": LITELLM_USER_ID,
+                        "key_alias": r["user_id"],
+                    }
+                    for r in rows
+                ],
+            ).raise_for_status()
+            user_ids.extend(r["user_id"] for r in rows)
+    engine.dispose()
+    return user_ids
+
+
+def load_seeded_user_ids() -> list[str]:
+    engine = create_engine(DB_URL)
+    with engine.connect() as conn:
+        stmt = select(User.user_id).where(User.user_id.like("bench-user-%"))
+        user_ids = list(conn.execute(stmt).scalars())
+    engine.dispose()
+    return user_ids
+
+
+async def run_scenario(name: str, make_request, requests: int, concurrency: int) -> dict:
+    """make_request(i)를 requests번, 최대 concurrency개 동시에 실행해 통계를 냅니다."""
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                resp = await make_request(i)
+                ok = resp.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, errors, time.perf_counter() - started)
+    print(
+        f"{name:<14} n={result['requests']:<6} err={result['errors']:<4} "
+        f"p50={result['p50_ms']:>9.2f}ms p99={result['p99_ms']:>9.2f}ms "
+        f"rps={result['throughput_rps']:>9.2f}"
+    )
+    return result
+
+
+async def run_benchmarks(args, app_url: str, user_ids: list[str]) -> dict:
+    api_headers = {"x-api-key": SERVER_API_KEY}
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(base_url=app_url, timeout=120.0, limits=limits) as client:
+        resp = await client.post("/login", data={"username": "mama", "password": "mama"})
+        resp.raise_for_status()
+        jwt_headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+        batch = args.batch_size
+        n = args.requests
+        results = {}
+
+        results["get_key"] = await run_scenario(
+            "get_key",
+            lambda i: client.get(f"/key/{random.choice(user_ids)}", headers=api_headers),
+            n,
+            args.concurrency,
+        )
+        results["key_info"] = await run_scenario(
+            "key_info",
+            lambda i: client.post(
+                "/key/info", json={"user_ids": random.sample(user_ids, batch)}, headers=api_headers
+            ),
+            n,
+            args.concurrency,
+        )
+        results["list_users_org"] = await run_scenario(
+            "list_users_org",
+            lambda i: client.get(
+                "/users",
+                params={"organization": f"bench-org-{i % BENCH_ORG_COUNT:03d}"},
+                headers=api_headers,
+            ),
+            max(1, n // 10),
+            args.concurrency,
+        )
+        results["list_users_all"] = await run_scenario(
+            "list_users_all",
+            lambda i: client.get("/users", headers=api_headers),
+            args.full_list_requests,
+            min(args.concurrency, 4),
+        )
+
+        run_tag = secrets.token_hex(3)
+        created_batches = [
+            [f"bench-new-{run_tag}-{i:05d}-{j:04d}" for j in range(batch)]
+            for i in range(args.mutation_requests)
+        ]
+        results["batch_create"] = await run_scenario(
+            "batch_create",
+            lambda i: client.post(
+                "/users",
+                json={
+                    "users": [
+                        {
+                            "user_id": uid,
+                            "organization": "bench-new",
+                            "allowed_models": BENCH_MODELS,
+                        }
+                        for uid in created_batches[i]
+                    ]
+                },
+                headers=api_headers,
+            ),
+            args.mutation_requests,
+            args.concurrency,
+        )
+        results["batch_update"] = await run_scenario(
+            "batch_update",
+            lambda i: client.put(
+                "/users/batch",
+                json={
+                    "user_ids": random.sample(user_ids, batch),
+                    "allowed_models": random.sample(BENCH_MODELS, 2),
+                },
+                headers=api_headers,
+            ),
+            args.mutation_requests,
+            args.concurrency,
+        )
+        results["batch_delete"] = await run_scenario(
+            "batch_delete",
+            lambda i: client.request(
+                "DELETE",
+                "/users/batch",
+                json={"user_ids": created_batches[i]},
+                headers=jwt_headers,
+            ),
+            args.mutation_requests,
+            args.concurrency,
+        )
+
+        # 앞 단계에서 GET_USER_KEY 등 이벤트 로그가 충분히 쌓인 상태에서 측정합니다.
+        results["event_logs"] = await run_scenario(
+            "event_logs",
+            lambda i: client.get("/event-logs", params={"limit": 100}, headers=jwt_headers),
+            max(1, n // 10),
+            args.concurrency,
+        )
+        results["event_logs_user"] = await run_scenario(
+            "event_logs_user",
+            lambda i: client.get(
+                "/event-logs",
+                params={"user_id": random.choice(user_ids), "limit": 100},
+                headers=jwt_headers,
+            ),
+            max(1, n // 10),
+            args.concurrency,
+        )
+        return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """p99 지연 또는 처리량이 threshold(비율) 이상 나빠진 시나리오를 반환합니다."""
+    regressions = []
+    print(f"\n{'scenario':<16}{'p99 base':>12}{'p99 now':>12}{'rps base':>12}{'rps now':>12}")
+    for name, now in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        print(
+            f"{name:<16}{base['p99_ms']:>12.2f}{now['p99_ms']:>12.2f}"
+            f"{base['throughput_rps']:>12.2f}{now['throughput_rps']:>12.2f}"
+        )
+        if base["p99_ms"] and now["p99_ms"] > base["p99_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p99 {base['p99_ms']}ms -> {now['p99_ms']}ms")
+        if base["throughput_rps"] and now["throughput_rps"] < base["throughput_rps"] * (
+            1 - threshold
+        ):
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']} -> {now['throughput_rps']} rps"
+            )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="mama end-to-end load benchmark")
+    parser.add_argument("--users", type=int, default=10000, help="시딩할 사용자 수")
+    parser.add_argument("--requests", type=int, default=2000, help="읽기 시나리오별 요청 수")
+    parser.add_argument("--mutation-requests", type=int, default=20, help="배치 변경 요청 수")
+    parser.add_argument("--full-list-requests", type=int, default=5, help="전체 GET /users 횟수")
+    parser.add_argument("--batch-size", type=int, default=100, help="배치 API당 사용자 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--app-port", type=int, default=8100)
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--litellm-port", type=int, default=4100)
+    parser.add_argument("--litellm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--litellm-jitter-ms", type=float, default=5.0)
+    parser.add_argument("--litellm-error-rate", type=float, default=0.0)
+    parser.add_argument("--app-url", help="이미 실행 중인 앱을 사용 (서버/시딩 생략)")
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="요청 수 제한/과부하 거절을 켠 상태로 측정"
+    )
+    parser.add_argument("--skip-seed", action="store_true", help="기존 bench-user-* 데이터 사용")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument(
+        "--regression-threshold", type=float, default=0.2, help="회귀로 판단할 악화 비율"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    servers = None
+    try:
+        if args.app_url:
+            app_url = args.app_url
+            user_ids = load_seeded_user_ids()
+        else:
+            log_dir = tempfile.mkdtemp(prefix="mama-bench-")
+            print(f"서버 로그: {log_dir}")
+            if not args.skip_seed:
+                migrate_and_reset()
+            servers = Servers(args, log_dir)
+            servers.start()
+            app_url = servers.app_url
+            started = time.perf_counter()
+            if args.skip_seed:
+                user_ids = load_seeded_user_ids()
+            else:
+                user_ids = seed_users(args.users, servers.litellm_url)
+            print(f"시딩 완료: {len(user_ids)} users ({time.perf_counter() - started:.1f}s)")
+
+        if len(user_ids) < args.batch_size:
+            raise RuntimeError("벤치마크용 사용자가 부족합니다. --skip-seed 없이 실행하세요.")
+
+        scenarios = asyncio.run(run_benchmarks(args, app_url, user_ids))
+    finally:
+        if servers:
+            servers.stop()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "users": len(user_ids),
+            "python": platform.python_version(),
+            "args": vars(args),
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.regression_threshold)
+        if regressions:
+            print("\n성능 회귀 감지:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
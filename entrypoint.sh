@@ -4,5 +4,12 @@ set -e
 echo "Running database migrations..."
 alembic upgrade head
 
-echo "Starting application..."
-exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8000
+# worker 프로세스 수 (기본: 1). 각 worker는 DB_MAX_CONNECTIONS를 이 값으로 나눠 사용하며,
+# 캐시/진단 버퍼 등 worker별 기능이 있으므로 dev-guide.md의 여러 worker 실행 항목을 확인한 뒤 늘립니다.
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-1}"
+
+# 연결 예산이 worker 수에 비해 부족하면 시작하지 않습니다.
+python -c "from app.db_pool import pool_budget; pool_budget()"
+
+echo "Starting application with ${WEB_CONCURRENCY} workers..."
+exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY}"
@@ -0,0 +1,69 @@
+"""
+마이크로벤치마크 공통 fixture
+
+기본은 임시 SQLite 파일을 사용하며, BENCH_DB_URL에 로컬 PostgreSQL(psycopg2) URL을 지정하면
+같은 벤치마크를 PostgreSQL에서 실행합니다. 네트워크(LiteLLM)는 사용하지 않습니다.
+
+    python -m pytest tests/benchmark --benchmark-only
+    BENCH_DB_URL=postgresql+psycopg2://user:pw@localhost/mama_bench python -m pytest tests/benchmark
+"""
+
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# app.main은 import 시 정적 파일 디렉토리를 mount 하므로 빌드 결과가 없어도 import 되도록 합니다.
+os.makedirs(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "dist"), exist_ok=True)
+
+from app.models import Base
+
+
+def _async_url(sync_url: str) -> str:
+    if sync_url.startswith("sqlite"):
+        return sync_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return sync_url.replace("postgresql+psycopg2", "postgresql+asyncpg", 1)
+
+
+@pytest.fixture(scope="session")
+def bench_db_url(tmp_path_factory):
+    url = os.getenv("BENCH_DB_URL")
+    if url:
+        return url
+    return f"sqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}"
+
+
+@pytest.fixture(scope="session")
+def sync_engine(bench_db_url):
+    engine = create_engine(bench_db_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def sync_session_factory(sync_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+
+
+@pytest.fixture
+def event_loop_runner():
+    """벤치마크 대상 코루틴을 동기적으로 실행하기 위한 이벤트 루프"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def async_session_factory(sync_engine, bench_db_url, event_loop_runner):
+    engine = create_async_engine(_async_url(bench_db_url))
+    yield async_sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
+    event_loop_runner(engine.dispose())
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import func, insert, select
+
+import app.main as main_module
+from app.main import log_event_sync
+from app.models import EventLog
+
+BATCH_SIZE = 100
+
+
+@pytest.fixture
+def bench_log_session(monkeypatch, sync_session_factory):
+    """log_event_sync가 벤치마크 DB를 사용하도록 세션 팩토리를 교체합니다."""
+    monkeypatch.setattr(main_module, "SyncSessionLocal", sync_session_factory)
+    return sync_session_factory
+
+
+def _count_events(session_factory) -> int:
+    with session_factory() as db:
+        return db.execute(select(func.count(EventLog.id))).scalar_one()
+
+
+def _event_rows(count: int) -> list[dict]:
+    return [
+        {
+            "admin_id": "SERVER_API",
+            "user_id": f"bench-user-{i:07d}",
+            "event_type": "GET_USER_KEY",
+            "event_detail": f"User key retrieved successfully: bench-user-{i:07d}",
+            "result": "SUCCESS",
+        }
+        for i in range(count)
+    ]
+
+
+def test_log_event_sync_single(benchmark, bench_log_session):
+    """요청당 1건: 세션 생성 + INSERT + COMMIT"""
+    before = _count_events(bench_log_session)
+    benchmark(
+        log_event_sync,
+        admin_id="SERVER_API",
+        event_type="GET_USER_KEY",
+        event_detail="User key retrieved successfully: bench-user-0000000",
+        user_id="bench-user-0000000",
+    )
+    assert _count_events(bench_log_session) > before
+
+
+def test_log_event_sync_x100(benchmark, bench_log_session):
+    """100건을 log_event_sync로 각각 기록 (배치 INSERT와 비교 기준)"""
+    rows = _event_rows(BATCH_SIZE)
+
+    def run():
+        for row in rows:
+            log_event_sync(**row)
+
+    benchmark.pedantic(run, rounds=5, warmup_rounds=1)
+
+
+def test_log_event_batched_x100(benchmark, bench_log_session):
+    """100건을 하나의 트랜잭션에서 executemany INSERT로 기록"""
+    rows = _event_rows(BATCH_SIZE)
+
+    def run():
+        with bench_log_session() as db:
+            db.execute(insert(EventLog), rows)
+            db.commit()
+
+    benchmark.pedantic(run, rounds=5, warmup_rounds=1)
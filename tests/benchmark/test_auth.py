@@ -0,0 +1,66 @@
+import bcrypt
+import jwt
+import pytest
+
+from app.config import JWT_ALGORITHM, JWT_SECRET_KEY, SERVER_API_KEY
+from app.main import create_access_token, get_current_admin_or_api_key
+from app.models import Admin
+
+BENCH_ADMIN = "bench_admin"
+
+
+@pytest.fixture(scope="module")
+def bench_admin(sync_session_factory):
+    with sync_session_factory() as db:
+        admin = db.query(Admin).filter(Admin.username == BENCH_ADMIN).first()
+        if not admin:
+            admin = Admin(username=BENCH_ADMIN, is_super_admin=True)
+            admin.set_password("bench_password")
+            db.add(admin)
+            db.commit()
+    return BENCH_ADMIN
+
+
+def test_create_access_token(benchmark):
+    token = benchmark(create_access_token, {"sub": BENCH_ADMIN, "is_super_admin": True})
+    assert token
+
+
+def test_jwt_decode(benchmark):
+    token = create_access_token({"sub": BENCH_ADMIN, "is_super_admin": True})
+    payload = benchmark(jwt.decode, token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    assert payload["sub"] == BENCH_ADMIN
+
+
+def test_auth_api_key(benchmark, async_session_factory, event_loop_runner):
+    """x-api-key 경로: DB 조회 없이 비교만 수행"""
+
+    async def run():
+        async with async_session_factory() as db:
+            return await get_current_admin_or_api_key(token=None, x_api_key=SERVER_API_KEY, db=db)
+
+    result = benchmark.pedantic(
+        lambda: event_loop_runner(run()), rounds=200, warmup_rounds=5, iterations=1
+    )
+    assert result == (None, "SERVER_API")
+
+
+def test_auth_jwt(benchmark, bench_admin, async_session_factory, event_loop_runner):
+    """JWT 경로: 토큰 디코딩 + Admin 조회"""
+    token = create_access_token({"sub": bench_admin, "is_super_admin": True})
+
+    async def run():
+        async with async_session_factory() as db:
+            return await get_current_admin_or_api_key(token=token, x_api_key=None, db=db)
+
+    admin, api_identifier = benchmark.pedantic(
+        lambda: event_loop_runner(run()), rounds=200, warmup_rounds=5, iterations=1
+    )
+    assert admin.username == bench_admin and api_identifier is None
+
+
+@pytest.mark.parametrize("rounds", [4, 8, 10, 12])
+def test_verify_password_bcrypt_cost(benchmark, rounds):
+    hashed = bcrypt.hashpw(b"bench_password", bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+    admin = Admin(username=BENCH_ADMIN, password=hashed)
+    assert benchmark.pedantic(admin.verify_password, args=("bench_password",), rounds=5)
@@ -0,0 +1,164 @@
+"""
+모델/서비스 권한 저장 방식 비교: 별도 테이블(allowed_models, allowed_services) vs users 배열 컬럼
+
+별도 테이블 방식은 이전 스키마를 재현한 테이블(legacy_*)로 측정합니다.
+ORM 객체 생성 비용을 빼고 저장 방식의 차이만 보도록 양쪽 모두 Core 쿼리로 조회합니다.
+(실제 GET /users 경로는 test_serialization.py::test_list_users_query)
+
+    python -m pytest tests/benchmark/test_model_storage.py --benchmark-group-by=func
+"""
+
+import pytest
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    insert,
+    select,
+    update,
+)
+
+from app.models import User
+
+USER_COUNT = 1000
+UPDATE_COUNT = 100
+MODELS = ["gpt-3.5-turbo", "gpt-4", "gpt-4o"]
+
+legacy_metadata = MetaData()
+legacy_users = Table(
+    "legacy_users",
+    legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String(50), unique=True, nullable=False),
+    Column("organization", String(100)),
+    Column("key_value", String(255), nullable=False),
+)
+legacy_models = Table(
+    "legacy_allowed_models",
+    legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("legacy_users.id"), nullable=False, index=True),
+    Column("model_name", String(100), nullable=False),
+)
+legacy_services = Table(
+    "legacy_allowed_services",
+    legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("legacy_users.id"), nullable=False, index=True),
+    Column("service_name", String(100), nullable=False),
+)
+
+
+@pytest.fixture(scope="module")
+def seeded(sync_engine, sync_session_factory):
+    legacy_metadata.drop_all(sync_engine)
+    legacy_metadata.create_all(sync_engine)
+    rows = [
+        {
+            "user_id": f"storage-user-{i:07d}",
+            "organization": f"bench-org-{i % 50:03d}",
+            "key_value": f"sk-storage-{i:024d}",
+        }
+        for i in range(USER_COUNT)
+    ]
+    with sync_session_factory() as db:
+        db.execute(delete(User))
+        db.execute(insert(User), [{**row, "allowed_models": MODELS[:2]} for row in rows])
+        db.execute(insert(legacy_users), rows)
+        ids = db.execute(select(legacy_users.c.id)).scalars().all()
+        db.execute(
+            insert(legacy_models),
+            [{"user_id": pk, "model_name": m} for pk in ids for m in MODELS[:2]],
+        )
+        db.commit()
+    yield [row["user_id"] for row in rows]
+    legacy_metadata.drop_all(sync_engine)
+
+
+def _legacy_read(db, user_ids):
+    """이전 방식: users 조회 후 selectinload와 같은 IN 쿼리 2회"""
+    users = db.execute(select(legacy_users).where(legacy_users.c.user_id.in_(user_ids))).all()
+    pks = [u.id for u in users]
+    models, services = {}, {}
+    for pk, name in db.execute(
+        select(legacy_models.c.user_id, legacy_models.c.model_name).where(
+            legacy_models.c.user_id.in_(pks)
+        )
+    ):
+        models.setdefault(pk, []).append(name)
+    for pk, name in db.execute(
+        select(legacy_services.c.user_id, legacy_services.c.service_name).where(
+            legacy_services.c.user_id.in_(pks)
+        )
+    ):
+        services.setdefault(pk, []).append(name)
+    return [(u.user_id, models.get(u.id, []), services.get(u.id, [])) for u in users]
+
+
+def test_read_single_user_tables(benchmark, seeded, sync_session_factory):
+    """GET /user/{user_id}: 별도 테이블 (쿼리 3회)"""
+    with sync_session_factory() as db:
+        out = benchmark(_legacy_read, db, seeded[:1])
+    assert out[0][1] == MODELS[:2]
+
+
+def _array_read(db, user_ids):
+    """배열 컬럼: users 1회 조회"""
+    stmt = select(User.user_id, User.allowed_models, User.allowed_services).where(
+        User.user_id.in_(user_ids)
+    )
+    return [tuple(row) for row in db.execute(stmt)]
+
+
+def test_read_single_user_array(benchmark, seeded, sync_session_factory):
+    """GET /user/{user_id}: 배열 컬럼 (쿼리 1회)"""
+    with sync_session_factory() as db:
+        out = benchmark(_array_read, db, seeded[:1])
+    assert out[0][1] == MODELS[:2]
+
+
+def test_read_all_users_tables(benchmark, seeded, sync_session_factory):
+    """GET /users (1000명): 별도 테이블"""
+    with sync_session_factory() as db:
+        out = benchmark(_legacy_read, db, seeded)
+    assert len(out) == USER_COUNT
+
+
+def test_read_all_users_array(benchmark, seeded, sync_session_factory):
+    """GET /users (1000명): 배열 컬럼"""
+    with sync_session_factory() as db:
+        out = benchmark(_array_read, db, seeded)
+    assert len(out) == USER_COUNT
+
+
+def test_write_models_tables(benchmark, seeded, sync_session_factory):
+    """PUT /users/batch (100명 모델 변경): 별도 테이블 행 삭제/삽입"""
+    target = seeded[:UPDATE_COUNT]
+
+    def run(db):
+        pks = db.execute(
+            select(legacy_users.c.id).where(legacy_users.c.user_id.in_(target))
+        ).scalars()
+        for pk in pks:
+            db.execute(delete(legacy_models).where(legacy_models.c.user_id == pk))
+            db.execute(insert(legacy_models), [{"user_id": pk, "model_name": m} for m in MODELS])
+        db.commit()
+
+    with sync_session_factory() as db:
+        benchmark.pedantic(run, args=(db,), rounds=10, warmup_rounds=1)
+
+
+def test_write_models_array(benchmark, seeded, sync_session_factory):
+    """PUT /users/batch (100명 모델 변경): 배열 컬럼 UPDATE 1회"""
+    target = seeded[:UPDATE_COUNT]
+
+    def run(db):
+        db.execute(update(User).where(User.user_id.in_(target)).values(allowed_models=MODELS))
+        db.commit()
+
+    with sync_session_factory() as db:
+        benchmark.pedantic(run, args=(db,), rounds=10, warmup_rounds=1)
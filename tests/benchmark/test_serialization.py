@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from app.main import user_options, user_read_dict, user_to_dict
+from app.models import User
+from app.schemas import UserRead
+
+USER_COUNT = 1000
+MODELS = ["gpt-3.5-turbo", "gpt-4", "gpt-4o"]
+
+user_list_adapter = TypeAdapter(List[UserRead])
+
+
+def _make_users(count: int) -> list[User]:
+    now = datetime.now(timezone.utc)
+    users = []
+    for i in range(count):
+        user = User(
+            id=i + 1,
+            user_id=f"bench-user-{i:07d}",
+            organization=f"bench-org-{i % 50:03d}",
+            key_value=f"sk-bench-{i:024d}",
+            extra_info="benchmark seed",
+            created_at=now,
+            updated_at=now,
+            allowed_models=MODELS[:2],
+            allowed_services=[],
+        )
+        users.append(user)
+    return users
+
+
+@pytest.fixture(scope="module")
+def orm_users():
+    return _make_users(USER_COUNT)
+
+
+@pytest.fixture(scope="module")
+def user_dicts(orm_users):
+    return [user_to_dict(u, u.allowed_models, u.allowed_services) for u in orm_users]
+
+
+@pytest.fixture(scope="module")
+def seeded_users(sync_session_factory):
+    with sync_session_factory() as db:
+        db.execute(delete(User))
+        db.execute(
+            insert(User),
+            [
+                {
+                    "user_id": f"bench-user-{i:07d}",
+                    "organization": f"bench-org-{i % 50:03d}",
+                    "key_value": f"sk-bench-{i:024d}",
+                    "allowed_models": MODELS[:2],
+                }
+                for i in range(USER_COUNT)
+            ],
+        )
+        db.commit()
+    return USER_COUNT
+
+
+def test_user_to_dict(benchmark, orm_users):
+    """GET /users 응답 dict 생성 (1000명)"""
+    out = benchmark(
+        lambda: [user_to_dict(u, u.allowed_models, u.allowed_services) for u in orm_users]
+    )
+    assert len(out) == USER_COUNT
+
+
+def test_user_read_validation(benchmark, user_dicts):
+    """response_model=List[UserRead] 검증 (1000명)"""
+    out = benchmark(user_list_adapter.validate_python, user_dicts)
+    assert len(out) == USER_COUNT
+
+
+def test_user_read_json_dump(benchmark, user_dicts):
+    """검증된 응답의 JSON 직렬화 (1000명)"""
+    validated = user_list_adapter.validate_python(user_dicts)
+    body = benchmark(user_list_adapter.dump_json, validated)
+    assert body.startswith(b"[")
+
+
+def test_list_users_query(benchmark, seeded_users, async_session_factory, event_loop_runner):
+    """GET /users 조회 쿼리 + 응답 dict 변환 (단일 쿼리)"""
+
+    async def run():
+        async with async_session_factory() as db:
+            result = await db.execute(select(User).options(*user_options()))
+            return [user_read_dict(user) for user in result.scalars()]
+
+    users = benchmark.pedantic(lambda: event_loop_runner(run()), rounds=20, warmup_rounds=2)
+    assert len(users) == seeded_users and users[0]["allowed_models"] == MODELS[:2]
@@ -0,0 +1,125 @@
+"""
+PostgreSQL + LiteLLM 시뮬레이터를 사용하는 통합 테스트 공통 fixture
+
+TEST_DB_URL에 테스트 전용 PostgreSQL(psycopg2) URL을 지정한 경우에만 실행됩니다.
+테이블을 매번 비우므로 운영/개발 DB를 지정하지 마세요.
+LiteLLM은 benchmarks.fake_litellm을 임의 포트로 띄워 사용합니다.
+
+    TEST_DB_URL=postgresql+psycopg2://user:pw@localhost/mama_test python -m pytest tests/integration
+"""
+
+import os
+import socket
+import threading
+import time
+
+import pytest
+import pytest_asyncio
+import uvicorn
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+# app.main은 import 시 정적 파일 디렉토리를 mount 하므로 빌드 결과가 없어도 import 되도록 합니다.
+os.makedirs(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "dist"), exist_ok=True)
+
+from app.litellm_service import LiteLLMService
+from app.models import Admin, Base
+from benchmarks import fake_litellm
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "integration: PostgreSQL/LiteLLM이 필요한 통합 테스트")
+
+
+@pytest.fixture(scope="session")
+def db_url():
+    url = os.getenv("TEST_DB_URL")
+    if not url:
+        pytest.skip("TEST_DB_URL이 없어 PostgreSQL 통합 테스트를 skip합니다.")
+    return url
+
+
+@pytest.fixture(scope="session")
+def sync_engine(db_url):
+    engine = create_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def clean_db(sync_engine):
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with sync_engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    return sync_engine
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_url, clean_db):
+    engine = create_async_engine(db_url.replace("postgresql+psycopg2", "postgresql+asyncpg"))
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def api_client(db_url, clean_db, monkeypatch):
+    """
+    테스트 DB를 사용하는 TestClient (lifespan의 백그라운드 작업은 시작하지 않음)
+    TestClient는 별도 이벤트 루프에서 실행되므로 연결을 재사용하지 않는 엔진을 사용합니다.
+    """
+    from app import main
+
+    monkeypatch.setattr(main, "SyncSessionLocal", sessionmaker(bind=clean_db))  # 이벤트 로그
+
+    engine = create_async_engine(
+        db_url.replace("postgresql+psycopg2", "postgresql+asyncpg"), poolclass=NullPool
+    )
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_test_db():
+        async with factory() as db:
+            yield db
+
+    main.app.dependency_overrides.update(
+        {
+            main.get_db: get_test_db,
+            main.get_read_db: get_test_db,
+            main.get_current_admin: lambda: Admin(username="admin", is_super_admin=True),
+        }
+    )
+    yield TestClient(main.app, headers={"x-api-key": main.SERVER_API_KEY})
+    main.app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def fake_litellm_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(fake_litellm.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def litellm(fake_litellm_url):
+    """매 테스트마다 비워진 시뮬레이터에 연결된 LiteLLMService"""
+    fake_litellm.store.clear()
+    service = LiteLLMService(fake_litellm_url, fake_litellm.MASTER_KEY)
+    service.retry_delay = 0
+    return service
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.audit_rollup import EventLogRollupWorker
+from app.models import EventLog, EventLogRollup
+
+
+def add_log(conn, event_type: str):
+    conn.execute(EventLog.__table__.insert().values(event_type=event_type, result="SUCCESS"))
+
+
+async def rolled_up(session_factory) -> int:
+    async with session_factory() as db:
+        return await db.scalar(
+            select(func.coalesce(func.sum(EventLogRollup.count), 0)).where(
+                EventLogRollup.period == "day"
+            )
+        )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_rollup_waits_for_late_commit(session_factory, clean_db):
+    worker = EventLogRollupWorker(session_factory, lag_seconds=0)
+    with clean_db.connect() as late:
+        add_log(late, "LATE")  # id 1, 아직 커밋하지 않음
+        with clean_db.begin() as conn:
+            add_log(conn, "ON_TIME")  # id 2
+
+        # id 1이 커밋될 수 있으므로 id 2를 집계하지 않습니다.
+        assert await worker.rollup_once() == 0
+        late.commit()
+
+    assert await worker.rollup_once() == 2
+    assert await rolled_up(session_factory) == 2
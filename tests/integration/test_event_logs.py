@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models import EventLog
+
+
+@pytest.fixture
+def event_logs(clean_db):
+    now = datetime.now(timezone.utc)
+    with sessionmaker(bind=clean_db)() as db:
+        db.add_all(
+            [
+                EventLog(
+                    event_type="USER_CREATE",
+                    result="SUCCESS",
+                    user_id="alice",
+                    payload={"user_ids": ["alice"], "models": ["gpt-4"]},
+                    created_at=now - timedelta(minutes=3),
+                ),
+                EventLog(
+                    event_type="USER_BATCH_UPDATE",
+                    result="SUCCESS",
+                    user_id="alice",
+                    payload={
+                        "user_ids": ["alice", "bob"],
+                        "count": 2,
+                        "models": ["gpt-4", "gpt-3"],
+                        "organization": "dev",
+                        "job_id": "job-1",
+                    },
+                    created_at=now - timedelta(minutes=2),
+                ),
+                EventLog(
+                    event_type="USER_DELETE",
+                    result="SUCCESS",
+                    user_id="carol",
+                    payload={"user_ids": ["carol"]},
+                    created_at=now - timedelta(minutes=1),
+                ),
+                EventLog(event_type="ADMIN_LOGIN", result="SUCCESS", created_at=now),
+            ]
+        )
+        db.commit()
+
+
+def event_types(resp) -> list:
+    assert resp.status_code == 200
+    return [log["event_type"] for log in resp.json()]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        # 배치 이벤트의 대표 사용자가 아니어도 영향받은 사용자로 조회됩니다.
+        ({"affected_user_id": "bob"}, ["USER_BATCH_UPDATE"]),
+        ({"affected_user_id": "alice"}, ["USER_BATCH_UPDATE", "USER_CREATE"]),
+        ({"model": "gpt-4"}, ["USER_BATCH_UPDATE", "USER_CREATE"]),
+        ({"model": "gpt-3"}, ["USER_BATCH_UPDATE"]),
+        ({"job_id": "job-1"}, ["USER_BATCH_UPDATE"]),
+        ({"affected_user_id": "alice", "model": "gpt-3"}, ["USER_BATCH_UPDATE"]),
+        ({"affected_user_id": "carol", "model": "gpt-4"}, []),
+        ({"payload": json.dumps({"organization": "dev", "count": 2})}, ["USER_BATCH_UPDATE"]),
+        ({"payload": json.dumps({"user_ids": ["carol"]})}, ["USER_DELETE"]),
+        ({"payload": "{}"}, ["ADMIN_LOGIN", "USER_DELETE", "USER_BATCH_UPDATE", "USER_CREATE"]),
+    ],
+)
+def test_event_logs_payload_filters(api_client, event_logs, params, expected):
+    assert event_types(api_client.get("/event-logs", params=params)) == expected
+
+
+@pytest.mark.integration
+def test_event_logs_payload_filter_combines_with_columns(api_client, event_logs):
+    resp = api_client.get(
+        "/event-logs", params={"affected_user_id": "alice", "event_type": "USER_CREATE"}
+    )
+
+    assert event_types(resp) == ["USER_CREATE"]
+    assert resp.json()[0]["payload"] == {"user_ids": ["alice"], "models": ["gpt-4"]}
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("payload", ["not-json", "[1, 2]", '"alice"', "null"])
+def test_event_logs_rejects_non_object_payload(api_client, event_logs, payload):
+    resp = api_client.get("/event-logs", params={"payload": payload})
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "payload must be a JSON object"
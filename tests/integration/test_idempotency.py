@@ -0,0 +1,77 @@
+import pytest
+
+from app.idempotency import (
+    CLAIMED,
+    IN_PROGRESS,
+    MISMATCH,
+    REPLAY,
+    IdempotencyStore,
+    request_fingerprint,
+)
+
+BODY = b'{"user_id": "alice"}'
+FINGERPRINT = request_fingerprint("POST", "/users", "", BODY)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_completed_key_replays_stored_response(session_factory):
+    store = IdempotencyStore(session_factory)
+    assert await store.claim("admin", "k1", FINGERPRINT) == (CLAIMED, None)
+
+    await store.complete("admin", "k1", 201, '{"user_id": "alice"}', "application/json")
+    result, record = await store.claim("admin", "k1", FINGERPRINT)
+
+    assert result == REPLAY
+    assert (record.response_status, record.response_body, record.response_media_type) == (
+        201,
+        '{"user_id": "alice"}',
+        "application/json",
+    )
+    # 다른 요청자의 같은 키는 별개로 처리합니다.
+    assert (await store.claim("other-admin", "k1", FINGERPRINT))[0] == CLAIMED
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_same_key_with_different_request_is_mismatch(session_factory):
+    store = IdempotencyStore(session_factory)
+    await store.claim("admin", "k1", FINGERPRINT)
+    await store.complete("admin", "k1", 201, "{}", "application/json")
+
+    other_body = request_fingerprint("POST", "/users", "", b'{"user_id": "bob"}')
+    other_path = request_fingerprint("PUT", "/users/batch", "", BODY)
+
+    assert (await store.claim("admin", "k1", other_body))[0] == MISMATCH
+    assert (await store.claim("admin", "k1", other_path))[0] == MISMATCH
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_in_progress_key_is_not_reclaimed_until_lock_expires(session_factory):
+    store = IdempotencyStore(session_factory)
+    await store.claim("admin", "k1", FINGERPRINT)
+
+    # 처리 중인 키는 fingerprint가 달라도 IN_PROGRESS로 응답합니다.
+    assert (await store.claim("admin", "k1", FINGERPRINT))[0] == IN_PROGRESS
+    assert (await store.claim("admin", "k1", "other"))[0] == IN_PROGRESS
+
+    # lease가 끝난(처리 중 중단된) 기록은 새 요청이 가져갑니다.
+    expired = IdempotencyStore(session_factory, lock_seconds=-1)
+    await expired.claim("admin", "k2", FINGERPRINT)
+    assert await expired.claim("admin", "k2", FINGERPRINT) == (CLAIMED, None)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_released_key_can_run_again(session_factory):
+    store = IdempotencyStore(session_factory)
+    await store.claim("admin", "k1", FINGERPRINT)
+
+    await store.release("admin", "k1")
+
+    assert await store.claim("admin", "k1", FINGERPRINT) == (CLAIMED, None)
+    # 완료된 기록은 release로 지워지지 않습니다.
+    await store.complete("admin", "k1", 200, "{}", "application/json")
+    await store.release("admin", "k1")
+    assert (await store.claim("admin", "k1", FINGERPRINT))[0] == REPLAY
@@ -0,0 +1,324 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.config import LITELLM_USER_ID
+from app.jobs import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    ITEM_FAILURE,
+    ITEM_SUCCESS,
+    PENDING,
+    RUNNING,
+    USER_BATCH_DELETE,
+    USER_IMPORT,
+    USER_KEY_ROTATE,
+    JobRunner,
+    rotation_key_alias,
+)
+from app.models import Job, JobItem, LiteLLMOutbox, User
+from app.outbox import DELETE_KEY, OutboxDispatcher
+from app.reconcile import Reconciler
+from benchmarks import fake_litellm
+
+
+async def run_job(runner: JobRunner, job_type: str, params: dict) -> Job:
+    job = await runner.create_job(job_type, "admin", params)
+    assert await runner._claim(job.id)
+    await runner._execute(job.id)
+    async with runner.session_factory() as db:
+        return await db.get(Job, job.id)
+
+
+async def job_items(session_factory, job_id: str) -> list:
+    async with session_factory() as db:
+        result = await db.execute(
+            select(JobItem.item_no, JobItem.user_id, JobItem.status, JobItem.detail)
+            .where(JobItem.job_id == job_id)
+            .order_by(JobItem.item_no)
+        )
+        return result.all()
+
+
+async def add_user(session_factory, user_id: str, key: str):
+    async with session_factory() as db:
+        db.add(User(user_id=user_id, key_value=key, allowed_models=[]))
+        await db.commit()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_import_jsonl_error_rows(session_factory, litellm, tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text(
+        "\n".join(['{"user_id": "alice"}', "123", "[1]", '{"user_id": 5}', "{oops"]) + "\n"
+    )
+    runner = JobRunner(session_factory, litellm)
+
+    job = await run_job(runner, USER_IMPORT, {"path": str(path), "format": "jsonl"})
+
+    assert (job.status, job.total, job.succeeded, job.failed) == (COMPLETED, 5, 2, 3)
+    items = await job_items(session_factory, job.id)
+    assert [(no, user_id, status) for no, user_id, status, _ in items] == [
+        (1, "alice", ITEM_SUCCESS),
+        (2, None, ITEM_FAILURE),
+        (3, None, ITEM_FAILURE),
+        (4, "5", ITEM_SUCCESS),
+        (5, None, ITEM_FAILURE),
+    ]
+    assert "JSON object" in items[1].detail
+    assert not path.exists()  # 완료된 import의 업로드 파일은 바로 삭제
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_purge_job_files_after_retention(session_factory, litellm, tmp_path):
+    runner = JobRunner(
+        session_factory, litellm, files_dir=str(tmp_path), files_retention_seconds=60
+    )
+    old = datetime.now(timezone.utc) - timedelta(minutes=2)
+    jobs = {
+        "completed": (COMPLETED, datetime.now(timezone.utc)),
+        "failed-old": (FAILED, old),
+        "failed-recent": (FAILED, datetime.now(timezone.utc)),
+        "cancelled-old": (CANCELLED, old),
+        "pending": (PENDING, None),
+    }
+    async with session_factory() as db:
+        for job_id, (status, finished_at) in jobs.items():
+            path = str(tmp_path / f"{job_id}.csv")
+            db.add(
+                Job(
+                    id=job_id,
+                    job_type=USER_IMPORT,
+                    status=status,
+                    params={"path": path, "format": "csv"},
+                    finished_at=finished_at,
+                )
+            )
+        await db.commit()
+    for name in [*jobs, "orphan-old", "orphan-recent"]:
+        (tmp_path / f"{name}.csv").write_text("user_id\nalice\n")
+    os.utime(tmp_path / "orphan-old.csv", (old.timestamp(), old.timestamp()))
+
+    assert await runner.purge_job_files() == 4
+
+    assert sorted(os.listdir(tmp_path)) == ["failed-recent.csv", "orphan-recent.csv", "pending.csv"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_import_retries_until_no_user_id_conflict(
+    session_factory, litellm, tmp_path, monkeypatch
+):
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"user_id": "a"}\n{"user_id": "b"}\n{"user_id": "c"}\n')
+    runner = JobRunner(session_factory, litellm)
+    store_chunk = runner._store_chunk
+    calls = []
+
+    async def store_with_concurrent_creates(*args, **kwargs):
+        # 저장할 때마다 다른 요청이 같은 user_id를 먼저 생성한 경우
+        calls.append(1)
+        if len(calls) <= 2:
+            await add_user(session_factory, "ab"[len(calls) - 1], f"sk-other-{len(calls)}")
+        return await store_chunk(*args, **kwargs)
+
+    monkeypatch.setattr(runner, "_store_chunk", store_with_concurrent_creates)
+    job = await run_job(runner, USER_IMPORT, {"path": str(path), "format": "jsonl"})
+
+    assert len(calls) == 3
+    assert (job.status, job.succeeded, job.failed) == (COMPLETED, 1, 2)
+    async with session_factory() as db:
+        c_key = await db.scalar(select(User.key_value).where(User.user_id == "c"))
+        discarded = set(
+            (
+                await db.execute(
+                    select(LiteLLMOutbox.key_value).where(LiteLLMOutbox.operation == DELETE_KEY)
+                )
+            ).scalars()
+        )
+    # 충돌한 행에서 생성한 key는 모두 outbox로 삭제 예약됩니다.
+    assert discarded == set(fake_litellm.store.keys) - {c_key}
+    assert len(discarded) == 2
+
+
+async def user_ids(session_factory) -> list:
+    async with session_factory() as db:
+        return list((await db.execute(select(User.user_id).order_by(User.user_id))).scalars())
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_stale_worker_chunk_rolled_back_after_takeover(session_factory, litellm):
+    await add_user(session_factory, "a", "sk-a")
+    await add_user(session_factory, "b", "sk-b")
+    stale, current = JobRunner(session_factory, litellm), JobRunner(session_factory, litellm)
+    job = await stale.create_job(USER_BATCH_DELETE, "admin", {"user_ids": ["a", "b"]})
+    assert await stale._claim(job.id)
+    assert not await current._claim(job.id)
+
+    # 이전 워커가 멈춰 lease가 만료된 뒤 다른 워커가 가져간 경우
+    async with session_factory() as db:
+        await db.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1))
+        )
+        await db.commit()
+    assert await current._claim(job.id)
+
+    await stale._execute(job.id)
+
+    async with session_factory() as db:
+        assert (await db.get(Job, job.id)).status == RUNNING
+        assert (await db.execute(select(LiteLLMOutbox))).first() is None
+    assert await user_ids(session_factory) == ["a", "b"]
+    assert await job_items(session_factory, job.id) == []
+
+    await current._execute(job.id)
+
+    async with session_factory() as db:
+        assert (await db.get(Job, job.id)).status == COMPLETED
+    assert await user_ids(session_factory) == []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_lease_while_chunk_runs(session_factory, litellm, monkeypatch):
+    await add_user(session_factory, "a", "sk-a")
+    runner = JobRunner(session_factory, litellm, lease_seconds=1)
+    other = JobRunner(session_factory, litellm, lease_seconds=1)
+    record_chunk = runner._record_chunk
+
+    async def slow_record_chunk(*args):
+        await asyncio.sleep(1.5)  # lease_seconds보다 오래 걸리는 청크
+        await record_chunk(*args)
+
+    monkeypatch.setattr(runner, "_record_chunk", slow_record_chunk)
+    job = await runner.create_job(USER_BATCH_DELETE, "admin", {"user_ids": ["a"]})
+    assert await runner._claim(job.id)
+    task = asyncio.create_task(runner._execute(job.id))
+
+    await asyncio.sleep(1.2)
+    assert not await other._claim(job.id)
+    await task
+
+    async with session_factory() as db:
+        assert (await db.get(Job, job.id)).status == COMPLETED
+    assert await user_ids(session_factory) == []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_cancel_after_running_chunk(session_factory, litellm, monkeypatch):
+    monkeypatch.setattr("app.jobs.JOB_CHUNK_SIZE", 1)
+    await add_user(session_factory, "a", "sk-a")
+    await add_user(session_factory, "b", "sk-b")
+    runner = JobRunner(session_factory, litellm)
+    record_chunk = runner._record_chunk
+
+    async def cancel_during_chunk(db, job_id, *args):
+        await runner.cancel(job_id)
+        await record_chunk(db, job_id, *args)
+
+    monkeypatch.setattr(runner, "_record_chunk", cancel_during_chunk)
+    job = await run_job(runner, USER_BATCH_DELETE, {"user_ids": ["a", "b"]})
+
+    # 처리 중이던 청크까지 반영한 뒤 종료합니다.
+    assert (job.status, job.processed) == (CANCELLED, 1)
+    assert await user_ids(session_factory) == ["b"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_key_rotation_keeps_aliases_unique(session_factory, litellm, tmp_path):
+    old_key = await litellm.generate_key(models=[], user_id=LITELLM_USER_ID, key_alias="alice")
+    fake_litellm.store.keys[old_key]["created_at"] = "2020-01-01T00:00:00+00:00"
+    await add_user(session_factory, "alice", old_key)
+    runner = JobRunner(session_factory, litellm)
+
+    job = await run_job(
+        runner, USER_KEY_ROTATE, {"user_ids": ["alice"], "grace_period_seconds": 3600}
+    )
+
+    assert (job.status, job.succeeded) == (COMPLETED, 1)
+    async with session_factory() as db:
+        new_key = await db.scalar(select(User.key_value).where(User.user_id == "alice"))
+    # 유예 기간 동안 이전 key가 alias를 유지하고, 새 key는 임시 alias를 사용합니다.
+    assert fake_litellm.store.keys[old_key]["key_alias"] == "alice"
+    assert fake_litellm.store.keys[new_key]["key_alias"] == rotation_key_alias("alice", job.id)
+
+    # 유예 기간 중인 이전 key는 reconcile에서 orphan으로 삭제하지 않습니다.
+    reconciler = Reconciler(
+        session_factory, litellm, checkpoint_path=str(tmp_path / "reconcile.json")
+    )
+    state = await reconciler.run(repair=True)
+    assert state["counts"]["orphan_key"] == 0
+    assert old_key in fake_litellm.store.keys
+
+    # 유예 기간이 지나면 이전 key를 삭제하고 새 key의 alias를 user_id로 되돌립니다.
+    async with session_factory() as db:
+        await db.execute(update(LiteLLMOutbox).values(available_at=datetime.now(timezone.utc)))
+        await db.commit()
+    dispatcher = OutboxDispatcher(session_factory, litellm)
+    while await dispatcher.drain_once():
+        pass
+    assert set(fake_litellm.store.keys) == {new_key}
+    assert fake_litellm.store.keys[new_key]["key_alias"] == "alice"
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_rotated_alias_restored_only_after_old_key_deleted(
+    session_factory, litellm, monkeypatch
+):
+    old_key = await litellm.generate_key(models=[], user_id=LITELLM_USER_ID, key_alias="alice")
+    await add_user(session_factory, "alice", old_key)
+    runner = JobRunner(session_factory, litellm)
+    job = await run_job(
+        runner, USER_KEY_ROTATE, {"user_ids": ["alice"], "grace_period_seconds": 3600}
+    )
+    async with session_factory() as db:
+        new_key = await db.scalar(select(User.key_value).where(User.user_id == "alice"))
+        await db.execute(update(LiteLLMOutbox).values(available_at=datetime.now(timezone.utc)))
+        await db.commit()
+
+    async def unavailable(*args):
+        raise RuntimeError("LiteLLM timeout")
+
+    delete_keys, delete_key = litellm.delete_keys, litellm.delete_key
+    monkeypatch.setattr(litellm, "delete_keys", unavailable)
+    monkeypatch.setattr(litellm, "delete_key", unavailable)
+    dispatcher = OutboxDispatcher(session_factory, litellm)
+    await dispatcher.drain_once()
+
+    # 이전 key 삭제가 실패하는 동안 새 key는 임시 alias를 유지합니다.
+    assert fake_litellm.store.keys[old_key]["key_alias"] == "alice"
+    assert fake_litellm.store.keys[new_key]["key_alias"] == rotation_key_alias("alice", job.id)
+
+    monkeypatch.setattr(litellm, "delete_keys", delete_keys)
+    monkeypatch.setattr(litellm, "delete_key", delete_key)
+    while await dispatcher.drain_once():
+        pass
+
+    assert set(fake_litellm.store.keys) == {new_key}
+    assert fake_litellm.store.keys[new_key]["key_alias"] == "alice"
+    async with session_factory() as db:
+        result = await db.execute(
+            select(
+                LiteLLMOutbox.key_value,
+                LiteLLMOutbox.operation,
+                LiteLLMOutbox.status,
+                LiteLLMOutbox.attempts,
+            ).order_by(LiteLLMOutbox.id)
+        )
+        # alias 변경은 삭제 성공 후 기록되어 중복 alias 오류 없이 한 번에 반영됩니다.
+        assert result.all() == [
+            (old_key, DELETE_KEY, "DONE", 2),
+            (new_key, "UPDATE_ALIAS", "DONE", 1),
+        ]
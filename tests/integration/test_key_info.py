@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.models import EventLog, User
+
+REQUEST_IDS = ["u3", "u1", "missing-1", "missing-2", "u5", "u1", "u2", "u4"]
+EXPECTED = [
+    {"user_id": user_id, "user_key": f"sk-{user_id}"} for user_id in ["u3", "u1", "u5", "u2", "u4"]
+]
+
+
+@pytest.fixture
+def users(clean_db):
+    with sessionmaker(bind=clean_db)() as db:
+        db.add_all(
+            [User(user_id=f"u{i}", key_value=f"sk-u{i}", allowed_models=[]) for i in range(1, 6)]
+        )
+        db.commit()
+
+
+def key_info_logs(clean_db) -> list:
+    with sessionmaker(bind=clean_db)() as db:
+        return list(
+            db.scalars(select(EventLog).where(EventLog.event_type == "GET_KEYS_INFO")).all()
+        )
+
+
+@pytest.mark.integration
+def test_single_chunk_response_in_request_order(api_client, users):
+    resp = api_client.post("/key/info", json={"user_ids": REQUEST_IDS})
+
+    assert resp.status_code == 200
+    assert resp.json() == EXPECTED
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_streamed_chunks_match_single_chunk_response(
+    api_client, users, clean_db, monkeypatch, chunk_size
+):
+    monkeypatch.setattr(main, "KEY_INFO_CHUNK_SIZE", chunk_size)
+
+    resp = api_client.post("/key/info", json={"user_ids": REQUEST_IDS})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    # 찾지 못한 사용자만 있는 청크가 있어도 올바른 JSON 배열입니다.
+    assert json.loads(resp.text) == EXPECTED
+    (log,) = key_info_logs(clean_db)
+    assert log.result == "SUCCESS"
+    assert log.payload["count"] == 7 and log.payload["found"] == 5
+
+
+@pytest.mark.integration
+def test_streamed_audit_log_summarizes_many_ids(api_client, users, clean_db, monkeypatch):
+    monkeypatch.setattr(main, "KEY_INFO_CHUNK_SIZE", 2)
+    user_ids = REQUEST_IDS + [f"other-{i}" for i in range(main.KEY_INFO_AUDIT_MAX_IDS)]
+    unique_ids = list(dict.fromkeys(user_ids))
+
+    api_client.post("/key/info", json={"user_ids": user_ids})
+
+    (log,) = key_info_logs(clean_db)
+    # id 목록 대신 개수와 digest만 남깁니다. (user_ids는 대표 사용자 user_id)
+    assert log.payload == {
+        "user_ids": ["u3"],
+        "ids_sha256": main.ids_digest(unique_ids),
+        "count": len(unique_ids),
+        "found": 5,
+    }
+    assert log.event_detail == (
+        f"Keys info retrieved for 5 users: {unique_ids[: main.KEY_INFO_AUDIT_MAX_IDS]} ... "
+        f"({len(unique_ids)} ids, sha256:{main.ids_digest(unique_ids)})"
+    )
+
+
+@pytest.mark.integration
+def test_audit_log_keeps_few_ids(api_client, users, clean_db):
+    api_client.post("/key/info", json={"user_ids": ["u2", "u1"]})
+
+    (log,) = key_info_logs(clean_db)
+    assert log.payload == {"user_ids": ["u2", "u1"], "count": 2, "found": 2}
+    assert log.event_detail == "Keys info retrieved for 2 users: ['u2', 'u1']"
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.jobs import COMPLETED, USER_KEY_ROTATE, JobRunner
+from app.key_lookup import KeyLookupCache
+from app.models import Job, User
+
+ALICE = {"user_id": "alice", "organization": "dev"}
+BOB = {"user_id": "bob", "organization": None}
+NOT_FOUND = {"user_id": None, "organization": None}
+
+
+@pytest.fixture
+def lookup_cache(monkeypatch):
+    cache = KeyLookupCache(max_size=100, ttl=60)
+    monkeypatch.setattr(main, "key_lookup_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def users(clean_db):
+    with sessionmaker(bind=clean_db)() as db:
+        db.add_all(
+            [
+                User(user_id="alice", organization="dev", key_value="sk-alice", allowed_models=[]),
+                User(user_id="bob", organization=None, key_value="sk-bob", allowed_models=[]),
+            ]
+        )
+        db.commit()
+
+
+def lookup(api_client, *keys):
+    resp = api_client.post("/key/lookup", json={"keys": list(keys)})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.integration
+def test_lookup_after_batch_delete(api_client, users, lookup_cache):
+    assert lookup(api_client, "sk-alice", "sk-bob", "sk-none") == [ALICE, BOB, NOT_FOUND]
+    assert len(lookup_cache) == 2
+
+    resp = api_client.request("DELETE", "/users/batch", json={"user_ids": ["alice"]})
+    assert resp.status_code == 200
+
+    assert lookup(api_client, "sk-alice", "sk-bob") == [NOT_FOUND, BOB]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_lookup_after_key_rotation(api_client, users, lookup_cache, session_factory, litellm):
+    assert lookup(api_client, "sk-alice") == [ALICE]
+    runner = JobRunner(session_factory, litellm, on_keys_removed=lookup_cache.invalidate)
+    job = await runner.create_job(USER_KEY_ROTATE, "admin", {"user_ids": ["alice"]}, total=1)
+    assert await runner._claim(job.id)
+    await runner._execute(job.id)
+
+    async with session_factory() as db:
+        assert (await db.get(Job, job.id)).status == COMPLETED
+        new_key = (await db.get(User, 1)).key_value
+    # 이전 key는 유예 기간 동안 LiteLLM에서 유효하지만 더 이상 사용자의 key로 조회되지 않습니다.
+    assert lookup(api_client, "sk-alice", new_key) == [NOT_FOUND, ALICE]
@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.jobs import COMPLETED, JobRunner
+from app.models import Job, LiteLLMOutbox, ModelProfile, User
+from app.outbox import UPDATE_MODELS
+
+
+@pytest.fixture
+def profile_users(clean_db):
+    with sessionmaker(bind=clean_db)() as db:
+        profile = ModelProfile(name="basic", models=["gpt-4"])
+        db.add_all(
+            [
+                profile,
+                ModelProfile(name="unused", models=["gpt-3"]),
+                User(user_id="alice", key_value="sk-a", model_profile=profile, allowed_models=[]),
+                User(user_id="bob", key_value="sk-b", model_profile=profile, allowed_models=[]),
+                User(user_id="carol", key_value="sk-c", allowed_models=["gpt-3"]),
+            ]
+        )
+        db.commit()
+
+
+def outbox_rows(clean_db) -> list:
+    with sessionmaker(bind=clean_db)() as db:
+        result = db.execute(
+            select(
+                LiteLLMOutbox.key_value, LiteLLMOutbox.operation, LiteLLMOutbox.payload
+            ).order_by(LiteLLMOutbox.key_value, LiteLLMOutbox.id)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.integration
+def test_profile_crud(api_client, profile_users):
+    resp = api_client.post("/model-profiles", json={"name": "pro", "models": ["gpt-4", "o1"]})
+    assert resp.status_code == 201
+    assert (resp.json()["models"], resp.json()["user_count"]) == (["gpt-4", "o1"], 0)
+    assert api_client.post("/model-profiles", json={"name": "pro"}).status_code == 400
+
+    resp = api_client.get("/model-profiles")
+    assert resp.status_code == 200
+    assert [(p["name"], p["user_count"]) for p in resp.json()] == [
+        ("basic", 2),
+        ("pro", 0),
+        ("unused", 0),
+    ]
+    assert api_client.get("/model-profiles/missing").status_code == 404
+
+    # 사용 중인 프로필은 삭제하지 않습니다.
+    resp = api_client.delete("/model-profiles/basic")
+    assert resp.status_code == 409
+    assert api_client.delete("/model-profiles/unused").status_code == 200
+    assert api_client.get("/model-profiles/unused").status_code == 404
+
+
+@pytest.mark.integration
+def test_assign_and_detach_profile(api_client, profile_users, clean_db):
+    resp = api_client.put("/user/carol", json={"model_profile": "basic"})
+    assert resp.status_code == 200
+    assert (resp.json()["model_profile"], resp.json()["allowed_models"]) == ("basic", ["gpt-4"])
+
+    # 프로필 해제 시 현재 프로필 모델을 개별 모델로 유지합니다.
+    resp = api_client.put("/user/alice", json={"model_profile": ""})
+    assert resp.status_code == 200
+    assert (resp.json()["model_profile"], resp.json()["allowed_models"]) == (None, ["gpt-4"])
+
+    assert api_client.put("/user/bob", json={"model_profile": "missing"}).status_code == 400
+    assert outbox_rows(clean_db) == [("sk-c", UPDATE_MODELS, {"models": ["gpt-4"]})]
+    assert api_client.get("/model-profiles/basic").json()["user_count"] == 2
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_profile_update_syncs_profile_users(
+    api_client, profile_users, clean_db, session_factory, db_url, monkeypatch
+):
+    from app import main
+
+    # TestClient는 별도 이벤트 루프에서 실행되므로 연결을 재사용하지 않는 엔진으로 작업을 등록합니다.
+    engine = create_async_engine(
+        db_url.replace("postgresql+psycopg2", "postgresql+asyncpg"), poolclass=NullPool
+    )
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(main, "job_runner", JobRunner(factory))
+
+    resp = api_client.put("/model-profiles/basic", json={"models": ["gpt-4o"]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["models"], body["user_count"]) == (["gpt-4o"], 2)
+    job_id = body["sync_job_id"]
+    assert job_id is not None
+    # 프로필 한 행만 변경하고 LiteLLM 반영은 작업이 처리합니다.
+    assert outbox_rows(clean_db) == []
+
+    runner = JobRunner(session_factory)
+    assert await runner._claim(job_id)
+    await runner._execute(job_id)
+    await engine.dispose()
+
+    async with session_factory() as db:
+        job = await db.get(Job, job_id)
+    assert (job.status, job.processed, job.succeeded) == (COMPLETED, 2, 2)
+    assert outbox_rows(clean_db) == [
+        ("sk-a", UPDATE_MODELS, {"models": ["gpt-4o"]}),
+        ("sk-b", UPDATE_MODELS, {"models": ["gpt-4o"]}),
+    ]
+
+    # 모델이 그대로이면 작업을 만들지 않습니다.
+    resp = api_client.put("/model-profiles/basic", json={"models": ["gpt-4o"], "description": "d"})
+    assert (resp.json()["sync_job_id"], resp.json()["description"]) == (None, "d")
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models import ModelProfile, User
+
+
+@pytest.fixture
+def model_users(clean_db):
+    with sessionmaker(bind=clean_db)() as db:
+        profile = ModelProfile(name="basic", models=["gpt-4"])
+        db.add_all(
+            [
+                profile,
+                User(
+                    user_id="alice", organization="dev", key_value="sk-a", allowed_models=["gpt-4"]
+                ),
+                User(user_id="bob", organization=None, key_value="sk-b", allowed_models=["gpt-4"]),
+                User(user_id="carol", organization="", key_value="sk-c", model_profile=profile),
+                User(user_id="dave", organization=None, key_value="sk-d", allowed_models=["gpt-3"]),
+            ]
+        )
+        db.commit()
+
+
+@pytest.mark.integration
+def test_model_users_counts_null_organization(api_client, model_users):
+    resp = api_client.get("/models/gpt-4/users")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["total"], body["direct_count"], body["profile_count"]) == (3, 2, 1)
+    assert body["organizations"] == {"dev": 1, "": 2}
+    assert body["users"] == [
+        {"user_id": "alice", "organization": "dev", "model_profile": None},
+        {"user_id": "bob", "organization": None, "model_profile": None},
+        {"user_id": "carol", "organization": "", "model_profile": "basic"},
+    ]
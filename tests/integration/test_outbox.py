@@ -0,0 +1,121 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import select
+
+from app.models import LiteLLMOutbox
+from app.outbox import (
+    DONE,
+    PENDING,
+    SUPERSEDED,
+    UPDATE_ALIAS,
+    UPDATE_MODELS,
+    OutboxDispatcher,
+    enqueue,
+)
+from benchmarks import fake_litellm
+
+
+async def enqueue_models(session_factory, key: str, models: list):
+    async with session_factory() as db:
+        await enqueue(db, UPDATE_MODELS, key, {"models": models})
+        await db.commit()
+
+
+async def statuses(session_factory) -> list:
+    async with session_factory() as db:
+        result = await db.execute(
+            select(LiteLLMOutbox.status, LiteLLMOutbox.leased_at).order_by(LiteLLMOutbox.id)
+        )
+        return [(status, leased_at is not None) for status, leased_at in result.all()]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_row_superseded_while_sending_is_not_retried(session_factory, litellm, monkeypatch):
+    fake_litellm.store.put("sk-a", {"models": [], "user_id": None, "key_alias": None})
+    await enqueue_models(session_factory, "sk-a", ["old"])
+    dispatcher = OutboxDispatcher(session_factory, litellm)
+    update_key_models = litellm.update_key_models
+
+    async def fail_after_newer_enqueued(key, models):
+        await enqueue_models(session_factory, key, ["new"])
+        raise RuntimeError("LiteLLM timeout")
+
+    monkeypatch.setattr(litellm, "update_key_models", fail_after_newer_enqueued)
+    await dispatcher.drain_once()
+
+    # 실패한 이전 항목은 재시도 대기(PENDING)로 되돌아가지 않습니다.
+    assert await statuses(session_factory) == [(SUPERSEDED, False), (PENDING, False)]
+
+    monkeypatch.setattr(litellm, "update_key_models", update_key_models)
+    assert await dispatcher.drain_once() == 1
+    assert await statuses(session_factory) == [(SUPERSEDED, False), (DONE, False)]
+    assert fake_litellm.store.keys["sk-a"]["models"] == ["new"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_same_key_waits_for_in_flight_row(session_factory, litellm):
+    await enqueue_models(session_factory, "sk-a", ["old"])
+    first, second = OutboxDispatcher(session_factory, litellm), OutboxDispatcher(
+        session_factory, litellm
+    )
+    in_flight = await first._claim()
+    await enqueue_models(session_factory, "sk-a", ["new"])
+    await enqueue_models(session_factory, "sk-b", ["other"])
+
+    # 다른 워커는 전송 중인 key의 이후 항목을 가져가지 않습니다.
+    assert [row.key_value for row in await second._claim()] == ["sk-b"]
+
+    await first._finish(in_flight, {row.id: (DONE, None) for row in in_flight})
+    claimed = await second._claim()
+    assert [(row.key_value, row.payload) for row in claimed] == [("sk-a", {"models": ["new"]})]
+    assert first.stats[SUPERSEDED] == 1
+
+
+def held_before_commit(session_factory, gate: asyncio.Event):
+    """commit 직전에 gate가 열릴 때까지 트랜잭션을 유지하는 session factory"""
+
+    @asynccontextmanager
+    async def factory():
+        async with session_factory() as db:
+            commit = db.commit
+
+            async def wait_then_commit():
+                await gate.wait()
+                await commit()
+
+            db.commit = wait_then_commit
+            yield db
+
+    return factory
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_concurrent_claims_do_not_split_a_key(session_factory, litellm):
+    await enqueue_models(session_factory, "sk-a", ["first"])
+    await enqueue_models(session_factory, "sk-b", ["other"])
+    async with session_factory() as db:
+        # 서로 대체(SUPERSEDED)하지 않는 같은 key의 이후 항목
+        await enqueue(db, UPDATE_ALIAS, "sk-a", {"key_alias": "alice"})
+        await db.commit()
+    gate = asyncio.Event()
+    first = OutboxDispatcher(held_before_commit(session_factory, gate), litellm, batch_size=1)
+    second = OutboxDispatcher(session_factory, litellm)
+
+    # 첫 번째 워커가 sk-a의 첫 항목을 가져가는 중(commit 전)입니다.
+    first_claim = asyncio.create_task(first._claim())
+    await asyncio.sleep(0.2)
+    try:
+        # lease가 아직 보이지 않아도 같은 key의 이후 항목은 가져가지 않습니다.
+        assert [row.key_value for row in await second._claim()] == ["sk-b"]
+    finally:
+        gate.set()
+    assert [(row.key_value, row.operation) for row in await first_claim] == [
+        ("sk-a", UPDATE_MODELS)
+    ]
+    # commit 후에는 lease로 확인합니다.
+    assert await second._claim() == []
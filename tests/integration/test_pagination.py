@@ -0,0 +1,26 @@
+import pytest
+
+from app.config import MAX_PAGE_SIZE
+
+LIST_URLS = [
+    "/users/search?q=alice",
+    "/models/gpt-4/users",
+    "/event-logs",
+    "/jobs",
+    "/jobs/unknown/items",
+]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("url", LIST_URLS)
+@pytest.mark.parametrize("query", ["limit=0", f"limit={MAX_PAGE_SIZE + 1}", "offset=-1"])
+def test_list_rejects_out_of_range_paging(api_client, url, query):
+    resp = api_client.get(f"{url}{'&' if '?' in url else '?'}{query}")
+    assert resp.status_code == 422
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("url", LIST_URLS)
+def test_list_accepts_max_page_size(api_client, url):
+    resp = api_client.get(f"{url}{'&' if '?' in url else '?'}limit={MAX_PAGE_SIZE}&offset=0")
+    assert resp.status_code == 200
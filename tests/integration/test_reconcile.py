@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, text
+
+from app.config import LITELLM_USER_ID
+from app.key_lookup import key_fingerprint
+from app.models import LiteLLMOutbox, User
+from app.outbox import DELETE_KEY, PENDING, enqueue
+from app.reconcile import ADVISORY_LOCK_ID, Reconciler
+from benchmarks import fake_litellm
+
+
+def put_key(key: str, created_at=None, **info):
+    fake_litellm.store.put(
+        key,
+        {
+            "models": [],
+            "user_id": LITELLM_USER_ID,
+            "key_alias": None,
+            "metadata": {},
+            "created_at": created_at.isoformat() if created_at else None,
+            **info,
+        },
+    )
+
+
+def make_reconciler(session_factory, litellm, tmp_path) -> Reconciler:
+    return Reconciler(session_factory, litellm, checkpoint_path=str(tmp_path / "reconcile.json"))
+
+
+async def add_user(session_factory, user_id: str, key: str):
+    async with session_factory() as db:
+        db.add(User(user_id=user_id, key_value=key, allowed_models=[]))
+        await db.commit()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_repair_deletes_only_old_unclaimed_orphans(session_factory, litellm, tmp_path):
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    put_key("sk-alice", old)
+    put_key("sk-orphan", old)
+    put_key("sk-new", datetime.now(timezone.utc))
+    put_key("sk-grace", old)
+    put_key("sk-unknown")
+    await add_user(session_factory, "alice", "sk-alice")
+    async with session_factory() as db:
+        # 교체 유예 기간 중인 이전 key
+        await enqueue(db, DELETE_KEY, "sk-grace", delay_seconds=3600)
+        await db.commit()
+
+    state = await make_reconciler(session_factory, litellm, tmp_path).run(repair=True)
+
+    assert state["status"] == "completed"
+    assert set(fake_litellm.store.keys) == {"sk-alice", "sk-new", "sk-grace", "sk-unknown"}
+    assert state["counts"]["orphan_key"] == 2  # sk-orphan(삭제), sk-unknown(created_at 없음)
+    assert state["counts"]["repaired"] == 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_repair_rechecks_db_before_delete(session_factory, litellm, tmp_path, monkeypatch):
+    put_key("sk-late", datetime.now(timezone.utc) - timedelta(days=1))
+    reconciler = make_reconciler(session_factory, litellm, tmp_path)
+    known_key_hashes = reconciler._known_key_hashes
+
+    async def snapshot_then_store_user():
+        hashes = await known_key_hashes()
+        # 목록 조회 이후에 다른 작업이 key를 저장한 경우
+        await add_user(session_factory, "late", "sk-late")
+        return hashes
+
+    monkeypatch.setattr(reconciler, "_known_key_hashes", snapshot_then_store_user)
+    state = await reconciler.run(repair=True)
+
+    assert state["status"] == "completed"
+    assert "sk-late" in fake_litellm.store.keys
+    assert state["counts"]["repaired"] == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_missing_key_repair_regenerates_and_stores_key(session_factory, litellm, tmp_path):
+    await add_user(session_factory, "bob", "sk-lost")
+
+    state = await make_reconciler(session_factory, litellm, tmp_path).run(repair=True)
+
+    async with session_factory() as db:
+        bob = (await db.execute(select(User).where(User.user_id == "bob"))).scalar_one()
+    assert state["counts"]["missing_key"] == 1
+    assert bob.key_value != "sk-lost" and bob.key_value in fake_litellm.store.keys
+    assert bob.key_hash == key_fingerprint(bob.key_value)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_regenerated_key_discarded_when_user_changed(session_factory, litellm, tmp_path):
+    await add_user(session_factory, "carol", "sk-current")
+    async with session_factory() as db:
+        carol = (await db.execute(select(User).where(User.user_id == "carol"))).scalar_one()
+    stale = SimpleNamespace(id=carol.id, user_id="carol", key_value="sk-before-rotation")
+    reconciler = make_reconciler(session_factory, litellm, tmp_path)
+    reconciler.state = {"counts": {"stale_user": 0, "repaired": 0}, "issues": []}
+
+    await reconciler._store_regenerated_keys([(stale, "sk-regenerated")])
+
+    async with session_factory() as db:
+        key_value = (
+            await db.execute(select(User.key_value).where(User.id == carol.id))
+        ).scalar_one()
+        pending = (
+            await db.execute(
+                select(LiteLLMOutbox.key_value).where(
+                    LiteLLMOutbox.operation == DELETE_KEY, LiteLLMOutbox.status == PENDING
+                )
+            )
+        ).scalars()
+        assert key_value == "sk-current"
+        assert list(pending) == ["sk-regenerated"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_run_skipped_while_another_process_holds_lock(session_factory, litellm, tmp_path):
+    reconciler = make_reconciler(session_factory, litellm, tmp_path)
+    async with session_factory() as other:
+        await other.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+        state = await reconciler.run(repair=True)
+
+    assert state["status"] == "skipped"
+    assert not (tmp_path / "reconcile.json").exists()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_lock_held_without_open_transaction(session_factory, litellm, tmp_path, monkeypatch):
+    reconciler = make_reconciler(session_factory, litellm, tmp_path)
+    other = Reconciler(session_factory, litellm, checkpoint_path=str(tmp_path / "other.json"))
+    check_orphans = reconciler._check_orphans
+    seen = {}
+
+    async def observe_then_check(service, repair):
+        async with session_factory() as db:
+            seen["idle_in_transaction"] = await db.scalar(
+                text(
+                    "SELECT count(*) FROM pg_stat_activity "
+                    "WHERE datname = current_database() AND state = 'idle in transaction'"
+                )
+            )
+        seen["concurrent"] = (await other.run())["status"]
+        await check_orphans(service, repair)
+
+    monkeypatch.setattr(reconciler, "_check_orphans", observe_then_check)
+    state = await reconciler.run()
+
+    assert state["status"] == "completed"
+    assert seen == {"idle_in_transaction": 0, "concurrent": "skipped"}
+    # 끝나면 lock을 해제합니다.
+    assert (await other.run())["status"] == "completed"
@@ -0,0 +1,75 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.slow_queries import SlowQueryLog, current_scope
+
+SLOW = text("SELECT pg_sleep(0.05), CAST(:secret AS text)")
+
+
+@pytest_asyncio.fixture
+async def engine(db_url):
+    engine = create_async_engine(db_url.replace("postgresql+psycopg2", "postgresql+asyncpg"))
+    yield engine
+    await engine.dispose()
+
+
+async def wait_for_explain(log: SlowQueryLog):
+    if log._explain_task is not None:
+        await log._explain_task
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_only_queries_over_threshold_recorded(engine):
+    log = SlowQueryLog(threshold_ms=30, explain_rate=0, max_entries=10)
+    log.attach(engine, "primary")
+
+    token = current_scope.set({"type": "http", "method": "GET", "path": "/users"})
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(SLOW, {"secret": "sk-secret"})
+    finally:
+        current_scope.reset(token)
+
+    assert log.total == 1
+    (entry,) = log.recent()
+    assert (entry["engine"], entry["route"], entry["plan"]) == ("primary", "GET /users", None)
+    assert entry["duration_ms"] >= 30 and "pg_sleep" in entry["statement"]
+    # 파라미터 값은 저장하지 않습니다.
+    assert "sk-secret" not in str(entry)
+    assert log.recent(min_duration_ms=10_000) == []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_sampled_query_explained_one_at_a_time(engine):
+    log = SlowQueryLog(threshold_ms=30, explain_rate=1, max_entries=10)
+    log.attach(engine, "primary")
+
+    async with engine.connect() as conn:
+        await conn.execute(SLOW, {"secret": "a"})
+        # 첫 EXPLAIN이 끝나기 전의 느린 쿼리는 EXPLAIN하지 않습니다.
+        log.record(engine, "primary", "SELECT pg_sleep(0.05)", (), 0.05, False)
+        await wait_for_explain(log)
+
+    first, second = log.entries
+    assert first["plan"] and any("Result" in line for line in first["plan"])
+    assert second["plan"] is None
+    # EXPLAIN 자체는 느린 쿼리로 기록하지 않습니다.
+    assert log.total == 2 and not log._explaining
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_zero_threshold_registers_nothing(engine):
+    log = SlowQueryLog(threshold_ms=0)
+    log.attach(engine, "primary")
+
+    async with engine.connect() as conn:
+        await conn.execute(SLOW, {"secret": "a"})
+
+    assert not log.enabled
+    assert log.total == 0 and not log.entries
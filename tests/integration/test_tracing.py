@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app import tracing
+from app.models import EventLog
+from app.tracing import REQUEST_ID_PATTERN, Tracer
+
+
+def logged_request_ids(clean_db, event_type: str) -> list:
+    with sessionmaker(bind=clean_db)() as db:
+        result = db.execute(select(EventLog.request_id).where(EventLog.event_type == event_type))
+        return list(result.scalars())
+
+
+@pytest.mark.integration
+def test_request_id_header_propagated_to_event_log(api_client, clean_db):
+    resp = api_client.post(
+        "/model-profiles", json={"name": "basic"}, headers={"X-Request-ID": "req-1.a:b"}
+    )
+
+    assert resp.status_code == 201
+    assert resp.headers["x-request-id"] == "req-1.a:b"
+    assert logged_request_ids(clean_db, "MODEL_PROFILE_CREATE") == ["req-1.a:b"]
+
+    logs = api_client.get("/event-logs", params={"request_id": "req-1.a:b"}).json()
+    assert [log["event_type"] for log in logs] == ["MODEL_PROFILE_CREATE"]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("header", [None, "bad id!", "x" * 65])
+def test_missing_or_invalid_request_id_replaced(api_client, clean_db, header):
+    headers = {"X-Request-ID": header} if header else {}
+
+    resp = api_client.post("/model-profiles", json={"name": "basic"}, headers=headers)
+
+    request_id = resp.headers["x-request-id"]
+    assert request_id != header and REQUEST_ID_PATTERN.match(request_id)
+    assert logged_request_ids(clean_db, "MODEL_PROFILE_CREATE") == [request_id]
+
+
+@pytest.mark.integration
+def test_sampled_request_records_audit_span(api_client, monkeypatch):
+    from app import main
+
+    tracer = Tracer(enabled=True, sample_rate=1, export_path="")
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    monkeypatch.setattr(main, "tracer", tracer)
+
+    resp = api_client.post(
+        "/model-profiles", json={"name": "basic"}, headers={"X-Request-ID": "req-2"}
+    )
+
+    spans = {span["name"]: span for span in tracer.trace("req-2")}
+    root = spans["POST /model-profiles"]
+    assert (root["parent_id"], root["attributes"]["status_code"]) == (None, resp.status_code)
+    # 응답 후 background task로 기록한 감사 로그도 같은 trace에 포함됩니다.
+    audit = spans["audit.write"]
+    assert (audit["parent_id"], audit["attributes"]) == (
+        root["span_id"],
+        {"event_type": "MODEL_PROFILE_CREATE"},
+    )
+    assert tracer.recent()[0]["trace_id"] == "req-2"
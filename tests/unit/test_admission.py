@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import admission
+from app.admission import SERVER_API, AdmissionController, TokenBucketLimiter, pool_waits
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """admission 모듈의 time.monotonic을 직접 움직이는 시계"""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(admission, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_bucket_allows_burst_then_refills_at_rate(clock):
+    limiter = TokenBucketLimiter(rate=2, burst=3)
+
+    assert [limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("a") == pytest.approx(0.5)
+    assert limiter.acquire("b") == 0  # 요청자별 bucket
+
+    clock.value += 0.5
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == pytest.approx(0.5)
+
+    # 오래 쉬어도 burst 이상 쌓이지 않습니다.
+    clock.value += 60
+    assert [limiter.acquire("a") for _ in range(4)][-1] == pytest.approx(0.5)
+
+
+def test_bucket_without_rate_never_limits(clock):
+    limiter = TokenBucketLimiter(rate=0, burst=0)
+
+    assert all(limiter.acquire("a") == 0 for _ in range(1000))
+    assert len(limiter) == 0
+
+
+def test_limits_divided_across_workers():
+    single = AdmissionController(pool_capacity=10, max_in_flight=100, workers=1)
+    divided = AdmissionController(pool_capacity=10, max_in_flight=100, workers=4)
+
+    assert divided.max_in_flight == 25
+    for kind, limiter in single.limiters.items():
+        assert divided.limiters[kind].rate == pytest.approx(limiter.rate / 4)
+        assert divided.limiters[kind].burst == pytest.approx(max(limiter.burst / 4, 1))
+    # 동시 처리 수는 worker 자신의 연결 풀 기준입니다.
+    assert divided.max_client_in_flight == single.max_client_in_flight
+
+
+def make_controller(**kwargs) -> AdmissionController:
+    controller = AdmissionController(
+        pool_capacity=4, client_pool_share=0.5, max_pool_wait=0, workers=1, **kwargs
+    )
+    for kind in controller.limiters:
+        controller.limiters[kind] = TokenBucketLimiter(rate=0, burst=0)
+    return controller
+
+
+def test_client_over_its_share_gets_429_others_admitted(clock):
+    controller = make_controller(max_in_flight=100)
+
+    with controller.admitted(SERVER_API, None), controller.admitted(SERVER_API, None):
+        assert controller.reject(SERVER_API, None) == (429, 1)
+        assert controller.reject("admin", "10.0.0.1") is None
+    assert controller.reject(SERVER_API, None) is None
+    assert controller.stats == {"concurrency_limited_api": 1}
+
+
+def test_rate_limit_returns_429_with_retry_after(clock):
+    controller = make_controller(max_in_flight=100)
+    controller.limiters["admin"] = TokenBucketLimiter(rate=0.5, burst=1)
+
+    assert controller.reject("alice", None) is None
+    assert controller.reject("alice", None) == (429, 2)
+    assert controller.reject("bob", None) is None
+    assert controller.stats == {"rate_limited_admin": 1}
+
+
+def test_overloaded_worker_sheds_with_503(clock):
+    controller = make_controller(max_in_flight=2)
+
+    with controller.admitted("alice", None), controller.admitted("bob", None):
+        # 요청자별 제한 안이어도 worker 전체가 가득 차면 503
+        assert controller.reject("carol", None) == (503, 1)
+    assert controller.reject("carol", None) is None
+
+    controller.max_pool_wait = 1.0
+    with pool_waits.track():
+        clock.value += 1.5
+        assert controller.reject("carol", None) == (503, 1)
+    assert controller.reject("carol", None) is None
+    assert controller.stats == {"shed_in_flight": 1, "shed_pool_wait": 1}
@@ -0,0 +1,77 @@
+import pytest
+
+from app import db_pool
+from app.db_pool import (
+    MIN_CONNECTIONS_PER_WORKER,
+    RESERVED_PER_WORKER,
+    async_engine_options,
+    pool_budget,
+    sync_engine_options,
+)
+
+
+def test_budget_split_for_single_worker():
+    assert pool_budget(40, workers=1, audit_share=0.2) == {
+        "workers": 1,
+        "per_worker": 40,
+        "pool_size": 10,
+        "max_overflow": 21,
+        "audit_pool_size": 8,
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 4, 5, 6])
+def test_workers_never_exceed_total_connections(workers):
+    budget = pool_budget(40, workers=workers, audit_share=0.2)
+    per_worker = (
+        budget["pool_size"] + budget["max_overflow"] + budget["audit_pool_size"]
+    ) + RESERVED_PER_WORKER
+
+    assert budget["per_worker"] == 40 // workers
+    assert per_worker * workers <= 40
+    assert budget["audit_pool_size"] >= 1 and budget["pool_size"] >= 1
+
+
+def test_zero_workers_treated_as_one():
+    assert pool_budget(40, workers=0) == pool_budget(40, workers=1)
+
+
+def test_over_budget_refuses_to_start():
+    workers = 40 // MIN_CONNECTIONS_PER_WORKER + 1
+
+    with pytest.raises(ValueError, match="WEB_CONCURRENCY"):
+        pool_budget(40, workers=workers)
+    # 최소 몫을 채우는 경우는 허용합니다.
+    assert pool_budget(MIN_CONNECTIONS_PER_WORKER * 2, workers=2)["per_worker"] == (
+        MIN_CONNECTIONS_PER_WORKER
+    )
+
+
+def test_engine_options_follow_budget():
+    budget = pool_budget(40, workers=2, audit_share=0.2)
+
+    options = async_engine_options(budget)
+    assert (options["pool_size"], options["max_overflow"]) == (
+        budget["pool_size"],
+        budget["max_overflow"],
+    )
+    sync_options = sync_engine_options(budget)
+    assert (sync_options["pool_size"], sync_options["max_overflow"]) == (
+        budget["audit_pool_size"],
+        0,
+    )
+
+
+def test_pgbouncer_mode_uses_unique_statement_names(monkeypatch):
+    budget = pool_budget(40, workers=1)
+    monkeypatch.setattr(db_pool, "DB_PGBOUNCER", False)
+    assert "prepared_statement_name_func" not in async_engine_options(budget)["connect_args"]
+
+    monkeypatch.setattr(db_pool, "DB_PGBOUNCER", True)
+    monkeypatch.setattr(db_pool, "DB_STATEMENT_CACHE_SIZE", 0)
+    connect_args = async_engine_options(budget)["connect_args"]
+
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
@@ -0,0 +1,123 @@
+from contextlib import nullcontext
+from datetime import date
+
+import pytest
+
+from app import event_partitions
+from app.event_partitions import (
+    add_months,
+    create_partition_sql,
+    expired_partitions,
+    partition_month,
+    partition_name,
+    run_maintenance,
+)
+
+
+@pytest.mark.parametrize(
+    "month, months, expected",
+    [
+        (date(2026, 10, 1), 1, date(2026, 11, 1)),
+        (date(2026, 12, 1), 1, date(2027, 1, 1)),
+        (date(2026, 1, 1), -1, date(2025, 12, 1)),
+        (date(2026, 10, 1), -12, date(2025, 10, 1)),
+        (date(2026, 10, 1), -22, date(2024, 12, 1)),
+        (date(2026, 10, 1), 0, date(2026, 10, 1)),
+    ],
+)
+def test_add_months(month, months, expected):
+    assert add_months(month, months) == expected
+
+
+def test_partition_name_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "event_logs_y2026m03"
+    assert partition_month("event_logs_y2026m03") == date(2026, 3, 1)
+    for name in ["event_logs_default", "event_logs_y2026m3", "event_logs_y2026m03_old", "users"]:
+        assert partition_month(name) is None
+
+
+def test_create_partition_sql_uses_utc_month_bounds():
+    assert create_partition_sql(date(2026, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS event_logs_y2026m12 PARTITION OF event_logs "
+        "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+    )
+
+
+def test_expired_partitions_before_cutoff_only():
+    names = [
+        "event_logs_default",
+        "event_logs_y2025m09",
+        "event_logs_y2025m10",
+        "event_logs_y2026m10",
+    ]
+
+    assert expired_partitions(names, date(2025, 10, 1)) == ["event_logs_y2025m09"]
+    assert expired_partitions(names, date(2024, 1, 1)) == []
+
+
+class FakeConnection:
+    """실행한 SQL만 기록하는 연결 (조회 함수는 monkeypatch로 대체)"""
+
+    def __init__(self):
+        self.statements = []
+
+    def begin(self):
+        return nullcontext()
+
+    def execute(self, statement, *args, **kwargs):
+        self.statements.append(str(statement))
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def connect(self):
+        return nullcontext(self.conn)
+
+
+@pytest.fixture
+def partitions(monkeypatch):
+    monkeypatch.setattr(event_partitions, "_this_month", lambda: date(2026, 10, 1))
+    monkeypatch.setattr(event_partitions, "_try_lock", lambda conn: True)
+    monkeypatch.setattr(event_partitions, "ensure_partitions", lambda conn, months_ahead: [])
+    monkeypatch.setattr(
+        event_partitions,
+        "attached_partitions",
+        lambda conn: ["event_logs_y2025m08", "event_logs_y2025m09", "event_logs_y2025m10"],
+    )
+    monkeypatch.setattr(
+        event_partitions, "detached_partitions", lambda conn: ["event_logs_y2025m01"]
+    )
+
+
+def test_dry_run_reports_expired_and_pending(partitions, tmp_path):
+    engine = FakeEngine()
+
+    report = run_maintenance(engine, retention_months=12, archive_dir=str(tmp_path), dry_run=True)
+
+    # 이전 실행에서 분리된 파티션은 보관 기간과 관계없이 이어서 처리합니다.
+    assert report["expired"] == [
+        "event_logs_y2025m08",
+        "event_logs_y2025m09",
+        "event_logs_y2025m01",
+    ]
+    assert engine.conn.statements == []
+
+
+def test_zero_retention_skips_cleanup(partitions):
+    engine = FakeEngine()
+
+    report = run_maintenance(engine, retention_months=0)
+
+    assert report["expired"] == [] and engine.conn.statements == []
+
+
+def test_missing_archive_dir_refuses_before_detach(partitions, tmp_path):
+    engine = FakeEngine()
+
+    with pytest.raises(RuntimeError, match="EVENT_LOG_ARCHIVE_DIR"):
+        run_maintenance(engine, retention_months=12, archive_dir=str(tmp_path / "missing"))
+
+    assert not (tmp_path / "missing").exists()
+    assert not any("DETACH" in sql or "DROP" in sql for sql in engine.conn.statements)
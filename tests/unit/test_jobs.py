@@ -0,0 +1,41 @@
+import pytest
+
+from app.jobs import import_row_user_id, iter_import_rows, parse_import_row
+
+
+def write_jsonl(tmp_path, *lines) -> str:
+    path = tmp_path / "users.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_jsonl_rows_that_are_not_objects_become_error_rows(tmp_path):
+    path = write_jsonl(tmp_path, "123", "[1]", '"alice"', "", "{oops", '{"user_id": "bob"}')
+
+    rows = list(iter_import_rows(path, "jsonl"))
+
+    assert [row_no for row_no, _ in rows] == [1, 2, 3, 4, 5]
+    for _, row in rows[:4]:
+        with pytest.raises(ValueError):
+            parse_import_row(row)
+    assert "JSON object" in rows[0][1]["__error__"]
+    assert parse_import_row(rows[4][1]).user_id == "bob"
+
+
+def test_jsonl_values_are_coerced_to_strings():
+    user_req = parse_import_row(
+        {"user_id": 5, "organization": 10, "extra_info": "", "allowed_models": ["gpt-4", 3]}
+    )
+
+    assert user_req.user_id == "5"
+    assert user_req.organization == "10"
+    assert user_req.extra_info is None
+    assert user_req.allowed_models == ["gpt-4", "3"]
+
+
+def test_too_long_user_id_is_a_row_error():
+    row = {"user_id": "u" * 80}
+
+    with pytest.raises(ValueError, match="user_id is too long"):
+        parse_import_row(row)
+    assert import_row_user_id(row) == "u" * 50
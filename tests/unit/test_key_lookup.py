@@ -0,0 +1,36 @@
+import time
+
+from app.key_lookup import KeyLookupCache, key_fingerprint
+
+ALICE = {"user_id": "alice", "organization": "dev"}
+
+
+def test_invalidate_removes_key():
+    cache = KeyLookupCache(max_size=10, ttl=60)
+    cache.put_many({key_fingerprint("sk-a"): ALICE, key_fingerprint("sk-b"): ALICE})
+
+    cache.invalidate(["sk-a"])
+
+    assert cache.get_many([key_fingerprint("sk-a"), key_fingerprint("sk-b")]) == {
+        key_fingerprint("sk-b"): ALICE
+    }
+
+
+def test_result_fetched_before_invalidate_is_not_cached():
+    cache = KeyLookupCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate(["sk-a"])  # DB 조회 중에 사용자가 삭제됨
+
+    cache.put_many({key_fingerprint("sk-a"): ALICE}, generation)
+
+    assert len(cache) == 0
+
+
+def test_expired_and_evicted_entries():
+    cache = KeyLookupCache(max_size=2, ttl=0.01)
+    cache.put_many({"h1": ALICE, "h2": ALICE, "h3": ALICE})
+    assert len(cache) == 2 and cache.get_many(["h1"]) == {}
+
+    time.sleep(0.02)
+    assert cache.get_many(["h2", "h3"]) == {}
+    assert len(cache) == 0
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from app.loop_monitor import LoopLagMonitor
+
+
+def blocking_call(seconds: float):
+    time.sleep(seconds)
+
+
+async def handle_request(scope: dict):
+    # 루프를 막는 동기 호출 (scope는 요청 경로 확인용)
+    blocking_call(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocked_loop_reports_stack_and_request():
+    monitor = LoopLagMonitor(interval_ms=10, threshold_ms=50, max_reports=5)
+    monitor.start()
+    await asyncio.sleep(0.05)
+
+    await handle_request({"type": "http", "method": "POST", "path": "/users"})
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert len(monitor.reports) == 1  # 한 번 멈춘 동안 한 번만 기록
+    report = monitor.reports[0]
+    assert report["request"] == "POST /users"
+    assert report["stalled_ms"] >= 50
+    assert any("blocking_call" in line for line in report["stack"])
+    # 루프가 다시 실행된 뒤 전체 지연 시간을 채웁니다.
+    assert report["lag_ms"] >= 250
+
+    status = monitor.status()
+    assert status["max_lag_ms"] >= 250
+    assert status["over_threshold"] == 1 and status["blocked_reports"] == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_threshold_measures_without_watchdog():
+    monitor = LoopLagMonitor(interval_ms=10, threshold_ms=0)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    blocking_call(0.1)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert monitor._watchdog is None
+    assert monitor.samples > 0 and monitor.max_lag >= 0.08
+    assert monitor.status()["over_threshold"] == 0 and not monitor.reports
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import tracemalloc
+
+import pytest
+
+from app.memory_profiler import MemoryProfiler
+
+
+@pytest.mark.asyncio
+async def test_trace_measures_in_one_call_and_stops_tracing():
+    profiler = MemoryProfiler()
+    retained = []
+
+    async def allocate():
+        await asyncio.sleep(0.01)
+        retained.append(bytearray(1_000_000))
+
+    task = asyncio.create_task(allocate())
+    result = await profiler.trace(0.1)
+    await task
+
+    assert result["pid"] == os.getpid()
+    assert result["size_diff_bytes"] >= 1_000_000
+    assert not tracemalloc.is_tracing()
+    assert profiler.snapshots == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_trace_rejected():
+    profiler = MemoryProfiler()
+    running = asyncio.create_task(profiler.trace(0.1))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(RuntimeError):
+        await profiler.trace(0.1)
+    await running
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from collections import Counter
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+# app.main은 import 시 정적 파일 디렉토리를 mount 하므로 빌드 결과가 없어도 import 되도록 합니다.
+os.makedirs(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "dist"), exist_ok=True)
+
+from app import main
+from app.profiling import ProfileStore, SamplingProfiler
+
+
+def busy_loop(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_records_caller_stack():
+    profiler = SamplingProfiler(interval_ms=1)
+    profiler.start()
+    busy_loop(0.1)
+    samples = profiler.stop()
+
+    assert sum(samples.values()) > 0
+    assert any("busy_loop (" in stack for stack in samples)
+    assert not profiler._thread.is_alive()
+
+
+def test_store_saves_lists_and_prunes(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2)
+    info = {"method": "GET", "path": "/users"}
+
+    ids = [store.save(Counter({"main;handler": 3, "main;io": 1}), info) for _ in range(3)]
+
+    assert [entry["id"] for entry in store.entries()] == sorted(ids[1:], reverse=True)
+    assert store.entries()[0]["samples"] == 4
+    with open(store.path(ids[-1])) as f:
+        assert f.read() == "main;handler 3\nmain;io 1\n"
+    assert store.path(ids[0]) is None  # 오래된 것부터 삭제
+    assert store.path("../etc/passwd") is None
+
+
+def make_request(**headers) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/users",
+            "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def super_admin_headers() -> dict:
+    token = main.create_access_token({"sub": "root", "is_super_admin": True})
+    return {"authorization": f"Bearer {token}", "x_profile": "true"}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path))
+    monkeypatch.setattr(main, "profile_store", store)
+    monkeypatch.setattr(main, "profile_lock", asyncio.Lock())
+    monkeypatch.setattr(main, "PROFILE_SAMPLE_RATE", 0)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_only_one_request_profiled_at_a_time(store):
+    release = asyncio.Event()
+
+    async def slow_handler(request):
+        await release.wait()
+        return Response("ok")
+
+    async def fast_handler(request):
+        return Response("ok")
+
+    first = asyncio.create_task(
+        main.profile_request(make_request(**super_admin_headers()), slow_handler)
+    )
+    while not main.profile_lock.locked():
+        await asyncio.sleep(0.001)
+
+    # 프로파일링 중에 들어온 요청은 기다리지 않고 프로파일링 없이 처리합니다.
+    second = await asyncio.wait_for(
+        main.profile_request(make_request(**super_admin_headers()), fast_handler), 1
+    )
+    assert "x-profile-id" not in second.headers
+
+    release.set()
+    response = await first
+    assert [entry["id"] for entry in store.entries()] == [response.headers["x-profile-id"]]
+    assert store.entries()[0]["requested_by"] == "root"
+
+    # 끝난 뒤에는 다음 요청을 다시 프로파일링합니다.
+    third = await main.profile_request(make_request(**super_admin_headers()), fast_handler)
+    assert "x-profile-id" in third.headers
+
+
+@pytest.mark.asyncio
+async def test_profile_header_requires_super_admin(store):
+    async def handler(request):
+        return Response("ok")
+
+    token = main.create_access_token({"sub": "admin", "is_super_admin": False})
+    for headers in [
+        {"authorization": f"Bearer {token}", "x_profile": "true"},
+        {"x_profile": "true"},
+    ]:
+        response = await main.profile_request(make_request(**headers), handler)
+        assert "x-profile-id" not in response.headers
+    assert store.entries() == []
@@ -0,0 +1,43 @@
+import time
+
+from app.read_replica import PRIMARY, REPLICA, ReplicaRouter
+
+
+def make_router(sticky_seconds: float = 10) -> ReplicaRouter:
+    # 세션을 열지 않으므로 factory는 아무 객체나 사용합니다.
+    router = ReplicaRouter(
+        object(),
+        object(),
+        max_lag_seconds=0,
+        sticky_seconds=sticky_seconds,
+        check_interval=0,
+        secret="test-secret",
+    )
+    router.lag = 0
+    return router
+
+
+def test_sticky_cookie_routes_other_worker_to_primary():
+    writer, reader = make_router(), make_router()
+    writer.mark_write("admin")
+    token = writer.sticky_token("admin")
+
+    assert writer.route("admin") == PRIMARY
+    assert reader.route("admin") == REPLICA  # 다른 worker는 메모리 기록이 없음
+    assert reader.route("admin", token) == PRIMARY
+
+
+def test_sticky_cookie_rejects_other_identity_tampering_and_expiry():
+    router = make_router(sticky_seconds=0.01)
+    token = router.sticky_token("admin")
+    expires_ms, _, signature = token.partition(".")
+
+    assert make_router().route("bob", token) == REPLICA
+    assert make_router().route("admin", f"{int(expires_ms) + 60000}.{signature}") == REPLICA
+    time.sleep(0.02)
+    assert make_router().route("admin", token) == REPLICA
+
+
+def test_no_cookie_without_secret():
+    router = ReplicaRouter(object(), object())
+    assert router.sticky_token("admin") is None